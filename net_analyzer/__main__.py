@@ -15,7 +15,30 @@ from src.system_core.utils import (
     run_flow_analysis
 )
 from src.system_core.exceptions import DatasetLoadError
+from src.llm.api_clients import (
+    close_clients,
+    set_adaptive_context,
+    set_deterministic_mode,
+    set_keep_alive,
+    DEFAULT_KEEP_ALIVE
+)
+from src.llm.agents import (
+    set_structured_output_method,
+    DEFAULT_STRUCTURED_OUTPUT_METHOD
+)
+from src.data_processing.log_metadata_parser import set_metadata_fast_path
+from src.llm.prompt_store import (
+    enable_prompt_store,
+    disable_prompt_store
+)
+from src.llm.response_cache import (
+    enable_response_cache,
+    disable_response_cache,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_MAX_ENTRIES
+)
 from src.data_processing.process_IDS2017 import (
+    IDS2017_SIGNATURE_BUCKETS,
     load_and_preprocess_ids2017_dataset,
     unlabel_IDS2017_dataset,
     get_IDS2017_label
@@ -29,6 +52,70 @@ logging.basicConfig(
 # Definícia ciest k vstupným súborom
 PATH_TO_FLOWS = "./flow_input"  # Cesta k súborom so sieťovými tokmi
 PATH_TO_LOGS = "./log_input"    # Cesta k súborom s logmi
+# Cesta k perzistentnej cache vyčisteného datasetu sieťových tokov
+PATH_TO_FLOW_CACHE = "./flow_input/.cache"
+
+# Paralelné načítanie datasetu sieťových tokov
+FLOW_LOAD_WORKERS = None        # Počet procesov (None = všetky jadrá)
+FLOW_LOAD_MEMORY_CAP_MB = 8192  # Limit pamäte súčasne načítaných súborov
+# Výber vzoriek tokov ("head", "reservoir" alebo None pre prvé vzorky
+# z celého vyčisteného datasetu). Vzorky sa vyberajú z cache, ak je
+# vyčistený dataset v nej, inak prúdovo bez načítania celého datasetu
+FLOW_SAMPLING_MODE = None
+# Semienko náhodného výberu vzoriek ("reservoir") pre zopakovanie behu
+FLOW_SAMPLING_SEED = 42
+# Analýza tokov v dávkach podľa kontextového okna (jedno volanie LLM
+# pre viacero tokov namiesto volania pre každý tok)
+FLOW_PROMPT_PACKING = False
+# Počet súbežných požiadaviek na LLM pri analýze tokov (None = postupne).
+# Hodnota by mala zodpovedať OLLAMA_NUM_PARALLEL na Ollama serveri.
+FLOW_ANALYSIS_CONCURRENCY = None
+# Prevzatie výsledku takmer zhodného toku namiesto nového volania LLM
+# (toky sa porovnávajú podľa IDS2017_SIGNATURE_BUCKETS)
+FLOW_VERDICT_CACHE = False
+# Ukončenie generovania odpovede hneď po rozhodnutí verdiktu toku
+# (zdôvodnenie sa negeneruje, čas toku je časom do verdiktu)
+FLOW_EARLY_EXIT = False
+# Dogenerovanie zdôvodnení pozitívnych tokov na pozadí pri FLOW_EARLY_EXIT
+FLOW_COMPLETE_POSITIVE_REASONS = False
+# Klasifikácia tokov iba s verdiktom pre hromadné vyhodnotenie (bez
+# zdôvodnenia, vstupy sa uložia do PATH_TO_PROMPT_STORE pre explain)
+FLOW_VERDICT_ONLY = False
+# Počet vlákien analyzujúcich log súbory súbežne (None = postupne)
+LOG_ANALYSIS_WORKERS = None
+# Režim analýzy logov ("pipeline" - traja agenti, "single_pass" - jeden
+# kombinovaný agent, logy sa posielajú modelu iba raz)
+LOG_ANALYSIS_MODE = "pipeline"
+# Extrahovanie metadát logov (služba, útočník, trvanie) regulárnymi
+# výrazmi bez volania LLM. Extraktor metadát sa vyvolá iba pre súbory,
+# o ktorých parser nerozhodne (iba režim "pipeline").
+LOG_METADATA_FAST_PATH = False
+# Klasifikácia logov iba s verdiktom (iba režim "pipeline", pozri
+# FLOW_VERDICT_ONLY)
+LOG_VERDICT_ONLY = False
+# Úložisko vstupov agentov pri analýze iba s verdiktom. Zdôvodnenie
+# položky vytvorí explain(item_id) zo src/llm/flows.py.
+PATH_TO_PROMPT_STORE = "./.cache/prompt_store.sqlite"
+
+# Perzistentná cache odpovedí LLM (None = vypnutá). Opakované vyhodnotenie
+# s rovnakým modelom a vstupmi použije uložené odpovede namiesto volania LLM.
+PATH_TO_LLM_RESPONSE_CACHE = None   # napr. "./.cache/llm_responses.sqlite"
+LLM_RESPONSE_CACHE_TTL = RESPONSE_CACHE_TTL                  # Platnosť (s)
+LLM_RESPONSE_CACHE_MAX_ENTRIES = RESPONSE_CACHE_MAX_ENTRIES  # Limit LRU
+# Deterministický režim modelov (teplota 0 a pevné semienko) - odporúča sa
+# zapnúť spolu s cache odpovedí, aby uložené odpovede zostali platné
+LLM_DETERMINISTIC_MODE = False
+# Doba držania modelu v pamäti Ollama servera medzi požiadavkami (napr.
+# "30m", -1 = neobmedzene, None = predvolená hodnota servera). Kým je model
+# načítaný, server znovu používa KV cache spoločného prefixu promptov.
+LLM_KEEP_ALIVE = DEFAULT_KEEP_ALIVE
+# Výber najmenšieho kontextového okna z NUM_CTX_BUCKETS pre každú
+# požiadavku (menšia KV cache pre toky). Zmena okna medzi požiadavkami
+# spôsobí opätovné načítanie modelu na Ollama serveri.
+LLM_ADAPTIVE_CONTEXT = False
+# Metóda štruktúrovaného výstupu agentov ("json_schema" - generovanie
+# obmedzené JSON schémou výstupu, "json_mode", "function_calling")
+LLM_STRUCTURED_OUTPUT_METHOD = DEFAULT_STRUCTURED_OUTPUT_METHOD
 
 # Inicializácia loggera pre tento modul
 logger = logging.getLogger(__name__)
@@ -81,7 +168,10 @@ def main():
             # Analýza Linux logov - režim 1
             # Pokračuj len ak používateľ nezrušil zadávanie
             if epochs is not None:
-                run_log_analysis(Path(PATH_TO_LOGS), epochs)
+                run_log_analysis(Path(PATH_TO_LOGS), epochs,
+                                 workers=LOG_ANALYSIS_WORKERS,
+                                 mode=LOG_ANALYSIS_MODE,
+                                 verdict_only=LOG_VERDICT_ONLY)
             else:
                 continue  # Vráť sa do menu ak používateľ prerušil zadávanie
         elif choice == 2:
@@ -91,7 +181,12 @@ def main():
                 try:
                     # Načítanie a predspracovanie IDS2017 datasetu
                     dataset = load_and_preprocess_ids2017_dataset(
-                        Path(PATH_TO_FLOWS)
+                        Path(PATH_TO_FLOWS),
+                        cache_dir=Path(PATH_TO_FLOW_CACHE),
+                        max_workers=FLOW_LOAD_WORKERS,
+                        max_memory_mb=FLOW_LOAD_MEMORY_CAP_MB,
+                        sampling=FLOW_SAMPLING_MODE,
+                        seed=FLOW_SAMPLING_SEED
                     )
                     logger.info("Dataset úspešne načítaný")
                 except Exception as e:
@@ -105,7 +200,14 @@ def main():
                     dataset,
                     unlabel_IDS2017_dataset,
                     get_IDS2017_label,
-                    epochs
+                    epochs,
+                    packing=FLOW_PROMPT_PACKING,
+                    concurrency=FLOW_ANALYSIS_CONCURRENCY,
+                    signature_buckets=(IDS2017_SIGNATURE_BUCKETS
+                                       if FLOW_VERDICT_CACHE else None),
+                    early_exit=FLOW_EARLY_EXIT,
+                    complete_positive_reasons=FLOW_COMPLETE_POSITIVE_REASONS,
+                    verdict_only=FLOW_VERDICT_ONLY
                 )
             else:
                 continue  # Vráť sa do menu ak používateľ prerušil zadávanie
@@ -134,4 +236,22 @@ def main():
 
 # Spustenie hlavnej funkcie ak je súbor spustený priamo
 if __name__ == "__main__":
-    main()
+    set_deterministic_mode(LLM_DETERMINISTIC_MODE)
+    set_keep_alive(LLM_KEEP_ALIVE)
+    set_adaptive_context(LLM_ADAPTIVE_CONTEXT)
+    set_structured_output_method(LLM_STRUCTURED_OUTPUT_METHOD)
+    set_metadata_fast_path(LOG_METADATA_FAST_PATH)
+    if PATH_TO_LLM_RESPONSE_CACHE is not None:
+        enable_response_cache(Path(PATH_TO_LLM_RESPONSE_CACHE),
+                              LLM_RESPONSE_CACHE_TTL,
+                              LLM_RESPONSE_CACHE_MAX_ENTRIES)
+    if FLOW_VERDICT_ONLY or LOG_VERDICT_ONLY:
+        enable_prompt_store(Path(PATH_TO_PROMPT_STORE))
+    try:
+        main()
+    finally:
+        # Zatvorenie HTTP spojení zdieľaných LLM klientov, cache odpovedí
+        # a úložiska vstupov agentov
+        close_clients()
+        disable_response_cache()
+        disable_prompt_store()
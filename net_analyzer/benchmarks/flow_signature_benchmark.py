@@ -0,0 +1,70 @@
+"""
+Meranie zníženia počtu volaní LLM pomocou cache výsledkov takmer zhodných
+sieťových tokov.
+
+Prúdovo prechádza celý dataset CIC-IDS2017, odstráni neplatné riadky
+rovnako ako čistenie datasetu a pre každý štítok porovná počet rôznych
+riadkov s počtom rôznych kanonických signatúr podľa
+IDS2017_SIGNATURE_BUCKETS.
+
+Spustenie z adresára net_analyzer:
+    python -m benchmarks.flow_signature_benchmark [adresár_datasetu]
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+import pandas as pd
+
+from src.data_processing.process_IDS2017 import (
+    IDS2017_DTYPES,
+    IDS2017_IMPORTANT_COLUMNS,
+    IDS2017_SIGNATURE_BUCKETS,
+    filter_invalid_rows,
+    iter_ids2017_chunks
+)
+from src.log_tools.flow_verdict_cache import measure_signature_reduction
+
+# Predvolený adresár s CSV súbormi datasetu
+DEFAULT_FLOW_FOLDER = "./flow_input"
+
+
+def iter_valid_chunks(directory_path: Path) -> Iterator[pd.DataFrame]:
+    """
+    Prúdovo načíta dataset a odstráni riadky s NaN a nekonečnými hodnotami.
+
+    Parametre:
+        directory_path (Path): Cesta k adresáru s CSV súbormi
+
+    Návratová hodnota:
+        Iterator[pd.DataFrame]: Časti datasetu s platnými riadkami
+    """
+    for chunk in iter_ids2017_chunks(directory_path,
+                                     columns=IDS2017_IMPORTANT_COLUMNS,
+                                     dtypes=IDS2017_DTYPES):
+        yield filter_invalid_rows(chunk)[0]
+
+
+def main(argv: List[str]) -> None:
+    """
+    Spustí meranie a vypíše zníženie počtu volaní LLM.
+
+    Parametre:
+        argv (List[str]): Argumenty príkazového riadka
+    """
+    directory_path = Path(argv[1] if len(argv) > 1 else DEFAULT_FLOW_FOLDER)
+
+    start = time.perf_counter()
+    report = measure_signature_reduction(iter_valid_chunks(directory_path),
+                                         IDS2017_SIGNATURE_BUCKETS)
+    elapsed = time.perf_counter() - start
+
+    print(f"Pravidlá kvantizácie: {IDS2017_SIGNATURE_BUCKETS}")
+    print(report.to_string(formatters={"reduction": "{:.1%}".format}))
+    print(f"\nMeranie trvalo {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,104 @@
+"""
+Benchmark jednoprechodovej analýzy logov oproti trojagentovej analýze.
+
+Analyzuje log súbory v oboch režimoch analyze_logs ("pipeline"
+a "single_pass") a porovnáva počet tokenov promptov a vygenerovaných
+tokenov podľa Ollama servera, čas analýzy a výkonnostné metriky.
+
+Vyžaduje bežiaci Ollama server s príslušným modelom.
+
+Spustenie z adresára net_analyzer:
+    python -m benchmarks.log_agent_benchmark [priečinok_logov] [epochy]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from langchain_core.callbacks import get_usage_metadata_callback
+
+from src.llm.api_clients import (
+    close_clients,
+    preflight_client
+)
+from src.llm.flows import spawn_logs_analysis_client
+from src.log_tools.log_analyzer import LOG_ANALYSIS_MODES, analyze_logs
+
+# Predvolený priečinok s log súbormi
+DEFAULT_LOG_FOLDER = "./log_input"
+# Predvolený počet epoch ladenia modelu
+DEFAULT_EPOCHS = 8
+
+
+def run_mode(folder_path: Path, num_epochs: int, mode: str) -> Dict:
+    """
+    Spustí analýzu logov v zadanom režime a zmeria jej náklady.
+
+    Parametre:
+        folder_path (Path): Cesta k priečinku s log súbormi
+        num_epochs (int): Počet epoch ladenia modelu
+        mode (str): Režim analýzy z LOG_ANALYSIS_MODES
+
+    Návratová hodnota:
+        Dict: Počet tokenov promptov ('input_tokens') a odpovedí
+        ('output_tokens'), čas analýzy ('seconds') a stav analýzy ('state')
+    """
+    # Priebežné výpisy analýzy sa potláčajú, zaujíma nás iba súhrn
+    with get_usage_metadata_callback() as usage, \
+            contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        state = analyze_logs(folder_path, num_epochs, mode=mode)
+        seconds = time.perf_counter() - start
+
+    return {
+        "input_tokens": sum(item.get("input_tokens", 0)
+                            for item in usage.usage_metadata.values()),
+        "output_tokens": sum(item.get("output_tokens", 0)
+                             for item in usage.usage_metadata.values()),
+        "seconds": seconds,
+        "state": state,
+    }
+
+
+def main(argv: List[str]) -> None:
+    """
+    Spustí benchmark a vypíše porovnanie režimov.
+
+    Parametre:
+        argv (List[str]): Argumenty príkazového riadka
+    """
+    folder_path = Path(argv[1] if len(argv) > 1 else DEFAULT_LOG_FOLDER)
+    num_epochs = int(argv[2]) if len(argv) > 2 else DEFAULT_EPOCHS
+
+    client = spawn_logs_analysis_client(num_epochs)
+    # Overenie a načítanie modelu, aby sa načítanie nezapočítalo do prvého
+    # režimu
+    preflight_client(client)
+
+    try:
+        results = {mode: run_mode(folder_path, num_epochs, mode)
+                   for mode in LOG_ANALYSIS_MODES}
+    finally:
+        close_clients()
+
+    print(f"{'režim':<12} {'prompt tokeny':>14} {'výstup tokeny':>14} "
+          f"{'čas (s)':>10} {'F1':>7}")
+    for mode, result in results.items():
+        print(f"{mode:<12} {result['input_tokens']:>14} "
+              f"{result['output_tokens']:>14} {result['seconds']:>10.1f} "
+              f"{result['state'].f1_score:>7.3f}")
+
+    pipeline = results["pipeline"]
+    single_pass = results["single_pass"]
+    if single_pass["input_tokens"] and single_pass["seconds"]:
+        print(f"\nJednoprechodový režim: "
+              f"{pipeline['input_tokens'] / single_pass['input_tokens']:.1f}x "
+              f"menej tokenov promptov, "
+              f"{pipeline['seconds'] / single_pass['seconds']:.1f}x rýchlejšie")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,147 @@
+"""
+Benchmark vektorovej textovej reprezentácie datasetu pre LLM.
+
+Porovnáva pôvodnú konverziu po bunkách cez DataFrame.iterrows()
+s vektorovou konverziou po stĺpcoch (parse_chunk_to_string
+a parse_dataset_to_strings) a overuje, že výstupy sú zhodné.
+
+Spustenie z adresára net_analyzer:
+    python -m benchmarks.render_benchmark [počet_riadkov]
+"""
+
+import sys
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.utils import (
+    parse_chunk_to_string,
+    parse_dataset_to_strings
+)
+
+# Predvolený počet riadkov syntetického datasetu
+DEFAULT_ROWS = 200000
+# Počet opakovaní merania (berie sa najlepší čas)
+REPEATS = 3
+
+
+def legacy_parse_chunk_to_string(chunk: pd.DataFrame) -> str:
+    """
+    Pôvodná konverzia DataFrame na text po bunkách (referencia).
+
+    Parametre:
+        chunk (pd.DataFrame): Časť datasetu na konverziu
+
+    Návratová hodnota:
+        str: Textová reprezentácia časti datasetu
+    """
+    if chunk.empty:
+        return "Spracovávaná časť datasetu je prázdna"
+
+    header = ", ".join(chunk.columns.astype(str))
+    rows = [f"Columns: {header}"]
+
+    for position, (original_idx, row) in enumerate(chunk.iterrows(), 1):
+        row_values = []
+        for col in chunk.columns:
+            value = row[col]
+            if pd.isna(value):
+                value = "NULL"
+            elif isinstance(value, str) and len(str(value)) > 100:
+                value = f"{str(value)[:97]}..."
+
+            row_values.append(f"{col}: {value}")
+
+        row_str = ", ".join(row_values)
+        rows.append(f"Row {original_idx}: {row_str}")
+
+    return "\n".join(rows)
+
+
+def make_flow_dataset(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Vytvorí syntetický dataset sieťových tokov so schémou IDS2017.
+
+    Parametre:
+        rows (int): Počet riadkov
+        seed (int): Semienko generátora náhodných čísel
+
+    Návratová hodnota:
+        pd.DataFrame: Dataset bez štítku s typmi podľa IDS2017_DTYPES
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Destination_Port": rng.choice([21, 22, 80, 443], rows).astype('int32'),
+        "Flow_Duration": rng.integers(0, 10**7, rows).astype('int32'),
+        "Total_Fwd_Packets": rng.integers(1, 50, rows).astype('int32'),
+        "Total_Backward_Packets": rng.integers(0, 50, rows).astype('int32'),
+        "Fwd_Packet_Length_Mean": (rng.random(rows) * 500).astype('float32'),
+        "Bwd_Packet_Length_Mean": (rng.random(rows) * 500).astype('float32'),
+        "SYN_Flag_Count": rng.integers(0, 2, rows).astype('int32'),
+        "ACK_Flag_Count": rng.integers(0, 2, rows).astype('int32'),
+        "Init_Win_bytes_forward": rng.integers(-1, 65535, rows).astype('int32'),
+    })
+
+
+def measure(func: Callable, *args) -> float:
+    """
+    Zmeria najlepší čas vykonania funkcie z REPEATS opakovaní.
+
+    Parametre:
+        func (Callable): Meraná funkcia
+        *args: Argumenty funkcie
+
+    Návratová hodnota:
+        float: Najlepší čas v sekundách
+    """
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str]) -> None:
+    """
+    Spustí benchmark a vypíše časy a zrýchlenie.
+
+    Parametre:
+        argv (List[str]): Argumenty príkazového riadka
+    """
+    rows = int(argv[1]) if len(argv) > 1 else DEFAULT_ROWS
+    dataset = make_flow_dataset(rows)
+    print(f"Dataset: {rows} riadkov, {dataset.shape[1]} stĺpcov")
+
+    # Overenie zhody výstupov pred meraním
+    legacy = legacy_parse_chunk_to_string(dataset)
+    if parse_chunk_to_string(dataset) != legacy:
+        raise AssertionError("Výstup parse_chunk_to_string sa líši")
+    # Dataset iba s float32 stĺpcami sa neprevádza cez spoločné float64 pole
+    float_sample = dataset.select_dtypes('float32').iloc[:1000]
+    if (parse_chunk_to_string(float_sample)
+            != legacy_parse_chunk_to_string(float_sample)):
+        raise AssertionError("Výstup parse_chunk_to_string pre float32 "
+                             "stĺpce sa líši")
+    sample = dataset.iloc[:1000]
+    per_row = [legacy_parse_chunk_to_string(sample.iloc[[i]])
+               for i in range(len(sample))]
+    if parse_dataset_to_strings(sample) != per_row:
+        raise AssertionError("Výstup parse_dataset_to_strings sa líši")
+    print("Výstupy sú zhodné s pôvodnou implementáciou")
+
+    legacy_time = measure(legacy_parse_chunk_to_string, dataset)
+    chunk_time = measure(parse_chunk_to_string, dataset)
+    prompts_time = measure(parse_dataset_to_strings, dataset)
+
+    print(f"iterrows (pôvodne):        {legacy_time:8.3f} s")
+    print(f"parse_chunk_to_string:     {chunk_time:8.3f} s "
+          f"({legacy_time / chunk_time:.1f}x)")
+    print(f"parse_dataset_to_strings:  {prompts_time:8.3f} s "
+          f"({legacy_time / prompts_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,167 @@
+"""
+Benchmark času do prvého tokenu (TTFT) pri opakovanej klasifikácii tokov.
+
+Porovnáva šablónu FLOW_CLASSIFIER_TEMPLATE, ktorá má premenný tok až
+v poslednej sekcii, so šablónou s rovnakým obsahom, v ktorej je tok
+na začiatku promptu. Pri prefixovo stabilnej šablóne Ollama server znovu
+použije KV cache statických inštrukcií a spracúva iba premennú časť
+promptu, čo skracuje čas do prvého tokenu.
+
+Vyžaduje bežiaci Ollama server s príslušným modelom.
+
+Spustenie z adresára net_analyzer:
+    python -m benchmarks.ttft_benchmark [adresár_datasetu] [počet_tokov]
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import PromptTemplate
+
+from src.data_processing.process_IDS2017 import (
+    IDS2017_DTYPES,
+    IDS2017_IMPORTANT_COLUMNS,
+    filter_invalid_rows,
+    iter_ids2017_chunks,
+    unlabel_IDS2017_dataset
+)
+from src.llm.agents import FLOW_CLASSIFIER_TEMPLATE
+from src.llm.api_clients import (
+    close_clients,
+    preflight_client,
+    set_keep_alive
+)
+from src.llm.flows import spawn_flow_analysis_client
+from src.log_tools.flow_analyzer import iter_rendered_flows
+
+# Predvolený adresár s CSV súbormi datasetu
+DEFAULT_FLOW_FOLDER = "./flow_input"
+# Predvolený počet klasifikovaných tokov v každom režime
+DEFAULT_FLOWS = 20
+# Počet epoch ladenia modelu
+NUM_EPOCHS = 8
+# Doba držania modelu v pamäti servera počas benchmarku
+BENCHMARK_KEEP_ALIVE = "10m"
+# Začiatok sekcie s premenným vstupom v šablóne
+INPUT_SECTION = "\n        ## INPUT\n"
+
+
+def variable_first_template(template: str) -> str:
+    """
+    Presunie sekciu s premenným vstupom na začiatok šablóny (referencia).
+
+    Parametre:
+        template (str): Prefixovo stabilná šablóna agenta
+
+    Návratová hodnota:
+        str: Šablóna s rovnakým obsahom a premenným vstupom na začiatku
+    """
+    instructions, input_section = template.split(INPUT_SECTION)
+    return INPUT_SECTION + input_section + "\n" + instructions
+
+
+def load_flows(directory_path: Path, count: int) -> List[str]:
+    """
+    Načíta a vykreslí prvé platné toky datasetu bez štítkov.
+
+    Parametre:
+        directory_path (Path): Cesta k adresáru s CSV súbormi
+        count (int): Počet tokov
+
+    Návratová hodnota:
+        List[str]: Textová reprezentácia tokov
+    """
+    flows: List[str] = []
+    for chunk in iter_ids2017_chunks(directory_path,
+                                     columns=IDS2017_IMPORTANT_COLUMNS,
+                                     dtypes=IDS2017_DTYPES):
+        valid = filter_invalid_rows(chunk)[0].head(count - len(flows))
+        flows.extend(text for _, text in
+                     iter_rendered_flows(valid, unlabel_IDS2017_dataset))
+        if len(flows) >= count:
+            break
+    return flows
+
+
+def measure_ttft(client: BaseChatModel, template: str,
+                 flows: List[str]) -> Dict[str, float]:
+    """
+    Zmeria čas do prvého tokenu pre každý tok.
+
+    Parametre:
+        client (BaseChatModel): Ollama klient
+        template (str): Šablóna promptu s premennou {flow_data}
+        flows (List[str]): Textová reprezentácia tokov
+
+    Návratová hodnota:
+        Dict[str, float]: Medián ('median') a 90. percentil ('p90')
+        času do prvého tokenu v sekundách
+    """
+    prompt = PromptTemplate.from_template(template)
+    times = []
+    for flow in flows:
+        messages = prompt.format(flow_data=flow)
+        start = time.perf_counter()
+        for _ in client.stream(messages):
+            # Stačí prvý token, zvyšok odpovede sa negeneruje
+            times.append(time.perf_counter() - start)
+            break
+
+    if len(times) < 2:
+        # statistics.quantiles vyžaduje aspoň dve merania
+        value = times[0] if times else float("nan")
+        return {"median": value, "p90": value}
+    return {
+        "median": statistics.median(times),
+        "p90": statistics.quantiles(times, n=10)[-1],
+    }
+
+
+def main(argv: List[str]) -> None:
+    """
+    Spustí benchmark a vypíše porovnanie rozložení šablóny.
+
+    Parametre:
+        argv (List[str]): Argumenty príkazového riadka
+    """
+    directory_path = Path(argv[1] if len(argv) > 1 else DEFAULT_FLOW_FOLDER)
+    count = int(argv[2]) if len(argv) > 2 else DEFAULT_FLOWS
+
+    flows = load_flows(directory_path, count)
+    if not flows:
+        print(f"Adresár '{directory_path}' neobsahuje žiadne platné toky")
+        return
+    templates = {
+        "tok na začiatku": variable_first_template(FLOW_CLASSIFIER_TEMPLATE),
+        "tok na konci": FLOW_CLASSIFIER_TEMPLATE,
+    }
+
+    set_keep_alive(BENCHMARK_KEEP_ALIVE)
+    client = spawn_flow_analysis_client(NUM_EPOCHS)
+    # Overenie a načítanie modelu, aby sa načítanie nezapočítalo do prvého
+    # režimu
+    preflight_client(client)
+
+    try:
+        results = {name: measure_ttft(client, template, flows)
+                   for name, template in templates.items()}
+    finally:
+        close_clients()
+
+    print(f"{'rozloženie':<16} {'TTFT medián (s)':>16} {'TTFT p90 (s)':>14}")
+    for name, result in results.items():
+        print(f"{name:<16} {result['median']:>16.3f} {result['p90']:>14.3f}")
+
+    baseline = results["tok na začiatku"]["median"]
+    stable = results["tok na konci"]["median"]
+    if stable:
+        print(f"\nPrefixovo stabilná šablóna: {baseline / stable:.1f}x "
+              f"kratší čas do prvého tokenu ({len(flows)} tokov)")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,348 @@
+"""
+Tento modul poskytuje perzistentnú obsahovo adresovanú cache pre dataset
+CIC-IDS2017 uloženú vo formáte Parquet.
+
+Cache má dve úrovne:
+- načítané CSV súbory, kľúčované veľkosťou, časom úpravy a SHA-256 hashom
+  obsahu súboru spolu s projekciou stĺpcov a schémou typov,
+- vyčistený spojený dataset, kľúčovaný kľúčmi všetkých súborov
+  a nastaveniami čistenia (drop_na, drop_inf, drop_duplicates).
+
+Úprava alebo pridanie CSV súboru tak zneplatní iba záznam daného súboru
+a spojený dataset, ostatné súbory sa znovu neparsujú.
+
+Kľúče začínajú hashom schémy cache (verzia formátu a verzie knižníc,
+ktoré zapisujú Parquet). Záznamy inej schémy a najdlhšie nepoužité
+záznamy nad limitom CACHE_MAX_ENTRIES odstraňuje prune_cache.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow
+
+# Nastavenie loggera pre tento modul
+logger = logging.getLogger(__name__)
+
+# Verzia formátu cache - zvýšenie zneplatní všetky existujúce záznamy
+CACHE_FORMAT_VERSION = 1
+# Názov súboru s uloženými odtlačkami CSV súborov
+MANIFEST_FILENAME = "manifest.json"
+# Podpriečinky pre jednotlivé úrovne cache
+FILES_CACHE_DIR = "files"
+CLEANED_CACHE_DIR = "cleaned"
+# Maximálny počet záznamov pre každú úroveň cache, najdlhšie nepoužité
+# záznamy nad limitom sa odstránia
+CACHE_MAX_ENTRIES = {
+    FILES_CACHE_DIR: 64,
+    CLEANED_CACHE_DIR: 4,
+}
+# Dĺžka hashu schémy na začiatku kľúča záznamu
+SCHEMA_HASH_LENGTH = 12
+
+
+def load_manifest(cache_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Načíta manifest s odtlačkami CSV súborov z adresára cache.
+
+    Parametre:
+        cache_dir (Path): Adresár cache
+
+    Návratová hodnota:
+        Dict[str, Dict[str, Any]]: Odtlačky súborov podľa absolútnej cesty.
+            Pri chýbajúcom alebo poškodenom manifeste vráti prázdny slovník.
+    """
+    manifest_path = cache_dir / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return {}
+
+    try:
+        return json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Manifest cache '{manifest_path}' je nečitateľný, "
+                       f"bude vytvorený nový: {e}")
+        return {}
+
+
+def save_manifest(cache_dir: Path,
+                  manifest: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Uloží manifest s odtlačkami CSV súborov do adresára cache.
+
+    Parametre:
+        cache_dir (Path): Adresár cache
+        manifest (Dict[str, Dict[str, Any]]): Odtlačky súborov na uloženie
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = cache_dir / MANIFEST_FILENAME
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+
+def compute_file_fingerprint(
+    filepath: Path, manifest: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Vypočíta odtlačok súboru (veľkosť, čas úpravy a SHA-256 hash).
+
+    Hash obsahu sa počíta iba ak sa veľkosť alebo čas úpravy zmenili
+    oproti záznamu v manifeste, inak sa použije uložená hodnota.
+    Opakované spustenie tak nemusí čítať celé gigabajtové CSV súbory.
+
+    Parametre:
+        filepath (Path): Cesta k CSV súboru
+        manifest (Dict[str, Dict[str, Any]]): Manifest cache, ktorý sa
+            aktualizuje o nový odtlačok
+
+    Návratová hodnota:
+        Dict[str, Any]: Odtlačok s kľúčmi 'size', 'mtime_ns' a 'sha256'
+    """
+    stat = filepath.stat()
+    manifest_key = str(filepath.resolve())
+    cached = manifest.get(manifest_key)
+
+    # Nezmenená veľkosť aj čas úpravy - hash sa nepočíta znovu
+    if (cached is not None and cached.get('size') == stat.st_size
+            and cached.get('mtime_ns') == stat.st_mtime_ns):
+        return cached
+
+    with open(filepath, 'rb') as file:
+        digest = hashlib.file_digest(file, 'sha256').hexdigest()
+
+    fingerprint = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest,
+    }
+    manifest[manifest_key] = fingerprint
+    return fingerprint
+
+
+def _hash_key(payload: Dict[str, Any]) -> str:
+    """
+    Vytvorí stabilný kľúč cache z JSON serializovateľných údajov.
+
+    Parametre:
+        payload (Dict[str, Any]): Údaje určujúce obsah záznamu cache
+
+    Návratová hodnota:
+        str: Hexadecimálny SHA-256 hash údajov
+    """
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def get_cache_schema() -> str:
+    """
+    Vráti hash schémy cache.
+
+    Schéma zahŕňa verziu formátu cache a verzie knižníc pandas a pyarrow,
+    ktoré určujú obsah uložených Parquet súborov. Po ich zmene sa staré
+    záznamy nepoužijú a prune_cache ich odstráni.
+
+    Návratová hodnota:
+        str: Skrátený hexadecimálny hash schémy
+    """
+    return _hash_key({
+        'version': CACHE_FORMAT_VERSION,
+        'pandas': pd.__version__,
+        'pyarrow': pyarrow.__version__,
+    })[:SCHEMA_HASH_LENGTH]
+
+
+def get_file_cache_key(fingerprint: Dict[str, Any],
+                       columns: Optional[List[str]] = None,
+                       dtypes: Optional[Dict[str, str]] = None) -> str:
+    """
+    Vytvorí kľúč cache pre jeden načítaný CSV súbor.
+
+    Parametre:
+        fingerprint (Dict[str, Any]): Odtlačok súboru
+        columns (Optional[List[str]]): Projekcia stĺpcov použitá pri čítaní
+        dtypes (Optional[Dict[str, str]]): Schéma typov použitá pri čítaní
+
+    Návratová hodnota:
+        str: Kľúč cache
+    """
+    schema = get_cache_schema()
+    return schema + "-" + _hash_key({
+        'schema': schema,
+        'size': fingerprint['size'],
+        'mtime_ns': fingerprint['mtime_ns'],
+        'sha256': fingerprint['sha256'],
+        'columns': columns,
+        'dtypes': dtypes,
+    })
+
+
+def get_dataset_cache_key(file_keys: List[str],
+                          drop_na: bool,
+                          drop_inf: bool,
+                          drop_duplicates: bool) -> str:
+    """
+    Vytvorí kľúč cache pre vyčistený spojený dataset.
+
+    Parametre:
+        file_keys (List[str]): Kľúče cache súborov v poradí spájania
+        drop_na (bool): Či sa odstraňujú riadky s NaN hodnotami
+        drop_inf (bool): Či sa odstraňujú riadky s nekonečnými hodnotami
+        drop_duplicates (bool): Či sa odstraňujú duplicitné riadky
+
+    Návratová hodnota:
+        str: Kľúč cache
+    """
+    schema = get_cache_schema()
+    return schema + "-" + _hash_key({
+        'schema': schema,
+        'files': file_keys,
+        'drop_na': drop_na,
+        'drop_inf': drop_inf,
+        'drop_duplicates': drop_duplicates,
+    })
+
+
+def has_cached_frame(cache_dir: Path, kind: str, key: str) -> bool:
+    """
+    Zistí, či je záznam v cache uložený, bez jeho načítania.
+
+    Parametre:
+        cache_dir (Path): Adresár cache
+        kind (str): Úroveň cache (FILES_CACHE_DIR alebo CLEANED_CACHE_DIR)
+        key (str): Kľúč záznamu
+
+    Návratová hodnota:
+        bool: True ak záznam existuje
+    """
+    return (cache_dir / kind / f"{key}.parquet").exists()
+
+
+def read_cached_frame(cache_dir: Path, kind: str,
+                      key: str) -> Optional[pd.DataFrame]:
+    """
+    Načíta DataFrame z cache.
+
+    Parametre:
+        cache_dir (Path): Adresár cache
+        kind (str): Úroveň cache (FILES_CACHE_DIR alebo CLEANED_CACHE_DIR)
+        key (str): Kľúč záznamu
+
+    Návratová hodnota:
+        Optional[pd.DataFrame]: Uložený DataFrame, alebo None ak záznam
+            neexistuje alebo sa ho nepodarilo načítať
+    """
+    path = cache_dir / kind / f"{key}.parquet"
+    if not path.exists():
+        return None
+
+    try:
+        df = pd.read_parquet(path)
+        # Čas úpravy slúži ako čas posledného použitia pre prune_cache
+        path.touch()
+        return df
+    except Exception as e:
+        # Poškodený záznam sa ignoruje a bude prepísaný
+        logger.warning(f"Záznam cache '{path}' sa nepodarilo načítať: {e}")
+        return None
+
+
+def write_cached_frame(cache_dir: Path, kind: str, key: str,
+                       df: pd.DataFrame) -> None:
+    """
+    Uloží DataFrame do cache.
+
+    Zápis prebieha do dočasného súboru, ktorý sa následne premenuje,
+    aby prerušený zápis nezanechal poškodený záznam. Chyby pri zápise
+    sú iba zalogované, keďže cache nie je pre beh aplikácie nutná.
+
+    Parametre:
+        cache_dir (Path): Adresár cache
+        kind (str): Úroveň cache (FILES_CACHE_DIR alebo CLEANED_CACHE_DIR)
+        key (str): Kľúč záznamu
+        df (pd.DataFrame): DataFrame na uloženie
+    """
+    target_dir = cache_dir / kind
+    path = target_dir / f"{key}.parquet"
+    tmp_path = target_dir / f"{key}.parquet.tmp"
+
+    try:
+        target_dir.mkdir(parents=True, exist_ok=True)
+        # Index sa ukladá, vyčistený dataset si zachováva pôvodné indexy
+        df.to_parquet(tmp_path)
+        tmp_path.replace(path)
+        logger.info(f"Uložený záznam cache: {path}")
+    except Exception as e:
+        logger.warning(f"Záznam cache '{path}' sa nepodarilo uložiť: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def prune_cache(cache_dir: Path, keep_keys: Iterable[Optional[str]] = (),
+                max_entries: Optional[Dict[str, int]] = None) -> int:
+    """
+    Odstráni zastarané záznamy cache.
+
+    Odstránia sa záznamy s inou schémou (get_cache_schema), nedokončené
+    dočasné súbory a najdlhšie nepoužité záznamy nad limitom pre danú
+    úroveň cache. Záznamy z keep_keys sa neodstraňujú nikdy. Z manifestu
+    sa odstránia odtlačky súborov, ktoré už neexistujú.
+
+    Parametre:
+        cache_dir (Path): Adresár cache
+        keep_keys (Iterable[Optional[str]]): Kľúče záznamov aktuálneho
+            načítania, ktoré sa ponechajú
+        max_entries (Optional[Dict[str, int]]): Limit záznamov pre každú
+            úroveň cache. Predvolené: CACHE_MAX_ENTRIES
+
+    Návratová hodnota:
+        int: Počet odstránených záznamov
+    """
+    if max_entries is None:
+        max_entries = CACHE_MAX_ENTRIES
+    keep = {key for key in keep_keys if key is not None}
+    prefix = get_cache_schema() + "-"
+    removed = 0
+
+    for kind, limit in max_entries.items():
+        target_dir = cache_dir / kind
+        if not target_dir.is_dir():
+            continue
+
+        stale = list(target_dir.glob("*.parquet.tmp"))
+        current = []
+        kept = 0
+        for path in target_dir.glob("*.parquet"):
+            key = path.name[:-len(".parquet")]
+            if key in keep:
+                kept += 1
+                continue
+            if key.startswith(prefix):
+                current.append(path)
+            else:
+                stale.append(path)
+
+        # Najdlhšie nepoužité záznamy nad limit (pri čítaní sa obnovuje
+        # čas úpravy)
+        current.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+        stale.extend(current[max(limit - kept, 0):])
+
+        for path in stale:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Záznam cache '{path}' sa nepodarilo "
+                               f"odstrániť: {e}")
+
+    manifest = load_manifest(cache_dir)
+    missing = [key for key in manifest if not Path(key).exists()]
+    if missing:
+        for key in missing:
+            del manifest[key]
+        save_manifest(cache_dir, manifest)
+
+    if removed:
+        logger.info(f"Z cache '{cache_dir}' odstránených {removed} "
+                    f"zastaraných záznamov")
+    return removed
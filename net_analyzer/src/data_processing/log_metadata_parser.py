@@ -0,0 +1,394 @@
+"""
+Tento modul poskytuje deterministické extrahovanie metadát z Linux logov.
+
+Záznamy služieb sshd, login (telnet) a Samba majú pevný formát, službu,
+IP adresu útočníka a trvanie podozrivej aktivity je preto možné zistiť
+regulárnymi výrazmi bez volania LLM. Parser vráti LogsMetadata iba vtedy,
+keď je výsledok jednoznačný (jedna prevládajúca služba a IP adresa,
+známe časové značky). Inak vráti None a metadáta extrahuje Extraktor
+metadát (spawn_logs_metadata_extractor_agent).
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.system_core.data_models import LogsMetadata
+
+# Nastavenie loggera pre tento modul
+logger = logging.getLogger(__name__)
+
+# Minimálny podiel udalostí prevládajúcej služby a IP adresy útočníka,
+# pri nižšom podiele rozhodne Extraktor metadát
+LOG_METADATA_DOMINANCE = 0.8
+
+# IPv4 adresa
+_IP = r"(?:\d{1,3}\.){3}\d{1,3}"
+
+# Hodnota trvania a útočníka bez podozrivej aktivity, rovnaká ako vo
+# výstupe Extraktora metadát (LOGS_METADATA_EXTRACTOR_TEMPLATE)
+NO_METADATA_VALUE = "None"
+
+# Udalosti podľa služby - (služba, zlyhanie, vzor). Zlyhania overenia
+# určujú útočníka a trvanie, ostatné udalosti (spojenia a kroky overenia)
+# iba službu. Každý vzor môže zachytiť IP adresu zdroja v skupine "ip".
+# Samba zaznamenáva zlyhanie overenia bez adresy, zlyhanie preto prevezme
+# adresu predchádzajúcej udalosti tej istej služby.
+LOG_EVENT_PATTERNS: Tuple[Tuple[str, bool, str], ...] = (
+    ("SSH", True, rf"sshd\[\d+\]: Failed \S+ for (?:invalid user )?\S* "
+                  rf"from (?P<ip>{_IP})"),
+    ("SSH", True, rf"sshd\[\d+\]: Invalid user \S* from (?P<ip>{_IP})"),
+    ("SSH", True, rf"sshd\[\d+\]: pam_unix\(sshd:auth\): authentication "
+                  rf"failure;.*rhost=(?P<ip>{_IP})"),
+    ("SSH", False, rf"sshd\[\d+\]: (?:Connection closed by|Disconnected "
+                   rf"from) (?:invalid|authenticating) user \S* "
+                   rf"(?P<ip>{_IP})"),
+    ("telnet", True, rf"login\[\d+\]: FAILED LOGIN \(\d+\) on '\S+' "
+                     rf"from '(?P<ip>{_IP})'"),
+    ("telnet", True, rf"login\[\d+\]: pam_unix\(login:auth\): "
+                     rf"authentication failure;.*rhost=(?P<ip>{_IP})"),
+    ("telnet", False, rf"telnetd\[\d+\]: connect from (?P<ip>{_IP})"),
+    ("SMB", True, r"Authentication for user \[[^\]]*\] -> \[[^\]]*\] "
+                  r"FAILED"),
+    ("SMB", False, rf"client_connect: accepted connection from "
+                   rf"(?P<ip>{_IP})"),
+    ("SMB", False, rf"Checking password for unmapped user "
+                   rf"\[[^\]]*\]\\\[[^\]]*\]@\[(?P<ip>{_IP})\]"),
+    ("SMB", False, rf"remote host \[ipv4:(?P<ip>{_IP}):\d+\]"),
+)
+
+# Všetky vzory udalostí skompilované do jedného regulárneho výrazu.
+# Vetva i má skupinu "e<i>" a IP adresu v skupine "ip<i>".
+_EVENT_REGEX = re.compile("|".join(
+    f"(?P<e{i}>{pattern.replace('(?P<ip>', f'(?P<ip{i}>')})"
+    for i, (_, _, pattern) in enumerate(LOG_EVENT_PATTERNS)
+))
+
+# Časová značka na začiatku riadku - syslog vo formáte ISO 8601
+# ("2025-05-03T01:55:51.875253+02:00") alebo hlavička záznamu Samby
+# ("[2025/05/03 19:51:04.222949,  3]"), ktorej správa je na ďalšom riadku
+_TIMESTAMP_REGEX = re.compile(
+    r"^(?:(?P<iso>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?"
+    r"(?:Z|[+-]\d{2}:?\d{2})?)"
+    r"|\[(?P<samba>\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?),)"
+)
+
+# Extrahovanie metadát parserom pred Extraktorom metadát
+# (pozri set_metadata_fast_path)
+_fast_path_enabled = False
+# Počet rozhodnutí parsera, čas parsovania a meranie súbežného kroku
+# extrahovania metadát a popisu logov (pozri record_metadata_step)
+_fast_path_stats = {"hits": 0, "misses": 0, "parse_seconds": 0.0,
+                    "timed_hits": 0, "timed_misses": 0,
+                    "hit_step_seconds": 0.0, "miss_step_seconds": 0.0,
+                    "agent_seconds": 0.0}
+# Zámok pre štatistiky pri paralelnej analýze súborov
+_fast_path_lock = threading.Lock()
+
+
+def set_metadata_fast_path(enabled: bool) -> None:
+    """
+    Zapne alebo vypne extrahovanie metadát logov parserom.
+
+    Pri zapnutí sa metadáta trojagentovej analýzy logov najskôr extrahujú
+    parserom (parse_logs_metadata) a Extraktor metadát sa vyvolá iba pre
+    súbory, o ktorých parser nerozhodne.
+
+    Parametre:
+        enabled (bool): True pre extrahovanie parserom
+    """
+    global _fast_path_enabled
+    _fast_path_enabled = enabled
+    logger.info(f"Extrahovanie metadát logov bez LLM: "
+                f"{'zapnuté' if enabled else 'vypnuté'}")
+
+
+def is_metadata_fast_path_enabled() -> bool:
+    """
+    Vráti, či je zapnuté extrahovanie metadát logov parserom.
+
+    Návratová hodnota:
+        bool: True ak sa metadáta extrahujú najskôr parserom
+    """
+    return _fast_path_enabled
+
+
+def _parse_timestamp(line: str) -> Optional[datetime]:
+    # Časová značka riadku, None ak riadok žiadnu nemá
+    match = _TIMESTAMP_REGEX.match(line)
+    if match is None:
+        return None
+    if match.group("iso") is not None:
+        return datetime.fromisoformat(match.group("iso").replace("Z",
+                                                                 "+00:00"))
+    return datetime.strptime(match.group("samba").split(".")[0],
+                             "%Y/%m/%d %H:%M:%S")
+
+
+def format_iso_duration(duration: timedelta) -> str:
+    """
+    Naformátuje trvanie podľa ISO 8601 (napr. PT15M30S).
+
+    Parametre:
+        duration (timedelta): Trvanie
+
+    Návratová hodnota:
+        str: Trvanie zaokrúhlené na sekundy vo formáte ISO 8601
+    """
+    seconds = round(duration.total_seconds())
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    parts = [f"{value}{unit}" for value, unit in
+             ((hours, "H"), (minutes, "M"), (seconds, "S")) if value]
+    return "PT" + ("".join(parts) or "0S")
+
+
+def _dominant(counts: Counter) -> Optional[str]:
+    # Hodnota s podielom aspoň LOG_METADATA_DOMINANCE, inak None
+    value, count = counts.most_common(1)[0]
+    if count / sum(counts.values()) < LOG_METADATA_DOMINANCE:
+        return None
+    return value
+
+
+def _iter_log_entries(logs: str) -> Iterator[str]:
+    # Záznamy logov - odsadené pokračovacie riadky (zalomené správy,
+    # správy Samby pod hlavičkou s časom) sa pripoja k svojmu záznamu
+    entry: List[str] = []
+    for line in logs.splitlines():
+        if entry and line[:1].isspace():
+            entry.append(line.strip())
+            continue
+        if entry:
+            yield " ".join(entry)
+        entry = [line]
+    if entry:
+        yield " ".join(entry)
+
+
+def parse_logs_metadata(logs: str) -> Optional[LogsMetadata]:
+    """
+    Extrahuje metadáta z logov bez volania LLM.
+
+    Parser prejde záznamy logov (riadky s pripojenými odsadenými
+    pokračovacími riadkami), rozpozná udalosti podľa LOG_EVENT_PATTERNS
+    a priradí im poslednú známu časovú značku:
+    - služba je služba s prevládajúcim počtom udalostí,
+    - útočník je prevládajúca IP adresa zlyhaní overenia tejto služby,
+    - trvanie je čas medzi prvým a posledným zlyhaním tejto služby.
+
+    Spojenia a úspešné kroky overenia určujú iba službu. Ak služba nemá
+    žiadne zlyhanie overenia, trvanie aj útočník sú NO_METADATA_VALUE.
+
+    Parametre:
+        logs (str): Logové záznamy
+
+    Návratová hodnota:
+        Optional[LogsMetadata]: Metadáta logov, alebo None ak parser
+        nevie jednoznačne rozhodnúť (žiadne alebo zmiešané udalosti,
+        nejednoznačný útočník, zlyhania bez IP adresy alebo časových
+        značiek)
+    """
+    services: Counter = Counter()
+    failures: List[Tuple[str, Optional[str], Optional[datetime]]] = []
+    # Posledná IP adresa udalosti každej služby pre zlyhania bez adresy
+    last_address: Dict[str, str] = {}
+    timestamp = None
+
+    for entry in _iter_log_entries(logs):
+        timestamp = _parse_timestamp(entry) or timestamp
+        match = _EVENT_REGEX.search(entry)
+        if match is None:
+            continue
+
+        i = int(match.lastgroup[1:])
+        service, failure, _ = LOG_EVENT_PATTERNS[i]
+        services[service] += 1
+        address = match.groupdict().get(f"ip{i}")
+        if address is not None:
+            last_address[service] = address
+        if failure:
+            failures.append((service,
+                             address or last_address.get(service),
+                             timestamp))
+
+    if not services:
+        return None
+    service = _dominant(services)
+    if service is None:
+        return None
+
+    failures = [(ip, moment) for event_service, ip, moment in failures
+                if event_service == service]
+    if not failures:
+        # Iba bežná aktivita služby bez zlyhaní overenia
+        return LogsMetadata(duration=NO_METADATA_VALUE,
+                            attacker=NO_METADATA_VALUE, service=service)
+
+    addresses = Counter(ip for ip, _ in failures if ip is not None)
+    times = [moment for _, moment in failures if moment is not None]
+    if not addresses or not times:
+        return None
+    attacker = _dominant(addresses)
+    if attacker is None:
+        return None
+
+    try:
+        duration = format_iso_duration(max(times) - min(times))
+    except TypeError:
+        # Časové značky s časovým pásmom aj bez neho nie je možné porovnať
+        return None
+
+    return LogsMetadata(duration=duration, attacker=attacker,
+                        service=service)
+
+
+def fast_path_logs_metadata(logs: str) -> Optional[LogsMetadata]:
+    """
+    Extrahuje metadáta logov parserom, ak je extrahovanie parserom zapnuté.
+
+    Rozhodnutie parsera a čas parsovania sa započítajú do štatistík
+    (pozri log_fast_path_stats).
+
+    Parametre:
+        logs (str): Logové záznamy
+
+    Návratová hodnota:
+        Optional[LogsMetadata]: Metadáta logov, alebo None ak je
+        extrahovanie parserom vypnuté alebo parser nerozhodol
+    """
+    if not _fast_path_enabled:
+        return None
+
+    start = time.perf_counter()
+    metadata = parse_logs_metadata(logs)
+    parse_seconds = time.perf_counter() - start
+
+    with _fast_path_lock:
+        _fast_path_stats["hits" if metadata is not None else "misses"] += 1
+        _fast_path_stats["parse_seconds"] += parse_seconds
+    if metadata is None:
+        logger.info("Parser o metadátach logov nerozhodol, použije sa "
+                    "Extraktor metadát")
+    return metadata
+
+
+def record_metadata_step(step_seconds: float,
+                         agent_seconds: Optional[float]) -> None:
+    """
+    Zaznamená trvanie súbežného kroku extrahovania metadát a popisu logov.
+
+    Extraktor metadát beží súbežne s Popisovačom logov, čas Extraktora
+    preto neurčuje latenciu súboru. Ušetrená latencia sa odhaduje
+    z trvania celého súbežného kroku pri súboroch rozhodnutých parserom
+    a pri súboroch s Extraktorom metadát (pozri get_fast_path_stats).
+
+    Parametre:
+        step_seconds (float): Trvanie súbežného kroku v sekundách
+        agent_seconds (Optional[float]): Čas vyvolania Extraktora metadát
+            v sekundách, None ak metadáta extrahoval parser
+
+    Poznámka:
+        Kroky s odpoveďami z cache odpovedí (src/llm/response_cache.py)
+        nezodpovedajú času LLM a nemajú sa zaznamenať.
+    """
+    if not _fast_path_enabled:
+        return
+
+    with _fast_path_lock:
+        if agent_seconds is None:
+            _fast_path_stats["timed_hits"] += 1
+            _fast_path_stats["hit_step_seconds"] += step_seconds
+        else:
+            _fast_path_stats["timed_misses"] += 1
+            _fast_path_stats["miss_step_seconds"] += step_seconds
+            _fast_path_stats["agent_seconds"] += agent_seconds
+
+
+def get_fast_path_stats() -> Dict[str, Optional[float]]:
+    """
+    Vráti štatistiky deterministického extrahovania metadát.
+
+    Návratová hodnota:
+        Dict[str, Optional[float]]: Počet súborov rozhodnutých parserom
+        ('hits') a Extraktorom metadát ('misses'), podiel rozhodnutých
+        parserom ('hit_rate'), priemerný čas parsovania ('parse_seconds')
+        a vyvolania Extraktora metadát ('agent_seconds') na súbor,
+        priemerné trvanie súbežného kroku pri súboroch rozhodnutých
+        parserom ('hit_step_seconds') a Extraktorom ('miss_step_seconds'),
+        ušetrený výpočet LLM ('compute_saved_seconds') a ušetrená latencia
+        ('latency_saved_seconds') na súbor rozhodnutý parserom. Latencia
+        je None, kým nie je zmeraný krok oboch druhov.
+    """
+    with _fast_path_lock:
+        stats = dict(_fast_path_stats)
+
+    files = stats["hits"] + stats["misses"]
+    parse_seconds = stats["parse_seconds"] / files if files else 0.0
+    agent_seconds = (stats["agent_seconds"] / stats["timed_misses"]
+                     if stats["timed_misses"] else 0.0)
+    hit_step_seconds = (stats["hit_step_seconds"] / stats["timed_hits"]
+                        if stats["timed_hits"] else 0.0)
+    miss_step_seconds = (stats["miss_step_seconds"] / stats["timed_misses"]
+                         if stats["timed_misses"] else 0.0)
+    latency_saved_seconds = None
+    if stats["timed_hits"] and stats["timed_misses"]:
+        latency_saved_seconds = max(miss_step_seconds - hit_step_seconds,
+                                    0.0)
+    return {
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_rate": stats["hits"] / files if files else 0.0,
+        "parse_seconds": parse_seconds,
+        "agent_seconds": agent_seconds,
+        "hit_step_seconds": hit_step_seconds,
+        "miss_step_seconds": miss_step_seconds,
+        "compute_saved_seconds": (max(agent_seconds - parse_seconds, 0.0)
+                                  if stats["timed_misses"] else 0.0),
+        "latency_saved_seconds": latency_saved_seconds,
+    }
+
+
+def log_fast_path_stats() -> None:
+    """
+    Zaloguje podiel súborov rozhodnutých parserom a ušetrený čas.
+
+    Ušetrený výpočet LLM na súbor sa odhaduje priemerným časom Extraktora
+    metadát. Ušetrená latencia je rozdiel priemerného trvania súbežného
+    kroku s Extraktorom metadát a bez neho.
+    """
+    stats = get_fast_path_stats()
+    files = stats["hits"] + stats["misses"]
+    if not files:
+        return
+
+    message = (f"Metadáta logov bez LLM: {stats['hits']}/{files} súborov "
+               f"({stats['hit_rate']:.0%}), parsovanie "
+               f"{stats['parse_seconds'] * 1000:.1f} ms/súbor")
+    if stats["agent_seconds"]:
+        message += (f", Extraktor metadát {stats['agent_seconds']:.2f} "
+                    f"s/súbor, ušetrený výpočet LLM "
+                    f"~{stats['compute_saved_seconds']:.2f} s na súbor "
+                    f"rozhodnutý parserom")
+    if stats["latency_saved_seconds"] is not None:
+        message += (f", súbežný krok {stats['miss_step_seconds']:.2f} s "
+                    f"s Extraktorom / {stats['hit_step_seconds']:.2f} s "
+                    f"bez neho, ušetrená latencia "
+                    f"~{stats['latency_saved_seconds']:.2f} s na súbor")
+    logger.info(message)
+
+
+def reset_fast_path_stats() -> None:
+    """
+    Vynuluje štatistiky deterministického extrahovania metadát.
+    """
+    with _fast_path_lock:
+        _fast_path_stats.update(hits=0, misses=0, parse_seconds=0.0,
+                                timed_hits=0, timed_misses=0,
+                                hit_step_seconds=0.0,
+                                miss_step_seconds=0.0, agent_seconds=0.0)
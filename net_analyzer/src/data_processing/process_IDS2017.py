@@ -8,17 +8,178 @@ datasetu CIC-IDS 2017 z CSV súborov. Umožňuje flexibilné načítanie súboro
 import pandas as pd
 import numpy as np
 import logging
-from typing import List, Optional
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from pandas import DataFrame
 from pathlib import Path
 
 from src.data_processing.utils import (validate_directory_path, get_csv_files,
-                                       load_single_csv_file, filter_important_columns)
+                                       load_single_csv_file, filter_important_columns,
+                                       read_csv_header, iter_csv_chunks,
+                                       relax_integer_dtypes, hash_rows,
+                                       RowHashSet, DatasetRecord)
+from src.data_processing.dataset_cache import (
+    load_manifest, save_manifest, compute_file_fingerprint,
+    get_file_cache_key, get_dataset_cache_key, has_cached_frame,
+    read_cached_frame, write_cached_frame, prune_cache, FILES_CACHE_DIR,
+    CLEANED_CACHE_DIR)
 from src.system_core.exceptions import DatasetLoadError
 
 # Konfigurácia logovacieho systému
 logger = logging.getLogger(__name__)
 
+# Definícia kľúčových stĺpcov pre detekciu útokov hrubou silou
+# Tieto stĺpce boli vybrané na základe ich relevantnosti pre útoky
+# podľa predchádzajúcej analýzy a literatúry. Názvy sú štandardizované
+# (standardize_column_index), napr. 'Flow Bytes/s' -> 'Flow_Bytess'.
+IDS2017_IMPORTANT_COLUMNS = [
+    "Destination_Port",        # Cieľový port
+    "Flow_Duration",           # Trvanie komunikácie
+    "Total_Fwd_Packets",       # Počet odoslaných paketov
+    "Total_Backward_Packets",  # Počet prijatých paketov
+    "Flow_Bytess",             # Intenzita toku v bytoch za sekundu
+    "Flow_Packetss",           # Intenzita toku v paketoch za sekundu
+    "Fwd_Packet_Length_Mean",  # Priemerná dĺžka odoslaných paketov
+    "Bwd_Packet_Length_Mean",  # Priemerná dĺžka prijatých paketov
+    "SYN_Flag_Count",         # Počet SYN flagov (nadväzovanie spojenia)
+    "ACK_Flag_Count",         # Počet ACK flagov (potvrdenia)
+    "Init_Win_bytes_forward",  # Veľkosť initial window
+    "Label"                   # Klasifikáačný štítok
+]
+
+# Pevná schéma dátových typov CIC-IDS2017 podľa štandardizovaných názvov
+# stĺpcov. Počítadlá sú zmenšené na int32 a štítok je kategorický, čo
+# výrazne znižuje pamäťové nároky. Intenzity a priemery ostávajú float64 -
+# hodnoty sa vkladajú do promptov a float32 by ich zmenil (napr.
+# 8.666666667 -> 8.666666984558105), čím by sa zmenil vstup modelu.
+IDS2017_DTYPES = {
+    "Destination_Port": "int32",
+    "Flow_Duration": "int32",
+    "Total_Fwd_Packets": "int32",
+    "Total_Backward_Packets": "int32",
+    "Flow_Bytess": "float64",
+    "Flow_Packetss": "float64",
+    "Fwd_Packet_Length_Mean": "float64",
+    "Bwd_Packet_Length_Mean": "float64",
+    "SYN_Flag_Count": "int32",
+    "ACK_Flag_Count": "int32",
+    "Init_Win_bytes_forward": "int32",
+    "Label": "category",
+}
+
+# Pravidlá kvantizácie tokov na kanonické signatúry pre cache výsledkov
+# takmer zhodných tokov (pozri quantize_values). Hranice košov sú zvolené
+# tak, aby nezotreli kritériá Klasifikačného agenta pre toky (počty paketov
+# sa porovnávajú presne, trvanie po 0,1 s). Stĺpce bez pravidla (port,
+# flagy, veľkosť okna) sa porovnávajú presne.
+IDS2017_SIGNATURE_BUCKETS = {
+    "Flow_Duration": 100000,         # Trvanie v mikrosekundách, koše 0,1 s
+    "Flow_Bytess": "log2",           # Intenzity podľa rádu
+    "Flow_Packetss": "log2",
+    "Fwd_Packet_Length_Mean": 4.0,   # Priemerné dĺžky paketov po 4 B
+    "Bwd_Packet_Length_Mean": 4.0,
+}
+
+# Predvolený počet vzoriek pre každý štítok vyberaných na analýzu tokov
+IDS2017_SAMPLE_QUOTAS = {
+    "BENIGN": 100,       # Normálna sieťová aktivita
+    "SSH-Patator": 100,  # Útoky hrubou silou na SSH
+}
+
+# Počet riadkov CSV súboru načítaných naraz pri prúdovom spracovaní
+DEFAULT_CHUNKSIZE = 100000
+
+# Limit pamäte hashov riadkov pri deduplikácii mimo pamäte v MB,
+# po jeho prekročení sa hashe odkladajú na disk
+DEDUP_MEMORY_LIMIT_MB = 256
+# Predpona súborov partícií vyčisteného datasetu na disku
+PARTITION_PREFIX = "part"
+
+# Odhad pamäte potrebnej na spracovanie jedného súboru ako násobok jeho
+# veľkosti na disku (parsovanie a štandardizácia)
+INGEST_MEMORY_FACTOR = 2.0
+
+
+def invalid_rows_mask(df: pd.DataFrame,
+                      drop_na: bool = True,
+                      drop_inf: bool = True) -> Tuple[np.ndarray, int, int]:
+    """
+    Vypočíta masku platných riadkov v jednom prechode stĺpcami.
+
+    Pre numerické stĺpce sa použije np.isfinite nad numpy poľom stĺpca,
+    ktoré pokrýva NaN aj nekonečné hodnoty naraz. Rozlíšenie NaN od
+    nekonečna sa počíta iba pre nekonečné riadky, aby bolo možné logovať
+    rovnaké počty ako pri postupnom dropna a odstránení inf hodnôt.
+    Celočíselné stĺpce nemôžu obsahovať NaN ani inf, preto sa preskočia.
+
+    Parametre:
+        df (pd.DataFrame): DataFrame na kontrolu
+        drop_na (bool): Či označiť riadky s NaN hodnotami ako neplatné
+        drop_inf (bool): Či označiť riadky s nekonečnými hodnotami
+            ako neplatné
+
+    Návratová hodnota:
+        Tuple[np.ndarray, int, int]: Boolean maska ponechaných riadkov,
+            počet riadkov s NaN hodnotami a počet riadkov s nekonečnými
+            hodnotami (bez NaN, ak sa NaN odstraňujú)
+    """
+    na_rows = np.zeros(len(df), dtype=bool)
+    inf_rows = np.zeros(len(df), dtype=bool)
+
+    for _, column in df.items():
+        if pd.api.types.is_float_dtype(column.dtype):
+            values = column.to_numpy()
+            nonfinite = ~np.isfinite(values)
+            if not nonfinite.any():
+                continue
+            nan_values = nonfinite & np.isnan(values)
+            na_rows |= nan_values
+            inf_rows |= nonfinite & ~nan_values
+        elif (drop_na and not pd.api.types.is_integer_dtype(column.dtype)
+              and not pd.api.types.is_bool_dtype(column.dtype)):
+            # Nenumerické stĺpce (napr. štítok) - iba chýbajúce hodnoty
+            na_rows |= column.isna().to_numpy()
+
+    keep = np.ones(len(df), dtype=bool)
+    rows_removed_na = 0
+    rows_removed_inf = 0
+    if drop_na:
+        keep &= ~na_rows
+        rows_removed_na = int(na_rows.sum())
+    if drop_inf:
+        # Nekonečné hodnoty sa počítajú iba v riadkoch, ktoré ostali
+        inf_rows &= keep
+        keep &= ~inf_rows
+        rows_removed_inf = int(inf_rows.sum())
+
+    return keep, rows_removed_na, rows_removed_inf
+
+
+def filter_invalid_rows(df: pd.DataFrame,
+                        drop_na: bool = True,
+                        drop_inf: bool = True
+                        ) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Odstráni riadky s NaN a nekonečnými hodnotami bez logovania.
+
+    Parametre:
+        df (pd.DataFrame): DataFrame na filtrovanie
+        drop_na (bool): Či odstrániť riadky s NaN hodnotami
+        drop_inf (bool): Či odstrániť riadky s nekonečnými hodnotami
+
+    Návratová hodnota:
+        Tuple[pd.DataFrame, int, int]: Filtrovaný DataFrame, počet riadkov
+            odstránených kvôli NaN a počet riadkov odstránených kvôli
+            nekonečným hodnotám
+    """
+    keep, rows_removed_na, rows_removed_inf = invalid_rows_mask(
+        df, drop_na=drop_na, drop_inf=drop_inf)
+    if not keep.all():
+        df = df.take(np.flatnonzero(keep))
+
+    return df, rows_removed_na, rows_removed_inf
+
 
 def clean_dataframe(df: pd.DataFrame,
                     drop_na: bool = True,
@@ -31,6 +192,10 @@ def clean_dataframe(df: pd.DataFrame,
     a duplicitné riadky podľa nastavení parametrov. Všetky operácie sú
     logované pre lepšiu sledovateľnosť.
 
+    Všetky kroky sa vyhodnotia nad maskami a hashmi riadkov a výsledok
+    sa vytvorí jedinou operáciou take, takže DataFrame sa kopíruje iba
+    raz. Duplicity sa určujú podľa 64-bitového hashu celého riadku.
+
     Parametre:
         df (pd.DataFrame): DataFrame na vyčistenie
         drop_na (bool): Či odstrániť riadky s NaN hodnotami
@@ -42,39 +207,52 @@ def clean_dataframe(df: pd.DataFrame,
     """
     original_shape = df.shape
 
-    # Odstránenie NaN hodnôt
+    # Maska riadkov bez NaN a nekonečných hodnôt
+    keep, rows_removed_na, rows_removed_inf = invalid_rows_mask(
+        df, drop_na=drop_na, drop_inf=drop_inf)
     if drop_na:
-        df = df.dropna()
-        logger.info(f"Odstránené riadky s NaN hodnotami: "
-                    f"{original_shape[0] - df.shape[0]}")
-
-    # Odstránenie nekonečných hodnôt
-    if drop_inf:
-        # Nájdi numerické stĺpce
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_columns) > 0:
-            # Odstráň riadky s inf/-inf hodnotami iba v numerických stĺpcoch
-            rows_before_inf = df.shape[0]
-            mask = ~df[numeric_columns].isin([np.inf, -np.inf]).any(axis=1)
-            df = df[mask]
-            rows_removed_inf = rows_before_inf - df.shape[0]
-            if rows_removed_inf > 0:
-                logger.info(f"Odstránené riadky s nekonečnými hodnotami: "
-                            f"{rows_removed_inf}")
-
-    # Odstránenie duplicitných riadkov
-    if drop_duplicates:
-        duplicates_before = df.shape[0]
-        df = df.drop_duplicates()
-        duplicates_removed = duplicates_before - df.shape[0]
+        logger.info(f"Odstránené riadky s NaN hodnotami: {rows_removed_na}")
+    if rows_removed_inf > 0:
+        logger.info(f"Odstránené riadky s nekonečnými hodnotami: "
+                    f"{rows_removed_inf}")
+    positions = np.flatnonzero(keep)
+
+    # Odstránenie duplicitných riadkov - ponechá sa prvý výskyt hashu
+    if drop_duplicates and len(positions):
+        hashes = hash_rows(df)[positions]
+        first = np.unique(hashes, return_index=True)[1]
+        duplicates_removed = len(positions) - len(first)
         if duplicates_removed > 0:
+            positions = positions[np.sort(first)]
             logger.info(f"Odstránené duplicitné riadky: {duplicates_removed}")
 
+    # Jediná kópia dát pre všetky kroky čistenia
+    if len(positions) < original_shape[0]:
+        df = df.take(positions)
+
     logger.info(f"Čistenie dokončené. Pôvodný tvar: {original_shape}, "
                 f"nový tvar: {df.shape}")
     return df
 
 
+def standardize_column_index(columns: pd.Index) -> pd.Index:
+    """
+    Štandardizuje zoznam názvov stĺpcov.
+
+    Odstráni medzery na okrajoch, nahradí vnútorné medzery podčiarkovníkom
+    a odstráni špeciálne znaky.
+
+    Parametre:
+        columns (pd.Index): Pôvodné názvy stĺpcov
+
+    Návratová hodnota:
+        pd.Index: Štandardizované názvy stĺpcov v rovnakom poradí
+    """
+    return (columns.str.strip()
+            .str.replace(' ', '_')
+            .str.replace('[^a-zA-Z0-9_]', '', regex=True))
+
+
 def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     """
     Štandardizuje názvy stĺpcov v DataFrame.
@@ -89,13 +267,68 @@ def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame so štandardizovanými názvami stĺpcov
     """
     # Odstráň medzery a špeciálne znaky z názvov stĺpcov
-    df.columns = (df.columns.str.strip()
-                  .str.replace(' ', '_')
-                  .str.replace('[^a-zA-Z0-9_]', '', regex=True))
+    df.columns = standardize_column_index(df.columns)
 
     return df
 
 
+def resolve_column_projection(
+        filepath: Path,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None
+) -> Tuple[Optional[List[str]], Optional[Dict[str, str]]]:
+    """
+    Preloží projekciu a schému typov na pôvodné názvy stĺpcov v súbore.
+
+    Projekcia aj schéma sú zadané pomocou štandardizovaných názvov, no
+    pandas pri čítaní pracuje s pôvodnými názvami z hlavičky (napr.
+    ' Destination Port'). Funkcia preto najskôr načíta iba hlavičku,
+    štandardizuje ju a až potom vyberie zodpovedajúce pôvodné názvy.
+
+    Parametre:
+        filepath (Path): Cesta k CSV súboru
+        columns (Optional[List[str]]): Štandardizované názvy stĺpcov na
+            načítanie. Ak je None, načítajú sa všetky stĺpce.
+        dtypes (Optional[Dict[str, str]]): Dátové typy podľa
+            štandardizovaných názvov. Ak je None, typy sa odvodia.
+
+    Návratová hodnota:
+        Tuple[Optional[List[str]], Optional[Dict[str, str]]]: Pôvodné názvy
+            stĺpcov pre parameter usecols a schéma typov podľa pôvodných
+            názvov pre parameter dtype
+    """
+    if columns is None and dtypes is None:
+        return None, None
+
+    # Mapovanie štandardizovaných názvov na pôvodné názvy z hlavičky
+    raw_columns = read_csv_header(filepath)
+    standardized = standardize_column_index(raw_columns)
+    raw_by_standardized = {}
+    for raw, std in zip(raw_columns, standardized):
+        # Pri duplicitných názvoch sa ponechá prvý výskyt
+        raw_by_standardized.setdefault(std, raw)
+
+    usecols = None
+    if columns is not None:
+        missing = [col for col in columns if col not in raw_by_standardized]
+        if missing:
+            logger.warning(f"Súbor '{filepath.name}' neobsahuje stĺpce: "
+                           f"{missing}")
+        usecols = [raw_by_standardized[col] for col in columns
+                   if col in raw_by_standardized]
+
+    dtype = None
+    if dtypes is not None:
+        dtype = {
+            raw_by_standardized[col]: col_type
+            for col, col_type in dtypes.items()
+            if col in raw_by_standardized
+            and (usecols is None or raw_by_standardized[col] in usecols)
+        }
+
+    return usecols, dtype
+
+
 def standardize_label_column(df: pd.DataFrame) -> pd.DataFrame:
     """
     Štandardizuje stĺpec 'Label' v DataFrame.
@@ -110,18 +343,253 @@ def standardize_label_column(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame so štandardizovaným stĺpcom 'Label'
     """
     if 'Label' in df.columns:
+        categorical = isinstance(df['Label'].dtype, pd.CategoricalDtype)
         df['Label'] = df['Label'].astype(str).str.strip()
+        if categorical:
+            # Zachovanie kategorického typu zo schémy pre úsporu pamäte
+            df['Label'] = df['Label'].astype('category')
         logger.info("Štandardizovaný stĺpec 'Label' na string typ")
 
     return df
 
 
+def apply_dtype_schema(df: pd.DataFrame,
+                       dtypes: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """
+    Aplikuje schému dátových typov na štandardizovaný DataFrame.
+
+    Používa sa pri prúdovom čítaní, kde sú celočíselné stĺpce načítané
+    ako float64 (chýbajúca hodnota sa môže objaviť v ktorejkoľvek časti).
+    Po odstránení neplatných riadkov sa typy vrátia podľa schémy, aby
+    výsledok zodpovedal načítaniu celého súboru. Stĺpce, ktoré stále
+    obsahujú NaN, si ponechajú pôvodný typ.
+
+    Parametre:
+        df (pd.DataFrame): DataFrame so štandardizovanými názvami stĺpcov
+        dtypes (Optional[Dict[str, str]]): Schéma typov podľa
+            štandardizovaných názvov
+
+    Návratová hodnota:
+        pd.DataFrame: DataFrame s typmi podľa schémy
+    """
+    if not dtypes:
+        return df
+
+    casts = {}
+    for col, col_type in dtypes.items():
+        if col not in df.columns or str(df[col].dtype) == col_type:
+            continue
+        if col_type.startswith('int') and df[col].isna().any():
+            continue
+        casts[col] = col_type
+
+    return df.astype(casts) if casts else df
+
+
+def ingest_ids2017_file(
+        filepath: Path,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+        cache_dir: Optional[Path] = None,
+        file_key: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Načíta a pripraví jeden CSV súbor datasetu CIC-IDS2017.
+
+    Funkcia je samostatnou jednotkou práce, ktorú je možné spustiť
+    v pracovnom procese. Súbor načíta z cache alebo z CSV a štandardizuje
+    názvy stĺpcov a štítky. Čistí sa až spojený dataset, takže počty
+    odstránených riadkov nezávisia od spôsobu načítania.
+
+    Parametre:
+        filepath (Path): Cesta k CSV súboru
+        columns (Optional[List[str]]): Projekcia stĺpcov pri čítaní
+        dtypes (Optional[Dict[str, str]]): Schéma dátových typov
+        cache_dir (Optional[Path]): Adresár cache načítaných súborov
+        file_key (Optional[str]): Kľúč súboru v cache
+
+    Návratová hodnota:
+        Optional[pd.DataFrame]: Pripravený DataFrame, alebo None ak sa
+            súbor nepodarilo načítať
+    """
+    df = None
+    if cache_dir is not None and file_key is not None:
+        df = read_cached_frame(cache_dir, FILES_CACHE_DIR, file_key)
+        if df is not None:
+            logger.info(f"Súbor '{filepath.name}' načítaný z cache - "
+                        f"tvar: {df.shape}")
+
+    if df is None:
+        # Načítanie jednotlivého súboru iba so stĺpcami z projekcie
+        usecols, dtype = resolve_column_projection(filepath, columns, dtypes)
+        df = load_single_csv_file(filepath, usecols=usecols, dtype=dtype)
+        if df is None:
+            return None
+        if cache_dir is not None and file_key is not None:
+            write_cached_frame(cache_dir, FILES_CACHE_DIR, file_key, df)
+
+    # Štandardizácia súboru
+    df = standardize_column_names(df)
+    df = standardize_label_column(df)
+
+    return df
+
+
+def ingest_ids2017_files_parallel(
+        filepaths: List[Path],
+        file_keys: Optional[List[Optional[str]]] = None,
+        max_workers: Optional[int] = None,
+        max_memory_mb: Optional[int] = None,
+        **ingest_kwargs) -> List[Optional[pd.DataFrame]]:
+    """
+    Paralelne načíta viacero CSV súborov pomocou poolu procesov.
+
+    Každý pracovný proces súbor načíta a štandardizuje
+    (ingest_ids2017_file). Výsledky sú vrátené v poradí vstupných súborov
+    bez ohľadu na poradie dokončenia, takže spojený dataset je
+    deterministický.
+
+    Parametre:
+        filepaths (List[Path]): Cesty k CSV súborom v poradí spájania
+        file_keys (Optional[List[Optional[str]]]): Kľúče súborov v cache
+            v rovnakom poradí ako filepaths. Ak je None, cache sa nepoužije.
+        max_workers (Optional[int]): Maximálny počet pracovných procesov.
+            Ak je None, použije sa počet jadier procesora.
+        max_memory_mb (Optional[int]): Horný limit odhadovanej pamäte
+            súčasne spracovávaných súborov v MB. Súbor sa odošle na
+            spracovanie až keď sa zmestí do limitu; aspoň jeden súbor
+            sa spracováva vždy. Ak je None, pamäť nie je obmedzená.
+        **ingest_kwargs: Ďalšie parametre pre ingest_ids2017_file
+
+    Návratová hodnota:
+        List[Optional[pd.DataFrame]]: Načítané DataFrame v poradí súborov,
+            None pre súbory, ktoré sa nepodarilo načítať
+    """
+    results: List[Optional[pd.DataFrame]] = [None] * len(filepaths)
+    if file_keys is None:
+        file_keys = [None] * len(filepaths)
+    # Odhad pamäte na spracovanie každého súboru v bajtoch
+    estimates = [filepath.stat().st_size * INGEST_MEMORY_FACTOR
+                 for filepath in filepaths]
+    memory_cap = (max_memory_mb * 1024 * 1024
+                  if max_memory_mb is not None else None)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        in_flight_memory = 0.0
+        next_index = 0
+
+        while next_index < len(filepaths) or pending:
+            # Odoslanie ďalších súborov, kým sa zmestia do pamäťového limitu
+            while next_index < len(filepaths) and (
+                    not pending or memory_cap is None
+                    or in_flight_memory + estimates[next_index]
+                    <= memory_cap):
+                future = executor.submit(
+                    ingest_ids2017_file, filepaths[next_index],
+                    file_key=file_keys[next_index], **ingest_kwargs)
+                pending[future] = next_index
+                in_flight_memory += estimates[next_index]
+                next_index += 1
+
+            # Čakanie na dokončenie aspoň jedného súboru
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                in_flight_memory -= estimates[index]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Chyba pri spracovaní súboru "
+                                 f"'{filepaths[index].name}': {e}")
+
+    return results
+
+
+def get_ids2017_cache_keys(
+        directory_path: Path,
+        csv_files: List[str],
+        columns: Optional[List[str]],
+        dtypes: Optional[Dict[str, str]],
+        drop_na: bool,
+        drop_inf: bool,
+        drop_duplicates: bool,
+        cache_dir: Path) -> Tuple[List[str], str]:
+    """
+    Vypočíta kľúče cache načítaných súborov a vyčisteného datasetu.
+
+    Parametre:
+        directory_path (Path): Cesta k adresáru s CSV súbormi
+        csv_files (List[str]): Názvy CSV súborov v poradí spájania
+        columns (Optional[List[str]]): Projekcia stĺpcov pri čítaní
+        dtypes (Optional[Dict[str, str]]): Schéma dátových typov
+        drop_na (bool): Či sa odstraňujú riadky s NaN hodnotami
+        drop_inf (bool): Či sa odstraňujú riadky s nekonečnými hodnotami
+        drop_duplicates (bool): Či sa odstraňujú duplicitné riadky
+        cache_dir (Path): Adresár cache
+
+    Návratová hodnota:
+        Tuple[List[str], str]: Kľúče cache súborov a kľúč vyčisteného
+            datasetu
+    """
+    manifest = load_manifest(cache_dir)
+    file_keys = [
+        get_file_cache_key(
+            compute_file_fingerprint(directory_path / filename, manifest),
+            columns, dtypes)
+        for filename in csv_files
+    ]
+    save_manifest(cache_dir, manifest)
+
+    dataset_key = get_dataset_cache_key(
+        file_keys, drop_na, drop_inf, drop_duplicates)
+    return file_keys, dataset_key
+
+
+def is_ids2017_cache_warm(
+        directory_path: Path,
+        selected_files: Optional[List[str]],
+        columns: Optional[List[str]],
+        dtypes: Optional[Dict[str, str]],
+        drop_na: bool,
+        drop_inf: bool,
+        drop_duplicates: bool,
+        cache_dir: Path) -> bool:
+    """
+    Zistí, či je vyčistený dataset pre aktuálne vstupy uložený v cache.
+
+    Parametre:
+        directory_path (Path): Cesta k adresáru s CSV súbormi
+        selected_files (Optional[List[str]]): Konkrétne súbory na načítanie
+        columns (Optional[List[str]]): Projekcia stĺpcov pri čítaní
+        dtypes (Optional[Dict[str, str]]): Schéma dátových typov
+        drop_na (bool): Či sa odstraňujú riadky s NaN hodnotami
+        drop_inf (bool): Či sa odstraňujú riadky s nekonečnými hodnotami
+        drop_duplicates (bool): Či sa odstraňujú duplicitné riadky
+        cache_dir (Path): Adresár cache
+
+    Návratová hodnota:
+        bool: True ak load_ids2017_dataset načíta dataset z cache
+    """
+    validate_directory_path(directory_path)
+    csv_files = get_csv_files(directory_path, selected_files)
+    _, dataset_key = get_ids2017_cache_keys(
+        directory_path, csv_files, columns, dtypes, drop_na, drop_inf,
+        drop_duplicates, cache_dir)
+    return has_cached_frame(cache_dir, CLEANED_CACHE_DIR, dataset_key)
+
+
 def load_ids2017_dataset(
         directory_path: Path,
         selected_files: Optional[List[str]] = None,
         drop_na: bool = True,
         drop_inf: bool = True,
-        drop_duplicates: bool = True) -> pd.DataFrame:
+        drop_duplicates: bool = True,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+        cache_dir: Optional[Path] = None,
+        max_workers: Optional[int] = 1,
+        max_memory_mb: Optional[int] = None
+) -> pd.DataFrame:
     """
     Načíta a spracuje IDS 2017 dataset z CSV súborov.
 
@@ -140,11 +608,32 @@ def load_ids2017_dataset(
             Predvolené: True
         drop_duplicates (bool): Či odstrániť duplicitné riadky.
             Predvolené: True
+        columns (Optional[List[str]]): Štandardizované názvy stĺpcov, ktoré
+            sa majú načítať (projekcia pri čítaní). Ak je None, načítajú sa
+            všetky stĺpce. Predvolené: None
+        dtypes (Optional[Dict[str, str]]): Schéma dátových typov podľa
+            štandardizovaných názvov stĺpcov aplikovaná pri čítaní,
+            napr. IDS2017_DTYPES. Predvolené: None
+        cache_dir (Optional[Path]): Adresár perzistentnej Parquet cache.
+            Ak je zadaný, načítané súbory aj vyčistený dataset sa ukladajú
+            a pri nezmenených vstupoch sa CSV súbory vôbec neparsujú.
+            Zastarané záznamy sa odstránia pomocou prune_cache.
+            Predvolené: None (bez cache)
+        max_workers (Optional[int]): Počet pracovných procesov pre načítanie
+            súborov. Hodnota 1 načíta súbory postupne v hlavnom procese,
+            None použije všetky jadrá procesora. Dataset sa v oboch
+            prípadoch čistí raz, po spojení súborov. Predvolené: 1
+        max_memory_mb (Optional[int]): Limit odhadovanej pamäte súčasne
+            spracovávaných súborov pri paralelnom načítaní v MB.
+            Predvolené: None (bez limitu)
 
     Návratová hodnota:
-        pd.DataFrame: Kombinovaný a vyčistený dataset zo všetkých načítaných
-            súborov. DataFrame obsahuje štandardizované názvy stĺpcov
-            a vyčistené dáta.
+        pd.DataFrame: Kombinovaný a vyčistený dataset zo všetkých
+            načítaných súborov so štandardizovanými názvami stĺpcov
+
+    Poznámka:
+        Dataset, ktorý sa nezmestí do pamäte, je možné vyčistiť po
+        častiach do partícií na disku pomocou clean_ids2017_out_of_core.
 
     Vyvoláva:
         FileNotFoundError: Ak zadaný adresár neexistuje
@@ -161,16 +650,51 @@ def load_ids2017_dataset(
         logger.info(f"Nájdených {len(csv_files)} súborov na načítanie: "
                     f"{csv_files}")
 
+        # Výpočet kľúčov cache a pokus o načítanie vyčisteného datasetu
+        file_keys = [None] * len(csv_files)
+        dataset_key = None
+        if cache_dir is not None:
+            file_keys, dataset_key = get_ids2017_cache_keys(
+                directory_path, csv_files, columns, dtypes, drop_na,
+                drop_inf, drop_duplicates, cache_dir)
+            # Odstránenie záznamov inej schémy a nepoužívaných záznamov
+            prune_cache(cache_dir, keep_keys=file_keys + [dataset_key])
+            dataset = read_cached_frame(
+                cache_dir, CLEANED_CACHE_DIR, dataset_key)
+            if dataset is not None:
+                logger.info(f"Vyčistený dataset načítaný z cache - tvar: "
+                            f"{dataset.shape}")
+                return dataset
+
         # Načítanie všetkých CSV súborov
+        filepaths = [directory_path / filename for filename in csv_files]
+        ingest_kwargs = {
+            'columns': columns,
+            'dtypes': dtypes,
+            'cache_dir': cache_dir,
+        }
+
+        if max_workers == 1 or len(filepaths) == 1:
+            loaded = []
+            for filepath, file_key in zip(filepaths, file_keys):
+                logger.info(f"Načítavam súbor: {filepath.name}")
+                loaded.append(ingest_ids2017_file(
+                    filepath, file_key=file_key, **ingest_kwargs))
+        else:
+            logger.info(f"Načítavam {len(filepaths)} súborov paralelne "
+                        f"(procesy: {max_workers or 'všetky jadrá'}, "
+                        f"pamäťový limit: {max_memory_mb} MB)")
+            loaded = ingest_ids2017_files_parallel(
+                filepaths,
+                file_keys=file_keys,
+                max_workers=max_workers,
+                max_memory_mb=max_memory_mb,
+                **ingest_kwargs
+            )
+
         dataframes = []
         total_rows = 0
-
-        for filename in csv_files:
-            filepath = directory_path / filename
-            logger.info(f"Načítavam súbor: {filename}")
-
-            # Načítanie jednotlivého súboru
-            df = load_single_csv_file(filepath)
+        for filename, df in zip(csv_files, loaded):
             if df is not None:
                 dataframes.append(df)
                 total_rows += df.shape[0]
@@ -200,6 +724,11 @@ def load_ids2017_dataset(
             drop_duplicates=drop_duplicates
         )
 
+        # Vyčistený dataset sa uloží iba ak sa načítali všetky súbory
+        if dataset_key is not None and len(dataframes) == len(csv_files):
+            write_cached_frame(cache_dir, CLEANED_CACHE_DIR, dataset_key,
+                               dataset)
+
         return dataset
 
     except Exception as e:
@@ -209,7 +738,410 @@ def load_ids2017_dataset(
         ) from e
 
 
-def preprocess_IDS2017_dataset(dataset: DataFrame) -> DataFrame:
+def iter_ids2017_chunks(
+        directory_path: Path,
+        selected_files: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Postupne načítava CSV súbory datasetu CIC-IDS2017 po častiach.
+
+    Každá časť má štandardizované názvy stĺpcov a štítky. Index riadkov
+    pokračuje naprieč súbormi rovnako ako pri pd.concat(ignore_index=True)
+    nad celými súbormi.
+
+    Parametre:
+        directory_path (Path): Cesta k adresáru s CSV súbormi
+        selected_files (Optional[List[str]]): Konkrétne súbory na načítanie
+        columns (Optional[List[str]]): Projekcia stĺpcov pri čítaní
+        dtypes (Optional[Dict[str, str]]): Schéma dátových typov
+        chunksize (int): Počet riadkov v jednej časti
+
+    Návratová hodnota:
+        Iterator[pd.DataFrame]: Štandardizované časti datasetu
+    """
+    validate_directory_path(directory_path)
+    csv_files = get_csv_files(directory_path, selected_files)
+
+    offset = 0
+    for filename in csv_files:
+        filepath = directory_path / filename
+        logger.info(f"Prúdovo načítavam súbor: {filename}")
+        usecols, dtype = resolve_column_projection(filepath, columns, dtypes)
+
+        rows_in_file = 0
+        for chunk in iter_csv_chunks(filepath, chunksize, usecols, dtype):
+            rows_in_file += len(chunk)
+            chunk.index = chunk.index + offset
+            chunk = standardize_column_names(chunk)
+            if 'Label' in chunk.columns:
+                chunk['Label'] = chunk['Label'].astype(str).str.strip()
+            yield chunk
+
+        # Posun indexu o počet riadkov súboru
+        offset += rows_in_file
+
+
+def clean_ids2017_out_of_core(
+        directory_path: Path,
+        output_dir: Path,
+        selected_files: Optional[List[str]] = None,
+        drop_na: bool = True,
+        drop_inf: bool = True,
+        drop_duplicates: bool = True,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        dedup_memory_mb: Optional[float] = DEDUP_MEMORY_LIMIT_MB) -> Path:
+    """
+    Vyčistí dataset CIC-IDS2017 mimo pamäte do partícií na disku.
+
+    CSV súbory sa čítajú po častiach, z každej časti sa odstránia riadky
+    s NaN a nekonečnými hodnotami a duplicity sa odstraňujú pomocou
+    množiny hashov riadkov s obmedzenou pamäťou (RowHashSet), ktorá sa
+    pri prekročení limitu odkladá na disk. Každá vyčistená časť sa zapíše
+    ako samostatná Parquet partícia, takže v pamäti je naraz iba jedna
+    časť datasetu.
+
+    Výsledok zodpovedá načítaniu v pamäti (load_ids2017_dataset): rovnaké
+    riadky v rovnakom poradí s rovnakým indexom a rovnaké logované počty
+    odstránených riadkov. Vyčistený dataset je možné načítať pomocou
+    pd.read_parquet(output_dir) alebo postupne po partíciách.
+
+    Parametre:
+        directory_path (Path): Cesta k adresáru s CSV súbormi
+        output_dir (Path): Adresár pre partície vyčisteného datasetu.
+            Existujúce partície v adresári sa prepíšu.
+        selected_files (Optional[List[str]]): Konkrétne súbory na načítanie
+        drop_na (bool): Či odstrániť riadky s NaN hodnotami
+        drop_inf (bool): Či odstrániť riadky s nekonečnými hodnotami
+        drop_duplicates (bool): Či odstrániť duplicitné riadky
+        columns (Optional[List[str]]): Projekcia stĺpcov pri čítaní
+        dtypes (Optional[Dict[str, str]]): Schéma dátových typov
+        chunksize (int): Počet riadkov v jednej časti
+        dedup_memory_mb (Optional[float]): Limit pamäte hashov pri
+            deduplikácii v MB. Predvolené: DEDUP_MEMORY_LIMIT_MB
+
+    Návratová hodnota:
+        Path: Adresár s partíciami vyčisteného datasetu
+
+    Vyvoláva:
+        DatasetLoadError: Ak sa vyskytne chyba pri spracovaní datasetu
+    """
+    try:
+        validate_directory_path(directory_path)
+        csv_files = get_csv_files(directory_path, selected_files)
+        logger.info(f"Nájdených {len(csv_files)} súborov na čistenie "
+                    f"mimo pamäte: {csv_files}")
+
+        # Zjednotenie stĺpcov všetkých súborov v poradí prvého výskytu,
+        # rovnako ako pri pd.concat(sort=False)
+        all_columns: List[str] = []
+        for filename in csv_files:
+            header = standardize_column_index(
+                read_csv_header(directory_path / filename))
+            for col in header:
+                if ((columns is None or col in columns)
+                        and col not in all_columns):
+                    all_columns.append(col)
+
+        # Partície musia mať rovnakú schému - bez odstránenia NaN ostávajú
+        # celočíselné stĺpce vo float64 rovnako v každej partícii
+        schema = dtypes if drop_na or not dtypes else relax_integer_dtypes(dtypes)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for old_partition in output_dir.glob(f"{PARTITION_PREFIX}-*.parquet"):
+            old_partition.unlink()
+
+        total_rows = 0
+        rows_removed_na = 0
+        rows_removed_inf = 0
+        duplicates_removed = 0
+        rows_written = 0
+        partitions = 0
+
+        # Odložené hashe sa po dokončení čistenia odstránia
+        with tempfile.TemporaryDirectory(prefix=".dedup-",
+                                         dir=output_dir) as spill_dir:
+            seen_rows = RowHashSet(
+                memory_limit_mb=dedup_memory_mb,
+                spill_dir=Path(spill_dir) if dedup_memory_mb else None)
+
+            for chunk in iter_ids2017_chunks(directory_path, selected_files,
+                                             columns, dtypes, chunksize):
+                total_rows += len(chunk)
+                if list(chunk.columns) != all_columns:
+                    chunk = chunk.reindex(columns=all_columns)
+
+                chunk, na_removed, inf_removed = filter_invalid_rows(
+                    chunk, drop_na=drop_na, drop_inf=drop_inf)
+                rows_removed_na += na_removed
+                rows_removed_inf += inf_removed
+
+                if drop_duplicates and len(chunk):
+                    new_rows = seen_rows.add_new(hash_rows(chunk))
+                    duplicates_removed += len(chunk) - int(new_rows.sum())
+                    chunk = chunk[new_rows]
+
+                # Prázdne časti sa nezapisujú
+                if not len(chunk):
+                    continue
+
+                chunk = apply_dtype_schema(chunk, schema)
+                # Index sa ukladá vždy ako stĺpec, aby sa zachoval aj pri
+                # načítaní všetkých partícií naraz
+                chunk.to_parquet(
+                    output_dir / f"{PARTITION_PREFIX}-{partitions:05d}.parquet",
+                    index=True)
+                partitions += 1
+                rows_written += len(chunk)
+
+            if drop_duplicates and seen_rows.spilled_runs:
+                logger.info(f"Deduplikácia odložila na disk "
+                            f"{seen_rows.spilled_runs} behov hashov")
+
+        if partitions == 0:
+            # Zachovanie schémy aj pre prázdny výsledok
+            pd.DataFrame(columns=all_columns).to_parquet(
+                output_dir / f"{PARTITION_PREFIX}-00000.parquet", index=True)
+
+        # Rovnaké správy ako pri čistení v pamäti (clean_dataframe)
+        if drop_na:
+            logger.info(f"Odstránené riadky s NaN hodnotami: "
+                        f"{rows_removed_na}")
+        if rows_removed_inf > 0:
+            logger.info(f"Odstránené riadky s nekonečnými hodnotami: "
+                        f"{rows_removed_inf}")
+        if duplicates_removed > 0:
+            logger.info(f"Odstránené duplicitné riadky: {duplicates_removed}")
+        logger.info(f"Čistenie dokončené. Pôvodný tvar: "
+                    f"{(total_rows, len(all_columns))}, nový tvar: "
+                    f"{(rows_written, len(all_columns))}")
+        logger.info(f"Vyčistený dataset uložený do {partitions} partícií "
+                    f"v '{output_dir}'")
+
+        return output_dir
+
+    except Exception as e:
+        logger.error(f"Chyba pri čistení datasetu mimo pamäte: {e}")
+        raise DatasetLoadError(
+            f"Chyba pri čistení datasetu z '{directory_path}' "
+            f"mimo pamäte: {e}"
+        ) from e
+
+
+def sampling_generators(quotas: Dict[str, int],
+                        seed: Optional[int] = None
+                        ) -> Dict[str, np.random.Generator]:
+    """
+    Vytvorí generátory náhodných kľúčov riadkov pre režim "reservoir".
+
+    Každý štítok má vlastný generátor, ktorý priradí kľúč každému
+    vyčistenému riadku štítku v poradí datasetu. Kľúče preto nezávisia
+    od delenia datasetu na časti a prúdový výber (sample_ids2017_dataset)
+    vyberie rovnaké riadky ako výber z celého datasetu
+    (preprocess_IDS2017_dataset).
+
+    Parametre:
+        quotas (Dict[str, int]): Počet vzoriek pre každý štítok
+        seed (Optional[int]): Semienko výberu, None pre náhodné semienko
+            (zaloguje sa pre zopakovanie behu)
+
+    Návratová hodnota:
+        Dict[str, np.random.Generator]: Generátor kľúčov pre každý štítok
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2 ** 32)
+        logger.info(f"Semienko náhodného výberu vzoriek: {seed}")
+    return {label: np.random.default_rng([seed, position])
+            for position, label in enumerate(quotas)}
+
+
+def smallest_keys(keys: np.ndarray, quota: int) -> np.ndarray:
+    """
+    Vráti pozície quota najmenších kľúčov v poradí datasetu.
+
+    Výber riadkov s najmenšími náhodnými kľúčmi je rovnomerná náhodná
+    vzorka bez opakovania (reservoir sampling s kľúčmi).
+
+    Parametre:
+        keys (np.ndarray): Náhodné kľúče riadkov v poradí datasetu
+        quota (int): Počet vyberaných riadkov
+
+    Návratová hodnota:
+        np.ndarray: Vzostupne zoradené pozície vybraných riadkov
+    """
+    if len(keys) <= quota:
+        return np.arange(len(keys))
+    return np.sort(np.argpartition(keys, quota - 1)[:quota])
+
+
+def sample_ids2017_dataset(
+        directory_path: Path,
+        quotas: Optional[Dict[str, int]] = None,
+        mode: str = "head",
+        selected_files: Optional[List[str]] = None,
+        columns: Optional[List[str]] = IDS2017_IMPORTANT_COLUMNS,
+        dtypes: Optional[Dict[str, str]] = IDS2017_DTYPES,
+        drop_na: bool = True,
+        drop_inf: bool = True,
+        drop_duplicates: bool = True,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    Prúdovo vyberie vzorky datasetu CIC-IDS2017 podľa kvót pre štítky.
+
+    Súbory sa čítajú po častiach, každá časť sa vyčistí rovnako ako
+    v clean_dataframe a riadky sa rozdelia podľa štítkov. Dataset sa
+    nikdy nenačíta celý do pamäte.
+
+    Režimy výberu:
+        - "head": prvých N riadkov každého štítku (rovnaký výsledok ako
+          .head(N) nad celým vyčisteným datasetom). Čítanie sa ukončí
+          hneď, ako sú všetky kvóty naplnené.
+        - "reservoir": náhodná vzorka N riadkov každého štítku pomocou
+          stratifikovaného reservoir samplingu v jednom prechode dátami.
+          Pri rovnakom semienku vyberie rovnaké riadky ako
+          preprocess_IDS2017_dataset nad celým vyčisteným datasetom.
+
+    Parametre:
+        directory_path (Path): Cesta k adresáru s CSV súbormi
+        quotas (Optional[Dict[str, int]]): Počet vzoriek pre každý štítok.
+            Poradie určuje poradie skupín vo výsledku.
+            Predvolené: IDS2017_SAMPLE_QUOTAS
+        mode (str): Režim výberu - "head" alebo "reservoir"
+        selected_files (Optional[List[str]]): Konkrétne súbory na načítanie
+        columns (Optional[List[str]]): Projekcia stĺpcov pri čítaní
+        dtypes (Optional[Dict[str, str]]): Schéma dátových typov
+        drop_na (bool): Či vynechať riadky s NaN hodnotami
+        drop_inf (bool): Či vynechať riadky s nekonečnými hodnotami
+        drop_duplicates (bool): Či vynechať duplicitné riadky
+        chunksize (int): Počet riadkov načítaných naraz
+        seed (Optional[int]): Semienko výberu pre režim "reservoir"
+            (pozri sampling_generators)
+
+    Návratová hodnota:
+        pd.DataFrame: Vybrané vzorky zoskupené podľa štítkov v poradí kvót
+            s novým indexom od 0
+
+    Vyvoláva:
+        ValueError: Pri neznámom režime výberu
+        DatasetLoadError: Ak sa vyskytne chyba pri čítaní datasetu
+    """
+    if quotas is None:
+        quotas = IDS2017_SAMPLE_QUOTAS
+    if mode not in ("head", "reservoir"):
+        raise ValueError(f"Neznámy režim výberu vzoriek: '{mode}'")
+
+    generators = (sampling_generators(quotas, seed)
+                  if mode == "reservoir" else {})
+    # Deduplikácia stačí nad riadkami sledovaných štítkov, keďže štítok
+    # je súčasťou riadku a duplikáty teda majú vždy rovnaký štítok
+    seen_rows = RowHashSet()
+    # Vybrané časti riadkov pre každý štítok (head)
+    selected: Dict[str, List[pd.DataFrame]] = {label: [] for label in quotas}
+    # Počet doteraz vybraných riadkov (head)
+    counts = {label: 0 for label in quotas}
+    # Rezervoár každého štítku - riadky s najmenšími kľúčmi v poradí
+    # datasetu a ich kľúče (reservoir)
+    reservoirs: Dict[str, pd.DataFrame] = {}
+    reservoir_keys = {label: np.empty(0) for label in quotas}
+    rows_read = 0
+
+    try:
+        for chunk in iter_ids2017_chunks(directory_path, selected_files,
+                                         columns, dtypes, chunksize):
+            rows_read += len(chunk)
+            chunk = chunk[chunk['Label'].isin(quotas.keys())]
+            chunk, _, _ = filter_invalid_rows(chunk, drop_na, drop_inf)
+            if drop_duplicates and len(chunk):
+                chunk = chunk[seen_rows.add_new(hash_rows(chunk))]
+
+            for label, quota in quotas.items():
+                rows = chunk[chunk['Label'] == label]
+                if mode == "head":
+                    missing = quota - counts[label]
+                    if missing > 0 and len(rows):
+                        rows = rows.head(missing)
+                        selected[label].append(rows)
+                        counts[label] += len(rows)
+                    continue
+
+                # Reservoir sampling s kľúčmi - rezervoár predchádza
+                # novým riadkom, spojenie preto zachová poradie datasetu
+                if not len(rows):
+                    continue
+                keys = np.concatenate([reservoir_keys[label],
+                                       generators[label].random(len(rows))])
+                kept = smallest_keys(keys, quota)
+                merged = (pd.concat([reservoirs[label], rows])
+                          if label in reservoirs else rows)
+                reservoirs[label] = merged.iloc[kept]
+                reservoir_keys[label] = keys[kept]
+
+            # Predčasné ukončenie čítania po naplnení všetkých kvót
+            if mode == "head" and all(
+                    counts[label] >= quota
+                    for label, quota in quotas.items()):
+                logger.info(f"Všetky kvóty naplnené po načítaní "
+                            f"{rows_read} riadkov, čítanie ukončené")
+                break
+
+    except Exception as e:
+        logger.error(f"Chyba pri výbere vzoriek datasetu: {e}")
+        raise DatasetLoadError(
+            f"Chyba pri výbere vzoriek datasetu z '{directory_path}': {e}"
+        ) from e
+
+    samples = []
+    for label in quotas:
+        if mode == "reservoir":
+            if label in reservoirs:
+                samples.append(reservoirs[label])
+        elif selected[label]:
+            samples.append(pd.concat(selected[label]))
+
+    if not samples:
+        raise DatasetLoadError("Dataset neobsahuje žiadne vzorky "
+                               f"so štítkami {list(quotas)}")
+
+    sampled = pd.concat(samples, ignore_index=True)
+    sampled = apply_dtype_schema(sampled, dtypes)
+    logger.info(
+        "Vybrané vzorky: " + ", ".join(
+            f"{len(sampled[sampled['Label'] == label])} {label}"
+            for label in quotas)
+    )
+    return sampled
+
+
+def check_important_columns(dataset: DataFrame) -> None:
+    """
+    Overí, že predspracovaný dataset obsahuje všetky dôležité stĺpce.
+
+    filter_important_columns chýbajúce stĺpce ticho preskočí, takže
+    preklep alebo neštandardizovaný názov v IDS2017_IMPORTANT_COLUMNS by
+    inak bez upozornenia odstránil príznak z analýzy tokov.
+
+    Parametre:
+        dataset (DataFrame): Predspracovaný dataset
+
+    Vyvoláva:
+        DatasetLoadError: Ak niektorý dôležitý stĺpec v datasete chýba
+    """
+    missing = [col for col in IDS2017_IMPORTANT_COLUMNS
+               if col not in dataset.columns]
+    if missing:
+        raise DatasetLoadError(f"Predspracovaný dataset neobsahuje dôležité "
+                               f"stĺpce: {missing}")
+
+
+def preprocess_IDS2017_dataset(
+        dataset: DataFrame,
+        quotas: Optional[Dict[str, int]] = None,
+        mode: str = "head",
+        seed: Optional[int] = None) -> DataFrame:
     """
     Spracuje načítaný CIC-IDS2017 dataset pre analýzu útokov hrubou silou.
 
@@ -224,6 +1156,13 @@ def preprocess_IDS2017_dataset(dataset: DataFrame) -> DataFrame:
 
     Parametre:
         dataset (DataFrame): Načítaný a vyčistený CIC-IDS2017 dataset
+        quotas (Optional[Dict[str, int]]): Počet vzoriek pre každý štítok.
+            Predvolené: IDS2017_SAMPLE_QUOTAS (100 BENIGN + 100 SSH-Patator)
+        mode (str): Režim výberu vzoriek - "head" (prvé vzorky každého
+            štítku) alebo "reservoir" (náhodné vzorky v poradí datasetu),
+            rovnako ako pri sample_ids2017_dataset. Predvolené: "head"
+        seed (Optional[int]): Semienko výberu pre režim "reservoir".
+            Predvolené: None (náhodné semienko)
 
     Vyvoláva:
         DatasetLoadError: Ak sa vyskytne chyba pri spracovaní datasetu
@@ -236,44 +1175,32 @@ def preprocess_IDS2017_dataset(dataset: DataFrame) -> DataFrame:
     """
     logger.info("Spúšťa sa analýza IDS2017 datasetu...")
 
-    # Definícia kľúčových stĺpcov pre detekciu útokov hrubou silou
-    # Tieto stĺpce boli vybrané na základe ich relevantnosti pre útoky
-    # podľa predchádzajúcej analýzy a literatúry.
-    important_columns = [
-        "Destination_Port",        # Cieľový port
-        "Flow_Duration",           # Trvanie komunikácie
-        "Total_Fwd_Packets",       # Počet odoslaných paketov
-        "Total_Backward_Packets",  # Počet prijatých paketov
-        "Flow_Bytes/s",            # Intenzita toku v bytoch za sekundu
-        "Flow_Packets/s",         # Intenzita toku v paketoch za sekundu
-        "Fwd_Packet_Length_Mean",  # Priemerná dĺžka odoslaných paketov
-        "Bwd_Packet_Length_Mean",  # Priemerná dĺžka prijatých paketov
-        "SYN_Flag_Count",         # Počet SYN flagov (nadväzovanie spojenia)
-        "ACK_Flag_Count",         # Počet ACK flagov (potvrdenia)
-        "Init_Win_bytes_forward",  # Veľkosť initial window
-        "Label"                   # Klasifikáačný štítok
-    ]
-
     # Filtrovanie datasetu na vybrané dôležité stĺpce
     try:
-        filtered_dataset = filter_important_columns(dataset, important_columns)
+        filtered_dataset = filter_important_columns(
+            dataset, IDS2017_IMPORTANT_COLUMNS)
+        check_important_columns(filtered_dataset)
         logger.info("Dataset úspešne filtrovaný")
 
         # Výber reprezentatívnych vzoriek pre efektívnu analýzu
-        # 100 BENIGN vzoriek - normálna sieťová aktivita
-        benign_samples = filtered_dataset[
-            filtered_dataset["Label"] == "BENIGN"
-        ].head(100)
-
-        # 100 SSH-Patator vzoriek - útoky na SSH
-        ssh_patator_samples = filtered_dataset[
-            filtered_dataset["Label"] == "SSH-Patator"
-        ].head(100)
+        # (predvolene 100 BENIGN a 100 SSH-Patator vzoriek)
+        if quotas is None:
+            quotas = IDS2017_SAMPLE_QUOTAS
+        if mode not in ("head", "reservoir"):
+            raise ValueError(f"Neznámy režim výberu vzoriek: '{mode}'")
+        generators = (sampling_generators(quotas, seed)
+                      if mode == "reservoir" else {})
+        samples = []
+        for label, quota in quotas.items():
+            rows = filtered_dataset[filtered_dataset["Label"] == label]
+            if mode == "head":
+                samples.append(rows.head(quota))
+            else:
+                keys = generators[label].random(len(rows))
+                samples.append(rows.iloc[smallest_keys(keys, quota)])
 
         # Spojenie vzoriek do jedného datasetu pre analýzu
-        filtered_dataset = pd.concat(
-            [benign_samples, ssh_patator_samples], ignore_index=True
-        )
+        filtered_dataset = pd.concat(samples, ignore_index=True)
 
     except Exception as e:
         logger.error(f"Chyba pri spracovaní datasetu: {e}")
@@ -282,29 +1209,35 @@ def preprocess_IDS2017_dataset(dataset: DataFrame) -> DataFrame:
         ) from e
 
     logger.info(
-        f"Vybrané vzorky: {len(benign_samples)} BENIGN, "
-        f"{len(ssh_patator_samples)} SSH-Patator"
+        "Vybrané vzorky: " + ", ".join(
+            f"{len(sample)} {label}"
+            for sample, label in zip(samples, quotas))
     )
 
     return filtered_dataset
 
 
-def get_IDS2017_label(frame: pd.DataFrame) -> bool:
+def get_IDS2017_label(frame: Union[pd.DataFrame, DatasetRecord]) -> bool:
     """
     Určuje, či záznam v datasete IDS2017 je škodlivý alebo neškodný.
 
     Parametre:
-        frame (pd.DataFrame): DataFrame obsahujúci aspoň jeden riadok s posledným
-                             stĺpcom ako štítkom
+        frame (Union[pd.DataFrame, DatasetRecord]): DataFrame obsahujúci
+                             aspoň jeden riadok s posledným stĺpcom ako
+                             štítkom, alebo záznam z iter_dataset_records
 
     Návratová hodnota:
         bool: True ak je záznam označený ako "SSH-Patator", inak False
 
     Poznámka:
         Funkcia kontroluje len prvý riadok DataFrame a konkrétne hľadá
-        štítok "SSH-Patator" v poslednom stĺpci.
+        štítok "SSH-Patator" v poslednom stĺpci. Pri zázname sa použije
+        jeho štítok bez vytvárania DataFrame.
     """
-    label = frame.iloc[0, -1]
+    if isinstance(frame, DatasetRecord):
+        label = frame.label
+    else:
+        label = frame.iloc[0, -1]
     if label == "SSH-Patator":
         malicious = True
     else:
@@ -314,8 +1247,8 @@ def get_IDS2017_label(frame: pd.DataFrame) -> bool:
 
 
 def unlabel_IDS2017_dataset(
-    dataset: pd.DataFrame, label_column: str = 'Label'
-) -> pd.DataFrame:
+    dataset: Union[pd.DataFrame, DatasetRecord], label_column: str = 'Label'
+) -> Union[pd.DataFrame, DatasetRecord]:
     """
     Odstráni klasifikačný stĺpec so štítkom z datasetu.
 
@@ -324,19 +1257,27 @@ def unlabel_IDS2017_dataset(
     iné nepotrebné stĺpce. Funkcia kontroluje existenciu stĺpca pred odstránením.
 
     Parametre:
-        dataset (pd.DataFrame): Dataset na úpravu. Musí byť platný DataFrame.
+        dataset (Union[pd.DataFrame, DatasetRecord]): Dataset na úpravu
+                                     alebo záznam z iter_dataset_records.
         label_column (str, optional): Názov stĺpca na odstránenie.
                                      Predvolená hodnota je 'Label'.
 
     Návratová hodnota:
-        pd.DataFrame: Dataset bez klasifikačného stĺpca. Ak stĺpec neexistuje,
-                      vracia pôvodný dataset bez zmien.
+        Union[pd.DataFrame, DatasetRecord]: Dataset bez klasifikačného
+                      stĺpca. Ak stĺpec neexistuje, vracia pôvodný dataset
+                      bez zmien. Záznam sa vráti bez štítku.
 
     Poznámka:
         Táto funkcia nevyvoláva výnimky, ak stĺpec neexistuje, ale vypíše
         upozornenie do logu. Je vhodná pre prípady, keď nie je isté, či
-        stĺpec existuje v každom datasete.
+        stĺpec existuje v každom datasete. Hodnoty záznamu štítok
+        neobsahujú (oddeľuje ho už iter_dataset_records), preto sa iba
+        odstráni jeho štítok.
     """
+    # Záznam - štítok je uložený mimo hodnôt riadku
+    if isinstance(dataset, DatasetRecord):
+        return dataset._replace(label=None)
+
     # Kontrola existencie stĺpca pred odstránením
     if label_column in dataset.columns:
         # Vytvorenie kópie datasetu bez zadaného stĺpca
@@ -352,7 +1293,15 @@ def load_and_preprocess_ids2017_dataset(
         selected_files: Optional[List[str]] = None,
         drop_na: bool = True,
         drop_inf: bool = True,
-        drop_duplicates: bool = True) -> pd.DataFrame:
+        drop_duplicates: bool = True,
+        columns: Optional[List[str]] = IDS2017_IMPORTANT_COLUMNS,
+        dtypes: Optional[Dict[str, str]] = IDS2017_DTYPES,
+        cache_dir: Optional[Path] = None,
+        max_workers: Optional[int] = 1,
+        max_memory_mb: Optional[int] = None,
+        sampling: Optional[str] = None,
+        quotas: Optional[Dict[str, int]] = None,
+        seed: Optional[int] = None) -> pd.DataFrame:
     """
     Načíta a predspracuje IDS 2017 dataset v jednom kroku.
 
@@ -371,6 +1320,29 @@ def load_and_preprocess_ids2017_dataset(
             Predvolené: True
         drop_duplicates (bool): Či odstrániť duplicitné riadky.
             Predvolené: True
+        columns (Optional[List[str]]): Stĺpce načítané z CSV súborov.
+            Predvolené: IDS2017_IMPORTANT_COLUMNS (iba stĺpce potrebné
+            pre analýzu tokov)
+        dtypes (Optional[Dict[str, str]]): Schéma dátových typov
+            aplikovaná pri čítaní. Predvolené: IDS2017_DTYPES
+        cache_dir (Optional[Path]): Adresár perzistentnej cache vyčisteného
+            datasetu. Predvolené: None (bez cache)
+        max_workers (Optional[int]): Počet pracovných procesov pre načítanie
+            súborov, None pre všetky jadrá. Predvolené: 1 (postupne)
+        max_memory_mb (Optional[int]): Limit odhadovanej pamäte pri
+            paralelnom načítaní v MB. Predvolené: None (bez limitu)
+        sampling (Optional[str]): Režim výberu vzoriek ("head" alebo
+            "reservoir"). Ak je vyčistený dataset v cache, vzorky sa
+            vyberú z neho. Inak sa vyberú prúdovo (sample_ids2017_dataset)
+            bez načítania celého datasetu. Oba spôsoby vyberú rovnaké
+            riadky. Predvolené: None (prvé vzorky z celého datasetu
+            načítaného cez cache a paralelné načítanie)
+        quotas (Optional[Dict[str, int]]): Počet vzoriek pre každý štítok.
+            Predvolené: IDS2017_SAMPLE_QUOTAS
+        seed (Optional[int]): Semienko výberu pre režim "reservoir".
+            Rovnaké semienko vyberie rovnaké vzorky, takže zostanú platné
+            aj odpovede v cache odpovedí LLM. Predvolené: None (náhodné
+            semienko)
 
     Návratová hodnota:
         pd.DataFrame: Načítaný a predspracovaný dataset pripravený na analýzu
@@ -379,6 +1351,32 @@ def load_and_preprocess_ids2017_dataset(
         DatasetLoadError: Ak sa vyskytne chyba pri načítaní alebo spracovaní datasetu
     """
     try:
+        # Prúdový výber vzoriek bez načítania celého datasetu, ak nie je
+        # vyčistený dataset v cache
+        if sampling is not None and (cache_dir is None or not (
+                is_ids2017_cache_warm(
+                    directory_path, selected_files, columns, dtypes,
+                    drop_na, drop_inf, drop_duplicates, cache_dir))):
+            logger.info(f"Vyberám vzorky IDS2017 datasetu (režim {sampling})...")
+            sampled_dataset = sample_ids2017_dataset(
+                directory_path=directory_path,
+                quotas=quotas,
+                mode=sampling,
+                selected_files=selected_files,
+                columns=columns,
+                dtypes=dtypes,
+                drop_na=drop_na,
+                drop_inf=drop_inf,
+                drop_duplicates=drop_duplicates,
+                seed=seed
+            )
+            preprocessed_dataset = filter_important_columns(
+                sampled_dataset, IDS2017_IMPORTANT_COLUMNS)
+            check_important_columns(preprocessed_dataset)
+
+            logger.info("Dataset úspešne načítaný a predspracovaný")
+            return preprocessed_dataset
+
         # Načítanie datasetu
         logger.info("Načítavam IDS2017 dataset...")
         dataset = load_ids2017_dataset(
@@ -386,12 +1384,18 @@ def load_and_preprocess_ids2017_dataset(
             selected_files=selected_files,
             drop_na=drop_na,
             drop_inf=drop_inf,
-            drop_duplicates=drop_duplicates
+            drop_duplicates=drop_duplicates,
+            columns=columns,
+            dtypes=dtypes,
+            cache_dir=cache_dir,
+            max_workers=max_workers,
+            max_memory_mb=max_memory_mb
         )
 
         # Predspracovanie datasetu
         logger.info("Predspracovávam dataset...")
-        preprocessed_dataset = preprocess_IDS2017_dataset(dataset)
+        preprocessed_dataset = preprocess_IDS2017_dataset(
+            dataset, quotas, mode=sampling or "head", seed=seed)
 
         logger.info("Dataset úspešne načítaný a predspracovaný")
         return preprocessed_dataset
@@ -4,19 +4,44 @@ Tento modul obsahuje pomocné funkcie pre spracovanie datasetov.
 Modul poskytuje nástroje pre:
 - Validáciu súborových ciest a adresárov
 - Načítavanie CSV súborov s robustným spracovaním chýb
-- Manipuláciu s datasetmi (odstránenie stĺpcov, filtrovanie)
+- Manipuláciu s datasetmi (odstránenie stĺpcov, filtrovanie, deduplikáciu)
 - Rozdelenie veľkých datasetov na menšie časti (chunks)
+- Kvantizáciu riadkov na kanonické signatúry (zoskupenie takmer zhodných
+  záznamov)
 - Konverziu dát do formátov vhodných pre spracovanie LLM
 """
 
 import logging
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+)
 
 # Nastavenie loggera pre tento modul
 logger = logging.getLogger(__name__)
 
+# Počet riadkov prevádzaných naraz do numpy poľa pri prúdovom čítaní
+# záznamov datasetu
+RECORD_BLOCK_ROWS = 1024
+
+
+class DatasetRecord(NamedTuple):
+    """
+    Jeden riadok datasetu bez vytvárania DataFrame objektu.
+
+    Atribúty:
+        index (Any): Pôvodný index riadku v datasete
+        columns (Tuple[str, ...]): Názvy stĺpcov hodnôt (bez štítku)
+        values (np.ndarray): Hodnoty riadku ako pohľad do bloku datasetu
+        label (Any): Hodnota štítku, alebo None ak záznam nemá štítok
+    """
+    index: Any
+    columns: Tuple[str, ...]
+    values: np.ndarray
+    label: Any = None
+
 
 def validate_directory_path(directory_path: Path) -> None:
     """
@@ -36,25 +61,85 @@ def validate_directory_path(directory_path: Path) -> None:
         raise NotADirectoryError(f"Cesta '{directory_path}' nie je adresár")
 
 
-def load_single_csv_file(filepath: Path) -> Optional[pd.DataFrame]:
+def read_csv_header(filepath: Path) -> pd.Index:
+    """
+    Načíta iba hlavičku CSV súboru bez načítania dát.
+
+    Parametre:
+        filepath (Path): Cesta k CSV súboru
+
+    Návratová hodnota:
+        pd.Index: Pôvodné (neštandardizované) názvy stĺpcov v poradí zo
+            súboru. Duplicitné názvy sú rozlíšené rovnako ako pri
+            bežnom načítaní (prípona '.1', '.2', ...).
+    """
+    return pd.read_csv(filepath, nrows=0).columns
+
+
+def relax_integer_dtypes(dtype: Dict[str, str]) -> Dict[str, str]:
+    """
+    Nahradí celočíselné typy v schéme typom float64.
+
+    Celočíselné typy numpy nepodporujú chýbajúce hodnoty, preto sa pri
+    súboroch s prázdnymi bunkami načítajú ako float64, ktorý celé čísla
+    typu int32 reprezentuje presne.
+
+    Parametre:
+        dtype (Dict[str, str]): Schéma dátových typov
+
+    Návratová hodnota:
+        Dict[str, str]: Schéma s celočíselnými typmi nahradenými float64
+    """
+    return {
+        col: ('float64' if str(col_type).startswith('int') else col_type)
+        for col, col_type in dtype.items()
+    }
+
+
+def load_single_csv_file(
+    filepath: Path,
+    usecols: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None
+) -> Optional[pd.DataFrame]:
     """
     Načíta jeden CSV súbor s optimalizovaným spracovaním chýb.
 
     Parametre:
         filepath (Path): Cesta k CSV súboru
+        usecols (Optional[List[str]]): Pôvodné názvy stĺpcov, ktoré sa majú
+            načítať. Ak je None, načítajú sa všetky stĺpce.
+        dtype (Optional[Dict[str, str]]): Dátové typy stĺpcov podľa
+            pôvodných názvov, aplikované už pri parsovaní. Ak je None,
+            typy sa odvodia automaticky.
 
     Návratová hodnota:
         Optional[pd.DataFrame]: DataFrame ak sa načítanie podarilo, inak None
 
     Poznámka:
         Funkcia používa low_memory=False a definuje hodnoty pre NA.
+        Ak celočíselný stĺpec obsahuje chýbajúce hodnoty, načíta sa
+        ako float64 namiesto zlyhania celého súboru.
         Všetky chyby sú logované a funkcia vracia None pri problémoch.
     """
     try:
         # Optimalizované načítanie s explicitne definovanými NA hodnotami
-        df = pd.read_csv(
-            filepath, low_memory=False, na_values=['', 'NA', 'NULL', 'null']
-        )
+        try:
+            df = pd.read_csv(
+                filepath, low_memory=False, usecols=usecols, dtype=dtype,
+                na_values=['', 'NA', 'NULL', 'null']
+            )
+        except ValueError as e:
+            if not dtype:
+                raise
+            # Celočíselné typy nepodporujú NaN - zmierni ich na float64
+            logger.warning(
+                f"Súbor '{filepath.name}' nezodpovedá dátovým typom "
+                f"({e}), celočíselné stĺpce budú načítané ako float64")
+            df = pd.read_csv(
+                filepath, low_memory=False, usecols=usecols,
+                dtype=relax_integer_dtypes(dtype),
+                na_values=['', 'NA', 'NULL', 'null']
+            )
         logger.info(
             f"Úspešne načítaný súbor: {filepath.name} - tvar: {df.shape}")
         return df
@@ -70,6 +155,39 @@ def load_single_csv_file(filepath: Path) -> Optional[pd.DataFrame]:
         return None
 
 
+def iter_csv_chunks(
+    filepath: Path,
+    chunksize: int,
+    usecols: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Postupne načítava CSV súbor po častiach s pevným počtom riadkov.
+
+    Na rozdiel od load_single_csv_file nedrží v pamäti celý súbor, takže
+    čítanie je možné kedykoľvek ukončiť bez spracovania zvyšku súboru.
+
+    Parametre:
+        filepath (Path): Cesta k CSV súboru
+        chunksize (int): Počet riadkov v jednej časti
+        usecols (Optional[List[str]]): Pôvodné názvy stĺpcov na načítanie
+        dtype (Optional[Dict[str, str]]): Dátové typy podľa pôvodných názvov.
+            Celočíselné typy sú zmiernené na float64, keďže chýbajúce
+            hodnoty sa môžu objaviť v ktorejkoľvek časti súboru.
+
+    Návratová hodnota:
+        Iterator[pd.DataFrame]: Časti súboru v poradí, v akom sú v súbore.
+            Index častí pokračuje naprieč súborom.
+    """
+    reader = pd.read_csv(
+        filepath, usecols=usecols,
+        dtype=relax_integer_dtypes(dtype) if dtype else None,
+        na_values=['', 'NA', 'NULL', 'null'], chunksize=chunksize
+    )
+    with reader:
+        yield from reader
+
+
 def get_csv_files(
     directory_path: Path, selected_files: Optional[List[str]] = None
 ) -> List[str]:
@@ -148,6 +266,221 @@ def filter_important_columns(
     return filtered_dataset
 
 
+class RowHashSet:
+    """
+    Množina 64-bitových hashov riadkov pre deduplikáciu po častiach.
+
+    Hashe sú uložené v zoradenom numpy poli (8 bajtov na riadok), takže
+    aj milióny riadkov zaberajú iba desiatky MB. Deduplikácia zachováva
+    prvý výskyt riadku rovnako ako DataFrame.drop_duplicates().
+
+    Pri zadanom pamäťovom limite sa po jeho prekročení zoradené hashe
+    odložia na disk ako samostatný beh (.npy súbor), ktorý sa ďalej
+    prehľadáva cez memory mapping. V pamäti tak ostáva najviac
+    memory_limit_mb MB hashov bez ohľadu na veľkosť datasetu.
+    """
+
+    def __init__(self, memory_limit_mb: Optional[float] = None,
+                 spill_dir: Optional[Path] = None):
+        """
+        Inicializuje prázdnu množinu hashov.
+
+        Parametre:
+            memory_limit_mb (Optional[float]): Limit pamäte hashov v MB.
+                Predvolené: None (všetky hashe v pamäti)
+            spill_dir (Optional[Path]): Adresár pre odložené behy hashov.
+                Povinný, ak je zadaný memory_limit_mb.
+
+        Vyvoláva:
+            ValueError: Ak je zadaný limit bez adresára pre odkladanie
+        """
+        if memory_limit_mb is not None and spill_dir is None:
+            raise ValueError("Pamäťový limit vyžaduje adresár spill_dir")
+
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._runs: List[np.ndarray] = []
+        self._spill_dir = spill_dir
+        self._max_in_memory = (
+            None if memory_limit_mb is None
+            else max(1, int(memory_limit_mb * 1024 * 1024) // 8)
+        )
+
+    def __len__(self) -> int:
+        """
+        Vráti počet uložených hashov.
+        """
+        return len(self._hashes) + sum(len(run) for run in self._runs)
+
+    @property
+    def spilled_runs(self) -> int:
+        """
+        Vráti počet behov hashov odložených na disk.
+        """
+        return len(self._runs)
+
+    @staticmethod
+    def _search(sorted_hashes: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """
+        Zistí, ktoré hashe sa nachádzajú v zoradenom poli hashov.
+
+        Parametre:
+            sorted_hashes (np.ndarray): Zoradené hashe (aj memory mapping)
+            hashes (np.ndarray): Hľadané hashe (uint64)
+
+        Návratová hodnota:
+            np.ndarray: Boolean maska nájdených hashov
+        """
+        if len(sorted_hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        positions = np.searchsorted(sorted_hashes, hashes)
+        positions[positions == len(sorted_hashes)] = 0
+        return sorted_hashes[positions] == hashes
+
+    def _contains(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Zistí, ktoré hashe sa už v množine nachádzajú.
+
+        Parametre:
+            hashes (np.ndarray): Hashe riadkov (uint64)
+
+        Návratová hodnota:
+            np.ndarray: Boolean maska nájdených hashov
+        """
+        found = self._search(self._hashes, hashes)
+        for run in self._runs:
+            found |= self._search(run, hashes)
+        return found
+
+    def _spill(self) -> None:
+        """
+        Odloží hashe z pamäte na disk ako nový zoradený beh.
+        """
+        path = self._spill_dir / f"hashes-{len(self._runs):05d}.npy"
+        np.save(path, self._hashes)
+        self._runs.append(np.load(path, mmap_mode='r'))
+        logger.debug(f"Odložených {len(self._hashes)} hashov do '{path}'")
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def add_new(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Pridá hashe do množiny a vráti masku riadkov videných prvýkrát.
+
+        Parametre:
+            hashes (np.ndarray): Hashe riadkov v poradí (uint64)
+
+        Návratová hodnota:
+            np.ndarray: Boolean maska - True pre riadky, ktoré neboli
+                videné v predchádzajúcich častiach ani skôr v tejto časti
+        """
+        # Prvý výskyt v rámci aktuálnej časti
+        first = np.zeros(len(hashes), dtype=bool)
+        first[np.unique(hashes, return_index=True)[1]] = True
+
+        new = first & ~self._contains(hashes)
+        if new.any():
+            # Zlúčenie zoradených polí vložením nových hashov na ich
+            # pozície - lineárne v počte hashov bez opätovného triedenia
+            added = np.sort(hashes[new])
+            self._hashes = np.insert(
+                self._hashes, np.searchsorted(self._hashes, added), added)
+            if (self._max_in_memory is not None
+                    and len(self._hashes) >= self._max_in_memory):
+                self._spill()
+        return new
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """
+    Vypočíta 64-bitový hash každého riadku DataFrame bez ohľadu na index.
+
+    Parametre:
+        df (pd.DataFrame): DataFrame na hashovanie
+
+    Návratová hodnota:
+        np.ndarray: Hashe riadkov (uint64) v poradí riadkov
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def quantize_values(values: Union[np.ndarray, Any],
+                    bucket: Union[float, str, None]) -> Union[np.ndarray, Any]:
+    """
+    Kvantizuje číselné hodnoty do košov podľa zadaného pravidla.
+
+    Podporované pravidlá:
+    - číslo w > 0: lineárne koše šírky w (floor(v / w)),
+    - "log2": logaritmické koše floor(log2(1 + |v|)) so znamienkom v,
+    - None: hodnota sa nemení (presná zhoda).
+
+    Parametre:
+        values (Union[np.ndarray, Any]): Hodnota alebo pole hodnôt
+        bucket (Union[float, str, None]): Pravidlo kvantizácie
+
+    Návratová hodnota:
+        Union[np.ndarray, Any]: Čísla košov (float64) v tvare vstupu
+
+    Vyvoláva:
+        ValueError: Pri neplatnom pravidle kvantizácie
+    """
+    if bucket is None:
+        return values
+
+    values = np.asarray(values, dtype=np.float64)
+    if bucket == "log2":
+        return np.sign(values) * np.floor(np.log2(1.0 + np.abs(values)))
+    if isinstance(bucket, (int, float)) and bucket > 0:
+        return np.floor(values / bucket)
+    raise ValueError(f"Neplatné pravidlo kvantizácie: '{bucket}'")
+
+
+def record_signature(record: DatasetRecord,
+                     buckets: Dict[str, Union[float, str]]) -> Tuple:
+    """
+    Vytvorí kanonickú signatúru záznamu kvantizáciou jeho hodnôt.
+
+    Záznamy, ktoré sa líšia iba v rámci košov, majú rovnakú signatúru.
+    Stĺpce bez pravidla v buckets sa porovnávajú presne.
+
+    Parametre:
+        record (DatasetRecord): Záznam z iter_dataset_records
+        buckets (Dict[str, Union[float, str]]): Pravidlá kvantizácie
+            podľa názvu stĺpca (pozri quantize_values)
+
+    Návratová hodnota:
+        Tuple: Signatúra záznamu (názvy stĺpcov a kvantizované hodnoty)
+    """
+    return tuple(
+        (column, quantize_values(value, buckets[column]).item()
+         if column in buckets else value)
+        for column, value in zip(record.columns, record.values)
+    )
+
+
+def dataset_signatures(dataset: pd.DataFrame,
+                       buckets: Dict[str, Union[float, str]]) -> np.ndarray:
+    """
+    Vypočíta hash kanonickej signatúry každého riadku datasetu.
+
+    Vektorový variant record_signature pre celý DataFrame - riadky
+    s rovnakou signatúrou záznamu majú rovnaký hash. Slúži na meranie
+    počtu rôznych signatúr vo veľkých datasetoch.
+
+    Parametre:
+        dataset (pd.DataFrame): Dataset bez štítku
+        buckets (Dict[str, Union[float, str]]): Pravidlá kvantizácie
+            podľa názvu stĺpca (pozri quantize_values)
+
+    Návratová hodnota:
+        np.ndarray: Hashe signatúr riadkov (uint64) v poradí riadkov
+    """
+    quantized = pd.DataFrame({
+        column: (quantize_values(dataset[column].to_numpy(), buckets[column])
+                 if column in buckets else dataset[column].to_numpy())
+        for column in dataset.columns
+    })
+    return hash_rows(quantized)
+
+
 def chunk_dataset(
     dataset: pd.DataFrame, max_logs_per_chunk: int = 200000
 ) -> List[pd.DataFrame]:
@@ -214,12 +547,247 @@ def chunk_dataset(
     return chunks
 
 
+def iter_dataset_records(
+    dataset: pd.DataFrame,
+    label_column: Optional[str] = None,
+    block_rows: int = RECORD_BLOCK_ROWS
+) -> Iterator[DatasetRecord]:
+    """
+    Postupne vracia riadky datasetu ako ľahké záznamy DatasetRecord.
+
+    Na rozdiel od chunk_dataset nevytvára zoznam jednoriadkových kópií
+    DataFrame. Dataset sa prevádza do numpy po blokoch block_rows riadkov
+    a záznamy sú pohľady do aktuálneho bloku, takže pamäť aj čas spustenia
+    nezávisia od veľkosti datasetu.
+
+    Hodnoty riadku majú spoločný dátový typ stĺpcov bez štítku, rovnako
+    ako riadky z DataFrame.iterrows() nad datasetom bez štítku. Textová
+    reprezentácia záznamu je preto zhodná s parse_chunk_to_string.
+
+    Parametre:
+        dataset (pd.DataFrame): Dataset na prechádzanie
+        label_column (Optional[str]): Stĺpec so štítkom, ktorý sa oddelí
+            od hodnôt do atribútu label. Predvolené: None (bez štítku)
+        block_rows (int): Počet riadkov prevádzaných naraz
+
+    Návratová hodnota:
+        Iterator[DatasetRecord]: Záznamy v poradí riadkov datasetu
+
+    Vyvoláva:
+        ValueError: Ak je block_rows menšie alebo rovné nulu.
+    """
+    if block_rows <= 0:
+        raise ValueError("block_rows musí byť kladné číslo")
+
+    labels = None
+    features = dataset
+    if label_column is not None:
+        if label_column in dataset.columns:
+            labels = dataset[label_column]
+            features = dataset.drop(columns=[label_column])
+        else:
+            logger.warning(f"Upozornenie: Stĺpec '{label_column}' "
+                           f"nebol nájdený")
+
+    columns = tuple(features.columns.astype(str))
+    for start in range(0, len(features), block_rows):
+        end = min(start + block_rows, len(features))
+        block = features.iloc[start:end].to_numpy()
+        block_index = features.index[start:end]
+        block_labels = (labels.iloc[start:end].to_numpy()
+                        if labels is not None else None)
+
+        for position, original_idx in enumerate(block_index):
+            yield DatasetRecord(
+                index=original_idx,
+                columns=columns,
+                values=block[position],
+                label=(block_labels[position]
+                       if block_labels is not None else None)
+            )
+
+
+def format_row(original_idx: Any, columns: Tuple[str, ...],
+               values: Any) -> str:
+    """
+    Vytvorí textovú reprezentáciu jedného riadku pre LLM.
+
+    Parametre:
+        original_idx (Any): Pôvodný index riadku
+        columns (Tuple[str, ...]): Názvy stĺpcov
+        values (Any): Hodnoty riadku v poradí stĺpcov
+
+    Návratová hodnota:
+        str: Riadok vo formáte "Row idx: col1: value1, col2: value2"
+    """
+    row_values = []
+    for col, value in zip(columns, values):
+        # Spracovanie špeciálnych hodnôt
+        if pd.isna(value):
+            value = "NULL"
+        elif isinstance(value, str) and len(str(value)) > 100:
+            # Skrátenie príliš dlhých textových hodnôt
+            value = f"{str(value)[:97]}..."
+
+        row_values.append(f"{col}: {value}")
+
+    row_str = ", ".join(row_values)
+    # Použitie originálneho indexu pre zachovanie kontextu
+    return f"Row {original_idx}: {row_str}"
+
+
+def parse_record_to_string(record: DatasetRecord) -> str:
+    """
+    Konvertuje jeden záznam datasetu do textovej reprezentácie pre LLM.
+
+    Výstup je zhodný s parse_chunk_to_string nad jednoriadkovým
+    DataFrame bez štítku, no nevyžaduje jeho vytvorenie.
+
+    Parametre:
+        record (DatasetRecord): Záznam na konverziu
+
+    Návratová hodnota:
+        str: Textová reprezentácia záznamu so zoznamom stĺpcov a riadkom
+    """
+    header = ", ".join(record.columns)
+    return (f"Columns: {header}\n"
+            f"{format_row(record.index, record.columns, record.values)}")
+
+
+def _float_to_str(values: np.ndarray) -> np.ndarray:
+    """
+    Prevedie float64 hodnoty na text zhodný so str() jednotlivých hodnôt.
+
+    Celočíselné hodnoty (napr. int32 stĺpce povýšené na float64) sa
+    prevedú cez int64, ostatné pomocou str() nad Python float, ktorý
+    používa rovnakú najkratšiu reprezentáciu ako numpy, no je rýchlejší.
+
+    Parametre:
+        values (np.ndarray): Hodnoty typu float64
+
+    Návratová hodnota:
+        np.ndarray: Textové hodnoty (unicode pole)
+    """
+    with np.errstate(invalid='ignore'):
+        integral = ((values == np.trunc(values)) & (np.abs(values) < 1e16)
+                    & ~((values == 0) & np.signbit(values)))
+    if integral.all():
+        return np.strings.add(values.astype(np.int64).astype(str), ".0")
+
+    rendered = np.array(list(map(str, values.tolist())))
+    if integral.any():
+        rendered = np.where(
+            integral,
+            np.strings.add(
+                np.where(integral, values, 0).astype(np.int64).astype(str),
+                ".0"),
+            rendered)
+    return rendered
+
+
+def render_column_values(values: np.ndarray) -> np.ndarray:
+    """
+    Vektorovo prevedie hodnoty jedného stĺpca na text pre LLM.
+
+    Chýbajúce hodnoty sa nahradia reťazcom "NULL" a textové hodnoty
+    dlhšie ako 100 znakov sa skrátia na 97 znakov s "...". Výsledok je
+    zhodný s prevodom str() po jednotlivých bunkách.
+
+    Parametre:
+        values (np.ndarray): Hodnoty stĺpca so spoločným typom riadkov
+
+    Návratová hodnota:
+        np.ndarray: Textové hodnoty stĺpca (unicode pole)
+    """
+    if values.dtype.kind in 'biu':
+        # Celé čísla a bool nemôžu obsahovať chýbajúce hodnoty
+        return values.astype(str)
+
+    missing = pd.isna(values)
+    if values.dtype.kind == 'f':
+        # Hodnoty riadkov v DataFrame.iterrows() sú povýšené na float64,
+        # aj float32 stĺpce sa preto prevádzajú ako float64
+        rendered = _float_to_str(values.astype(np.float64))
+        return np.where(missing, "NULL", rendered) if missing.any() else rendered
+
+    rendered = values.astype(str)
+    # Textové a objektové stĺpce - skrátenie iba pre hodnoty typu str
+    if values.dtype.kind == 'O':
+        is_text = np.fromiter((isinstance(value, str) for value in values),
+                              dtype=bool, count=len(values))
+    else:
+        is_text = np.ones(len(values), dtype=bool)
+    too_long = is_text & ~missing & (np.strings.str_len(rendered) > 100)
+    if too_long.any():
+        rendered = np.where(
+            too_long,
+            np.strings.add(rendered.astype('<U97'), "..."),
+            rendered)
+    return np.where(missing, "NULL", rendered) if missing.any() else rendered
+
+
+def render_rows(dataset: pd.DataFrame) -> List[str]:
+    """
+    Vektorovo vytvorí textovú reprezentáciu všetkých riadkov datasetu.
+
+    Hodnoty sa prevádzajú po celých stĺpcoch zo spoločného numpy poľa
+    (rovnaké hodnoty ako v DataFrame.iterrows()), takže výstup je zhodný
+    s format_row nad jednotlivými riadkami. Nepodporované typy stĺpcov
+    (napr. dátumy) sa prevedú po riadkoch pomocou format_row.
+
+    Parametre:
+        dataset (pd.DataFrame): Dataset na konverziu
+
+    Návratová hodnota:
+        List[str]: Riadky vo formáte "Row idx: col1: value1, col2: value2"
+    """
+    values = dataset.to_numpy()
+    columns = tuple(dataset.columns)
+
+    if values.dtype.kind not in 'biufOU':
+        return [format_row(original_idx, columns, row)
+                for original_idx, row in zip(dataset.index, values)]
+
+    # Stĺpce sa prevedú vektorovo na "col: value", riadky sa iba spoja
+    rendered = [
+        np.strings.add(f"{col}: ",
+                       render_column_values(values[:, position])).tolist()
+        for position, col in enumerate(columns)
+    ]
+    indexes = dataset.index.to_numpy().astype(str).tolist()
+
+    return [f"Row {original_idx}: " + ", ".join(row_values)
+            for original_idx, *row_values in zip(indexes, *rendered)]
+
+
+def parse_dataset_to_strings(dataset: pd.DataFrame) -> List[str]:
+    """
+    Vytvorí textovú reprezentáciu každého riadku datasetu naraz.
+
+    Každý prvok zodpovedá parse_chunk_to_string nad jednoriadkovou
+    časťou datasetu (hlavička so stĺpcami a jeden riadok), no všetky
+    riadky sa prevedú jedným vektorovým volaním.
+
+    Parametre:
+        dataset (pd.DataFrame): Dataset bez štítku na konverziu
+
+    Návratová hodnota:
+        List[str]: Textová reprezentácia pre každý riadok v poradí datasetu
+    """
+    if dataset.empty:
+        return []
+
+    header = f"Columns: {', '.join(dataset.columns.astype(str))}\n"
+    return [header + row for row in render_rows(dataset)]
+
+
 def parse_chunk_to_string(chunk: pd.DataFrame) -> str:
     """
     Konvertuje pandas DataFrame do textovej reprezentácie optimalizovanej pre LLM.
 
     Táto funkcia transformuje štruktúrované dáta z DataFrame do čitateľného
     textového formátu, ktorý je vhodný pre spracovanie pomocou jazykových modelov.
+    Hodnoty sa prevádzajú vektorovo po stĺpcoch (pozri render_rows).
 
     Parametre:
         chunk (pd.DataFrame): Časť datasetu na konverziu. Musí byť platný DataFrame.
@@ -242,23 +810,7 @@ def parse_chunk_to_string(chunk: pd.DataFrame) -> str:
     header = ", ".join(chunk.columns.astype(str))
     rows = [f"Columns: {header}"]
 
-    # Spracovanie všetkých riadkov v chunki
-    for position, (original_idx, row) in enumerate(chunk.iterrows(), 1):
-        # Vytvorenie textovej reprezentácie riadku s bezpečným spracovaním
-        row_values = []
-        for col in chunk.columns:
-            value = row[col]
-            # Spracovanie špeciálnych hodnôt
-            if pd.isna(value):
-                value = "NULL"
-            elif isinstance(value, str) and len(str(value)) > 100:
-                # Skrátenie príliš dlhých textových hodnôt
-                value = f"{str(value)[:97]}..."
-
-            row_values.append(f"{col}: {value}")
-
-        row_str = ", ".join(row_values)
-        # Použitie originálneho indexu pre zachovanie kontextu
-        rows.append(f"Row {original_idx}: {row_str}")
+    # Vektorová konverzia všetkých riadkov v chunku
+    rows.extend(render_rows(chunk))
 
     return "\n".join(rows)
@@ -4,53 +4,113 @@ Agenti sú bližšie popísaní v kapitole 3.2
 Pre konfiguráciu robustnosti pozrite src/llm/utils.py.
 """
 
+import hashlib
+import json
 import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
+from pydantic import BaseModel
+from langchain_core.exceptions import OutputParserException
 from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
 from langchain.schema.runnable import Runnable
 from langchain_core.language_models.chat_models import BaseChatModel
 from src.system_core.data_models import (
     FlowAnalysisResult,
+    FlowBatchAnalysisResult,
     LogsDescription,
     LogsAnalysisResult,
+    LogsCombinedAnalysisResult,
     LogsMetadata,
+    FlowVerdictOnlyResult,
+    LogsVerdictOnlyResult,
 )
+from src.llm.response_cache import RESPONSE_CACHE_METADATA_KEY
 from src.llm.utils import retry_on_failure
 
 # Nastavenie loggingu
 logger = logging.getLogger(__name__)
 
+# Cache skompilovaných agentov (šablóna | LLM so štruktúrovaným výstupom)
+# kľúčovaná identitou klienta, názvom modelu, typom agenta a hashom
+# šablóny. Hodnota drží aj klienta, aby jeho id() nemohlo byť znovu
+# pridelené inému klientovi, kým je záznam v cache.
+_agent_cache: Dict[Tuple, Tuple[BaseChatModel, Runnable, float]] = {}
+# Zámok pre prístup ku cache agentov z viacerých vlákien
+_agent_cache_lock = threading.Lock()
+# Štatistiky cache agentov
+_agent_cache_stats = {"hits": 0, "misses": 0, "build_seconds": 0.0,
+                      "saved_seconds": 0.0}
+# Parametre klienta, ktoré ovplyvňujú odpoveď modelu (identita agenta
+# pre cache odpovedí)
+CLIENT_IDENTITY_PARAMS = ("model", "model_name", "temperature", "num_ctx",
+                          "num_predict", "top_k", "top_p", "seed")
+
+# Metódy štruktúrovaného výstupu (with_structured_output). Pri metóde
+# "json_schema" dostane server JSON schému výstupu agenta a generovanie
+# je ňou obmedzené, "json_mode" obmedzuje výstup iba na platný JSON
+# a "function_calling" používa volanie nástrojov.
+STRUCTURED_OUTPUT_METHODS = ("json_schema", "json_mode", "function_calling")
+DEFAULT_STRUCTURED_OUTPUT_METHOD = "json_schema"
+# Aktuálna metóda štruktúrovaného výstupu
+# (pozri set_structured_output_method)
+_structured_output_method = DEFAULT_STRUCTURED_OUTPUT_METHOD
+# Počet štruktúrovaných výstupov a zlyhaní ich parsovania podľa metódy
+_structured_output_stats: Dict[str, Dict[str, int]] = {}
+
+# Šablóny agentov majú všetky statické inštrukcie na začiatku a premenné
+# vstupy až v poslednej sekcii. Opakované požiadavky tak zdieľajú čo
+# najdlhší spoločný prefix promptu, ktorého KV cache Ollama server znovu
+# použije, kým drží model v pamäti (pozri set_keep_alive
+# v src/llm/api_clients.py).
+
+# Šablóna pre systémovú inštrukciu Dávkového klasifikačného agenta.
+# Je definovaná na úrovni modulu, aby bolo možné odhadnúť jej veľkosť
+# v tokenoch pri plnení dávok tokov (pozri src/llm/flows.py).
+FLOW_BATCH_CLASSIFIER_TEMPLATE = """
+        You are **AI Guardian**, an AI agent protecting system from breaches.
+        Decide for **each** network-flow below whether it indicates
+        a brute-force attack.
 
-@retry_on_failure(max_retries=2)
-def spawn_logs_metadata_extractor_agent(llm_client: BaseChatModel) -> Runnable:
-    """
-    Vytvorí nakonfigurovanú inštanciu agenta pre extrahovanie metadát
-    z logov.
+        ## GUARDRAILS
 
-    Ide o implenetáciu Extraktora metadát (kapitola 3.2.2).
+        You will:
 
-    Tento agent analyzuje linuxové logy a extrahuje z nich metadáta -
-    službu, IP adresu útočníka a trvanie podozrivej aktivity.
+        1. **Inspect the network-flows** in the INPUT section below
+        (one flow per "Row <index>:" line).
 
-    Parametre:
-        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+        2. For each flow, think step by step through these guardrails:
+        a. protocol = TCP ?
+        b. source port > 1024 ?
+        c. destination port = 22 ?
+        d. packets > 10 and < 30 ?
+        e. bytes > 1400 and < 5000 ?
+        f. duration < 5s ?
+        set "bruteforce" to **true** if at least four of the above
+        indicators is present.
 
-    Návratová hodnota:
-        Runnable: Nakonfigurovaný agent pre extrahovanie metadát
+        3. Explain your reasoning:
+        - Set "reason" to one short sentence.
 
-    Štruktúrovaný výstup:
-        LogsMetadata - obsahuje polia 'service' (string), 'attacker' (string)
-        a 'duration' (string) s metadátami extrahovanými z logov
-    """
-    # Šablóna pre systémovú inštrukciu agenta
-    template = """
+        ## OUTPUT FORMAT (strict)
+        Reply **only** with JSON that fulfils the exact schema below, with
+        exactly one verdict per flow, where "row" is the <index> of the flow:
+
+        {{"verdicts": [{{"row": integer, "bruteforce": boolean,
+        "reason": string}}]}}
+
+        ## INPUT
+        Network-flows:
+        {flow_data}
+        """
+
+# Šablóna pre systémovú inštrukciu Extraktora metadát
+LOGS_METADATA_EXTRACTOR_TEMPLATE = """
         You are **Metadata-Extractor**, an AI agent that turns a batch of
         Linux logs into a single metadata record.
 
-        ## YOUR INPUT
-        A batch of logs:
-        {input}
-
         ## GUARDRAILS
 
         You MUST reply **only** with a valid JSON object. No explanations,
@@ -58,7 +118,7 @@ def spawn_logs_metadata_extractor_agent(llm_client: BaseChatModel) -> Runnable:
 
         1. Based on the provided log entries, identify which network service
             they indicate activity for.
-            - Respond with one of the following labels: SSH, Telnet, SMB,
+            - Respond with one of the following labels: SSH, telnet, SMB,
               Other.
             - Choose the label that best represents the dominant or most
             clearly indicated service.
@@ -87,44 +147,16 @@ def spawn_logs_metadata_extractor_agent(llm_client: BaseChatModel) -> Runnable:
 
         Remember: **ONLY reply with a valid JSON**, no comments, no
         explanations.
-        """
-
-    # Vytvorenie systémovej inštrukcie pre agenta
-    system_prompt = PromptTemplate.from_template(template)
-
-    # Vrátenie nakonfigurovaného agenta
-    return system_prompt | llm_client.with_structured_output(LogsMetadata)
-
-
-@retry_on_failure(max_retries=2)
-def spawn_logs_descriptor_agent(llm_client: BaseChatModel) -> Runnable:
-    """
-    Vytvorí nakonfigurovanú inštanciu agenta pre popis aktivity v logoch.
-
-    Ide o implementáciu Popisovača logov (kapitola 3.2.2).
-
-    Tento agent pripravuje detailné správy o aktivite v logoch
-    pre bezpečnostných analytikov. Analyzuje neúspešné a úspešné
-    prihlásenia a vytvára komplexnú správu o aktivitách.
-
-    Parametre:
-        llm_client (BaseChatModel): LLM tvoriaci základ agenta
-
-    Návratová hodnota:
-        Runnable: Nakonfigurovaný agent pre analýzu aktivity
-
-    Štruktúrovaný výstup:
-        LogsDescription - obsahuje pole 'activity' s detailnou správou
-        o aktivitách v logoch rozdelených do troch odsekov
-    """
-    # Šablóna pre systémovú inštrukciu agenta
-    template = """
-        You are **Logs-Activity-Analyst**, an AI agent preparing report about
-        log events for cybersecurity analyst.
 
         ## YOUR INPUT
         A batch of logs:
         {input}
+        """
+
+# Šablóna pre systémovú inštrukciu Popisovača logov
+LOGS_DESCRIPTOR_TEMPLATE = """
+        You are **Logs-Activity-Analyst**, an AI agent preparing report about
+        log events for cybersecurity analyst.
 
         ## GUARDRAILS
 
@@ -153,38 +185,60 @@ def spawn_logs_descriptor_agent(llm_client: BaseChatModel) -> Runnable:
         {{
         "description": string,
         }}
+
+        ## YOUR INPUT
+        A batch of logs:
+        {input}
         """
 
-    # Vytvorenie systémovej inštrukcie pre agenta
-    system_prompt = PromptTemplate.from_template(template)
+# Šablóna pre systémovú inštrukciu Klasifikátora logov
+LOGS_CLASSIFIER_TEMPLATE = """
+        You are **AI Guardian**, an AI agent protecting system from breaches.
+        Based on the data provided by other agents, decide whether system has
+        been compromised.
 
-    # Vrátenie nakonfigurovaného agenta
-    return system_prompt | llm_client.with_structured_output(LogsDescription)
+        ## GUARDRAILS
 
+        You will:
 
-@retry_on_failure(max_retries=2)
-def spawn_logs_classifier_agent(llm_client: BaseChatModel) -> Runnable:
-    """
-    Vytvorí nakonfigurovanú inštanciu agenta pre klasifikáciu hrozieb v logoch.
+        1. **Inspect the logs metadata and the logs description** in the
+        INPUT section below.
 
-    Ide o implementáciu Klasifikátora logov (kapitola 3.2.2).
+        2. Think step by step through each of these guardrails:
+        a. Suspiciously high number of failed login attempts followed by
+        **successful** login?
+        b. High volume of attempts in a short time?
+        c. Short duration of the session?
+        d. Use of non-specific usernames like "root" or "admin"?
+        set "bruteforce" to **true** if at least two of the above
+        indicators are present.
 
-    Tento agent rozhoduje na základe metadát a popisu aktivít v logoch,
-    či došlo k narušeniu systému. Analyzuje indikátory brute force útokov
-    a určuje, či bol systém kompromitovaný pomocí viacstupňovej analýzy.
+        3. Think step by step through each of these guardrails:
+        a. "bruteforce" is **true**?
+        b. successful login after bruteforce activity?
+        set "system_compromised" to **true** if above indicators are
+        present.
 
-    Parametre:
-        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+        4. Explain your reasoning:
+        - Set "reason" to your reasoning.
 
-    Návratová hodnota:
-        Runnable: Nakonfigurovaný agent pre klasifikáciu hrozieb
+        ## OUTPUT FORMAT (strict)
+        Reply only with JSON in exactly this schema (no extra keys, no prose):
+        {{"bruteforce": boolean, "system_compromised": boolean,
+        "reason": string}}
 
-    Štruktúrovaný výstup:
-        LogsAnalysisResult - obsahuje polia 'bruteforce' (boolean),
-        'system_compromised' (boolean) a 'reason' (string) s odôvodnením
-    """
-    # Šablóna pre systémovú inštrukciu agenta
-    template = """
+        ## INPUT
+        **Logs metadata:**
+        {logs_metadata}
+
+        **Logs description:**
+        {logs_description}
+        """
+
+# Šablóna pre systémovú inštrukciu Klasifikátora logov iba s verdiktom.
+# Zhoduje sa s LOGS_CLASSIFIER_TEMPLATE bez kroku zdôvodnenia, takže
+# model generuje iba dve logické hodnoty.
+LOGS_VERDICT_TEMPLATE = """
         You are **AI Guardian**, an AI agent protecting system from breaches.
         Based on the data provided by other agents, decide whether system has
         been compromised.
@@ -193,13 +247,73 @@ def spawn_logs_classifier_agent(llm_client: BaseChatModel) -> Runnable:
 
         You will:
 
-        1. **Inspect the logs metadata:**
+        1. **Inspect the logs metadata and the logs description** in the
+        INPUT section below.
+
+        2. Think step by step through each of these guardrails:
+        a. Suspiciously high number of failed login attempts followed by
+        **successful** login?
+        b. High volume of attempts in a short time?
+        c. Short duration of the session?
+        d. Use of non-specific usernames like "root" or "admin"?
+        set "bruteforce" to **true** if at least two of the above
+        indicators are present.
+
+        3. Think step by step through each of these guardrails:
+        a. "bruteforce" is **true**?
+        b. successful login after bruteforce activity?
+        set "system_compromised" to **true** if above indicators are
+        present.
+
+        ## OUTPUT FORMAT (strict)
+        Reply only with JSON in exactly this schema (no extra keys, no prose,
+        no reasoning):
+        {{"bruteforce": boolean, "system_compromised": boolean}}
+
+        ## INPUT
         **Logs metadata:**
         {logs_metadata}
 
-        2. **Inspect the logs description:**
         **Logs description:**
         {logs_description}
+        """
+
+# Šablóna pre systémovú inštrukciu Kombinovaného agenta pre logy. Spája
+# kroky Extraktora metadát, Popisovača logov a Klasifikátora logov.
+LOGS_COMBINED_TEMPLATE = """
+        You are **AI Guardian**, an AI agent protecting system from breaches.
+        In a single pass, extract metadata from a batch of Linux logs,
+        describe the activity in them and decide whether system has been
+        compromised.
+
+        ## GUARDRAILS
+
+        You will:
+
+        1. **Extract the logs metadata:**
+        a. "service": the network service the logs indicate activity for,
+        one of the following labels: SSH, telnet, SMB, Other.
+        b. "duration": the total duration of suspicious or
+        security-relevant activity in ISO 8601 format (e.g., PT15M30S),
+        or "None" if no suspicious activity is found.
+        c. "attacker": the IP address of the attacker or source of
+        suspicious activity, or "None" if no such IP can be identified.
+        - **No Hallucination**: NEVER invent IPs, ports, protocols, or
+        timestamps. Only use information present in the logs.
+
+        2. **Describe the logs** in "description", divided into three
+        paragraphs:
+            - **First paragraph**: the type of activity, the involved
+            parties, present users and the context.
+            - **Second paragraph**: the nature of **failed** logins,
+            including the number of attempts, the time frame, and any
+            patterns.
+            - **Third paragraph**: the nature of **successful** logins,
+            including the number of attempts, the time frame, and any
+            patterns.
+        - **BE PRECISE**: It is crucial to use exact numbers and figures,
+        your answer **cannot** contain general talk like "multiple" or
+        "several".
 
         3. Think step by step through each of these guardrails:
         a. Suspiciously high number of failed login attempts followed by
@@ -221,39 +335,54 @@ def spawn_logs_classifier_agent(llm_client: BaseChatModel) -> Runnable:
 
         ## OUTPUT FORMAT (strict)
         Reply only with JSON in exactly this schema (no extra keys, no prose):
-        {{"bruteforce": boolean, "system_compromised": boolean,
-        "reason": string}}
+        {{"duration": string, "attacker": string, "service": string,
+        "description": string, "bruteforce": boolean,
+        "system_compromised": boolean, "reason": string}}
+
+        ## YOUR INPUT
+        A batch of logs:
+        {input}
         """
 
-    # Vytvorenie systémovej inštrukcie pre agenta
-    system_prompt = PromptTemplate.from_template(template)
+# Šablóna pre systémovú inštrukciu Klasifikačného agenta pre toky
+FLOW_CLASSIFIER_TEMPLATE = """
+        You are **AI Guardian**, an AI agent protecting system from breaches.
+        Based on the data provided by other agents, decide whether system has
+        been under brute-force attack.
 
-    # Vrátenie nakonfigurovaného agenta
-    return (system_prompt |
-            llm_client.with_structured_output(LogsAnalysisResult))
+        ## GUARDRAILS
 
+        You will:
 
-@retry_on_failure(max_retries=2)
-def spawn_flow_classifier_agent(llm_client: BaseChatModel) -> Runnable:
-    """
-    Vytvorí nakonfigurovanú inštanciu agenta pre klasifikáciu sieťových tokov.
+        1. **Inspect the network-flow** in the INPUT section below.
 
-    Tento agent analyzuje sieťové toky a rozhoduje, či indikujú
-    brute force útok. Posudzuje protokol, porty, počet paketov,
-    množstvo dát a trvanie spojenia na základe špecifických kritérií.
+        2. Think step by step through each of these guardrails:
+        a. protocol = TCP ?
+        b. source port > 1024 ?
+        c. destination port = 22 ?
+        d. packets > 10 and < 30 ?
+        e. bytes > 1400 and < 5000 ?
+        f. duration < 5s ?
+        set "bruteforce" to **true** if at least four of the above
+        indicators is present.
 
-    Parametre:
-        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+        3. Explain your reasoning:
+        - Set "reason" to your reasoning.
 
-    Návratová hodnota:
-        Runnable: Nakonfigurovaný agent pre klasifikáciu sieťových tokov
+        ## OUTPUT FORMAT (strict)
+        Reply **only** with JSON that fulfils the exact schema below:
 
-    Štruktúrovaný výstup:
-        FlowAnalysisResult - obsahuje polia 'bruteforce' (boolean)
-        a 'reason' (string) s odôvodnením analýzy toku
-    """
-    # Šablóna pre systémovú inštrukciu agenta
-    template = """
+        {{"bruteforce": boolean, "reason": string}}
+
+        ## INPUT
+        Network-flow:
+        {flow_data}
+        """
+
+# Šablóna pre systémovú inštrukciu Klasifikačného agenta pre toky iba
+# s verdiktom. Zhoduje sa s FLOW_CLASSIFIER_TEMPLATE bez kroku
+# zdôvodnenia, takže model generuje iba jednu logickú hodnotu.
+FLOW_VERDICT_TEMPLATE = """
         You are **AI Guardian**, an AI agent protecting system from breaches.
         Based on the data provided by other agents, decide whether system has
         been under brute-force attack.
@@ -262,8 +391,7 @@ def spawn_flow_classifier_agent(llm_client: BaseChatModel) -> Runnable:
 
         You will:
 
-        1. **Inspect the network-flow:**
-        {flow_data}
+        1. **Inspect the network-flow** in the INPUT section below.
 
         2. Think step by step through each of these guardrails:
         a. protocol = TCP ?
@@ -275,18 +403,480 @@ def spawn_flow_classifier_agent(llm_client: BaseChatModel) -> Runnable:
         set "bruteforce" to **true** if at least four of the above
         indicators is present.
 
-        3. Explain your reasoning:
-        - Set "reason" to your reasoning.
-
         ## OUTPUT FORMAT (strict)
-        Reply **only** with JSON that fulfils the exact schema below:
+        Reply **only** with JSON that fulfils the exact schema below
+        (no reasoning):
 
-        {{"bruteforce": boolean, "reason": string}}
+        {{"bruteforce": boolean}}
+
+        ## INPUT
+        Network-flow:
+        {flow_data}
         """
 
-    # Vytvorenie systémovej inštrukcie pre agenta
+
+def set_structured_output_method(method: str) -> None:
+    """
+    Nastaví metódu štruktúrovaného výstupu pre novo vytvorených agentov.
+
+    Metóda je súčasťou kľúča cache agentov aj identity agenta pre cache
+    odpovedí, agenti s rôznymi metódami sa preto nemiešajú.
+
+    Parametre:
+        method (str): Metóda z STRUCTURED_OUTPUT_METHODS
+
+    Vyvoláva:
+        ValueError: Keď metóda nie je podporovaná
+    """
+    global _structured_output_method
+    if method not in STRUCTURED_OUTPUT_METHODS:
+        raise ValueError(f"Neznáma metóda štruktúrovaného výstupu "
+                         f"'{method}', podporované: "
+                         f"{', '.join(STRUCTURED_OUTPUT_METHODS)}")
+    _structured_output_method = method
+    logger.info(f"Metóda štruktúrovaného výstupu agentov: {method}")
+
+
+def structured_output_parser(method: str) -> Callable[[Dict], Any]:
+    """
+    Vytvorí funkciu, ktorá z výstupu with_structured_output(include_raw=True)
+    vráti rozparsovaný výsledok a započíta zlyhania parsovania.
+
+    Parametre:
+        method (str): Metóda štruktúrovaného výstupu agenta
+
+    Návratová hodnota:
+        Callable[[Dict], Any]: Funkcia vracajúca rozparsovaný výsledok
+
+    Poznámka:
+        Pri zlyhaní parsovania funkcia vyvolá pôvodnú chybu, ktorú ďalej
+        spracuje safe_agent_invoke rovnako ako bez počítadla.
+    """
+    def parse(output: Dict) -> Any:
+        error = output.get("parsing_error")
+        if error is None and output.get("parsed") is None:
+            error = OutputParserException("Model nevrátil štruktúrovaný "
+                                          "výstup")
+
+        with _agent_cache_lock:
+            stats = _structured_output_stats.setdefault(
+                method, {"outputs": 0, "parse_failures": 0})
+            stats["outputs"] += 1
+            if error is not None:
+                stats["parse_failures"] += 1
+
+        if error is not None:
+            raise error
+        return output["parsed"]
+
+    return parse
+
+
+def get_cached_agent(llm_client: BaseChatModel, agent_type: str,
+                     template: str, schema: Type[BaseModel],
+                     streaming: bool = False) -> Runnable:
+    """
+    Vráti skompilovaného agenta z cache, prípadne ho vytvorí a uloží.
+
+    Vytvorenie agenta (parsovanie šablóny a odvodenie JSON schémy pre
+    štruktúrovaný výstup) sa tak pre daného klienta vykoná iba raz.
+    Kľúč obsahuje názov modelu, hash šablóny a metódu štruktúrovaného
+    výstupu, takže zmena modelu, šablóny alebo metódy vedie k vytvoreniu
+    nového agenta.
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+        agent_type (str): Názov typu agenta
+        template (str): Šablóna systémovej inštrukcie agenta
+        schema (Type[BaseModel]): Schéma štruktúrovaného výstupu
+        streaming (bool): True pre agenta, ktorý vracia prúd textových
+            častí výstupu obmedzeného JSON schémou (bez parsovania)
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent
+    """
+    template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+    model = getattr(llm_client, "model", None) or getattr(
+        llm_client, "model_name", None)
+    # Prúdový agent vždy obmedzuje generovanie JSON schémou, aby polia
+    # výstupu prichádzali v poradí schémy
+    method = "stream" if streaming else _structured_output_method
+    key = (id(llm_client), model, agent_type, template_hash, schema.__name__,
+           method)
+
+    with _agent_cache_lock:
+        cached = _agent_cache.get(key)
+        if cached is not None:
+            _agent_cache_stats["hits"] += 1
+            _agent_cache_stats["saved_seconds"] += cached[2]
+            return cached[1]
+
+    # Vytvorenie agenta mimo zámku - prípadné súbežné vytvorenie toho
+    # istého agenta je neškodné
+    start = time.perf_counter()
     system_prompt = PromptTemplate.from_template(template)
+    if streaming:
+        output_chain = llm_client.bind(format=schema.model_json_schema())
+    else:
+        output_chain = llm_client.with_structured_output(
+            schema, method=method, include_raw=True) | RunnableLambda(
+                structured_output_parser(method))
+    agent = (system_prompt | output_chain).with_config(metadata={
+                 RESPONSE_CACHE_METADATA_KEY: get_agent_identity(
+                     llm_client, agent_type, template_hash, schema, method)
+             })
+    build_seconds = time.perf_counter() - start
+
+    with _agent_cache_lock:
+        _agent_cache_stats["misses"] += 1
+        _agent_cache_stats["build_seconds"] += build_seconds
+        cached = _agent_cache.setdefault(
+            key, (llm_client, agent, build_seconds))
+
+    logger.debug(f"Vytvorený agent {agent_type} pre model {model} "
+                 f"({build_seconds * 1000:.2f} ms)")
+    return cached[1]
+
+
+def get_agent_identity(llm_client: BaseChatModel, agent_type: str,
+                       template_hash: str, schema: Type[BaseModel],
+                       method: str = DEFAULT_STRUCTURED_OUTPUT_METHOD) -> str:
+    """
+    Vytvorí identitu agenta pre perzistentnú cache odpovedí.
+
+    Identita obsahuje všetko, čo okrem vstupu ovplyvňuje odpoveď agenta -
+    model a parametre vzorkovania klienta, typ agenta, hash šablóny,
+    schému výstupu a metódu štruktúrovaného výstupu.
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+        agent_type (str): Názov typu agenta
+        template_hash (str): SHA-256 hash šablóny systémovej inštrukcie
+        schema (Type[BaseModel]): Schéma štruktúrovaného výstupu
+        method (str): Metóda štruktúrovaného výstupu
+
+    Návratová hodnota:
+        str: Identita agenta vo forme JSON reťazca
+    """
+    params = {name: getattr(llm_client, name)
+              for name in CLIENT_IDENTITY_PARAMS
+              if getattr(llm_client, name, None) is not None}
+    return json.dumps({"client": params, "agent": agent_type,
+                       "template": template_hash,
+                       "schema": schema.__name__, "method": method},
+                      sort_keys=True)
+
+
+def get_agent_cache_stats() -> Dict[str, float]:
+    """
+    Vráti štatistiky cache agentov.
+
+    Návratová hodnota:
+        Dict[str, float]: Počet zásahov ('hits') a vytvorení ('misses'),
+        celkový čas vytvárania agentov ('build_seconds') a odhad času
+        ušetreného zásahmi do cache ('saved_seconds')
+    """
+    with _agent_cache_lock:
+        return dict(_agent_cache_stats)
+
+
+def log_agent_cache_stats(items: int,
+                          since: Optional[Dict[str, float]] = None) -> None:
+    """
+    Zaloguje štatistiky cache agentov po analýze.
+
+    Cache agentov žije počas celého procesu, štatistiky sa preto logujú
+    ako rozdiel oproti stavu pred analýzou, aby ušetrený čas na položku
+    zodpovedal iba položkám tohto behu.
+
+    Parametre:
+        items (int): Počet analyzovaných položiek (tokov alebo súborov)
+        since (Optional[Dict[str, float]]): Štatistiky z
+            get_agent_cache_stats pred analýzou. None pre štatistiky
+            za celý proces.
+    """
+    stats = get_agent_cache_stats()
+    if since is not None:
+        stats = {key: value - since.get(key, 0)
+                 for key, value in stats.items()}
+    per_item_ms = stats["saved_seconds"] * 1000 / items if items else 0.0
+    logger.info(
+        f"Cache agentov: {stats['hits']} zásahov, {stats['misses']} "
+        f"vytvorení, ušetrených {stats['saved_seconds']:.3f} s "
+        f"({per_item_ms:.2f} ms na položku)"
+    )
+
+
+def get_structured_output_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Vráti počty štruktúrovaných výstupov a zlyhaní ich parsovania.
+
+    Návratová hodnota:
+        Dict[str, Dict[str, int]]: Pre každú použitú metódu počet výstupov
+        ('outputs') a zlyhaní parsovania ('parse_failures')
+    """
+    with _agent_cache_lock:
+        return {method: dict(stats)
+                for method, stats in _structured_output_stats.items()}
+
+
+def log_structured_output_stats() -> None:
+    """
+    Zaloguje zlyhania parsovania štruktúrovaných výstupov podľa metódy.
+    """
+    for method, stats in get_structured_output_stats().items():
+        rate = (stats["parse_failures"] / stats["outputs"] * 100
+                if stats["outputs"] else 0.0)
+        logger.info(
+            f"Štruktúrovaný výstup ({method}): {stats['outputs']} výstupov, "
+            f"{stats['parse_failures']} zlyhaní parsovania ({rate:.1f} %)"
+        )
+
+
+def clear_agent_cache() -> None:
+    """
+    Vyprázdni cache agentov.
+
+    Volá sa pri zatváraní zdieľaných klientov, aby cache nedržala
+    zatvorených klientov. Štatistiky cache zostávajú zachované.
+    """
+    with _agent_cache_lock:
+        _agent_cache.clear()
+
+
+@retry_on_failure(max_retries=2)
+def spawn_logs_metadata_extractor_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí nakonfigurovanú inštanciu agenta pre extrahovanie metadát
+    z logov.
+
+    Ide o implenetáciu Extraktora metadát (kapitola 3.2.2).
+
+    Tento agent analyzuje linuxové logy a extrahuje z nich metadáta -
+    službu, IP adresu útočníka a trvanie podozrivej aktivity.
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent pre extrahovanie metadát
+
+    Štruktúrovaný výstup:
+        LogsMetadata - obsahuje polia 'service' (string), 'attacker' (string)
+        a 'duration' (string) s metadátami extrahovanými z logov
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "logs_metadata_extractor_agent",
+                            LOGS_METADATA_EXTRACTOR_TEMPLATE, LogsMetadata)
+
+
+@retry_on_failure(max_retries=2)
+def spawn_logs_descriptor_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí nakonfigurovanú inštanciu agenta pre popis aktivity v logoch.
+
+    Ide o implementáciu Popisovača logov (kapitola 3.2.2).
+
+    Tento agent pripravuje detailné správy o aktivite v logoch
+    pre bezpečnostných analytikov. Analyzuje neúspešné a úspešné
+    prihlásenia a vytvára komplexnú správu o aktivitách.
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent pre analýzu aktivity
+
+    Štruktúrovaný výstup:
+        LogsDescription - obsahuje pole 'activity' s detailnou správou
+        o aktivitách v logoch rozdelených do troch odsekov
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "logs_descriptor_agent",
+                            LOGS_DESCRIPTOR_TEMPLATE, LogsDescription)
+
 
-    # Vrátenie nakonfigurovaného agenta
-    return (system_prompt |
-            llm_client.with_structured_output(FlowAnalysisResult))
+@retry_on_failure(max_retries=2)
+def spawn_logs_classifier_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí nakonfigurovanú inštanciu agenta pre klasifikáciu hrozieb v logoch.
+
+    Ide o implementáciu Klasifikátora logov (kapitola 3.2.2).
+
+    Tento agent rozhoduje na základe metadát a popisu aktivít v logoch,
+    či došlo k narušeniu systému. Analyzuje indikátory brute force útokov
+    a určuje, či bol systém kompromitovaný pomocí viacstupňovej analýzy.
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent pre klasifikáciu hrozieb
+
+    Štruktúrovaný výstup:
+        LogsAnalysisResult - obsahuje polia 'bruteforce' (boolean),
+        'system_compromised' (boolean) a 'reason' (string) s odôvodnením
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "logs_classifier_agent",
+                            LOGS_CLASSIFIER_TEMPLATE, LogsAnalysisResult)
+
+
+@retry_on_failure(max_retries=2)
+def spawn_logs_verdict_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí variant Klasifikátora logov, ktorý vracia iba verdikt.
+
+    Agent posudzuje rovnaké indikátory ako spawn_logs_classifier_agent,
+    ale negeneruje zdôvodnenie. Používa sa pri hromadných behoch, kde sa
+    zdôvodnenie vytvára dodatočne iba pre označené položky alebo na
+    požiadanie (pozri explain v src/llm/flows.py).
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent pre klasifikáciu hrozieb bez
+        zdôvodnenia
+
+    Štruktúrovaný výstup:
+        LogsVerdictOnlyResult - obsahuje polia 'bruteforce' (boolean)
+        a 'system_compromised' (boolean)
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "logs_verdict_agent",
+                            LOGS_VERDICT_TEMPLATE, LogsVerdictOnlyResult)
+
+
+@retry_on_failure(max_retries=2)
+def spawn_logs_combined_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí nakonfigurovanú inštanciu agenta pre jednoprechodovú analýzu
+    logov.
+
+    Tento agent spája Extraktora metadát, Popisovača logov a Klasifikátora
+    logov - logy dostane iba raz a v jednej odpovedi vráti metadáta, popis
+    aktivity aj klasifikáciu. Používa sa v jednoprechodovom režime analýzy
+    logov namiesto troch samostatných agentov.
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent pre jednoprechodovú analýzu logov
+
+    Štruktúrovaný výstup:
+        LogsCombinedAnalysisResult - obsahuje polia 'duration', 'attacker',
+        'service', 'description' (string), 'bruteforce',
+        'system_compromised' (boolean) a 'reason' (string)
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "logs_combined_agent",
+                            LOGS_COMBINED_TEMPLATE,
+                            LogsCombinedAnalysisResult)
+
+
+@retry_on_failure(max_retries=2)
+def spawn_flow_classifier_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí nakonfigurovanú inštanciu agenta pre klasifikáciu sieťových tokov.
+
+    Tento agent analyzuje sieťové toky a rozhoduje, či indikujú
+    brute force útok. Posudzuje protokol, porty, počet paketov,
+    množstvo dát a trvanie spojenia na základe špecifických kritérií.
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent pre klasifikáciu sieťových tokov
+
+    Štruktúrovaný výstup:
+        FlowAnalysisResult - obsahuje polia 'bruteforce' (boolean)
+        a 'reason' (string) s odôvodnením analýzy toku
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "flow_classifier_agent",
+                            FLOW_CLASSIFIER_TEMPLATE, FlowAnalysisResult)
+
+
+@retry_on_failure(max_retries=2)
+def spawn_flow_verdict_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí variant agenta pre klasifikáciu sieťových tokov, ktorý vracia
+    iba verdikt.
+
+    Agent posudzuje rovnaké kritériá ako spawn_flow_classifier_agent,
+    ale negeneruje zdôvodnenie. Používa sa pri hromadných behoch, kde sa
+    zdôvodnenie vytvára dodatočne iba pre označené toky alebo na
+    požiadanie (pozri explain v src/llm/flows.py).
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent pre klasifikáciu tokov bez
+        zdôvodnenia
+
+    Štruktúrovaný výstup:
+        FlowVerdictOnlyResult - obsahuje pole 'bruteforce' (boolean)
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "flow_verdict_agent",
+                            FLOW_VERDICT_TEMPLATE, FlowVerdictOnlyResult)
+
+
+@retry_on_failure(max_retries=2)
+def spawn_flow_stream_classifier_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí prúdový variant agenta pre klasifikáciu sieťových tokov.
+
+    Agent používa rovnakú systémovú inštrukciu ako
+    spawn_flow_classifier_agent, ale namiesto rozparsovaného výsledku
+    vracia prúd častí výstupu. Generovanie je obmedzené JSON schémou
+    FlowAnalysisResult (parameter 'format' Ollama servera), takže pole
+    'bruteforce' prichádza pred poľom 'reason' a verdikt je možné prečítať
+    skôr, než model dokončí zdôvodnenie.
+
+    Parametre:
+        llm_client (BaseChatModel): Ollama klient tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Agent vracajúci pri stream()/astream() časti správy
+
+    Štruktúrovaný výstup:
+        JSON text podľa schémy FlowAnalysisResult - polia 'bruteforce'
+        (boolean) a 'reason' (string)
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "flow_classifier_agent",
+                            FLOW_CLASSIFIER_TEMPLATE, FlowAnalysisResult,
+                            streaming=True)
+
+
+@retry_on_failure(max_retries=2)
+def spawn_flow_batch_classifier_agent(llm_client: BaseChatModel) -> Runnable:
+    """
+    Vytvorí nakonfigurovanú inštanciu agenta pre dávkovú klasifikáciu
+    sieťových tokov.
+
+    Tento agent posudzuje naraz viacero sieťových tokov podľa rovnakých
+    kritérií ako Klasifikačný agent pre toky a pre každý tok vráti
+    samostatný výsledok identifikovaný pôvodným indexom riadku.
+    Systémová inštrukcia sa tak posiela raz pre celú dávku tokov.
+
+    Parametre:
+        llm_client (BaseChatModel): LLM tvoriaci základ agenta
+
+    Návratová hodnota:
+        Runnable: Nakonfigurovaný agent pre dávkovú klasifikáciu tokov
+
+    Štruktúrovaný výstup:
+        FlowBatchAnalysisResult - obsahuje pole 'verdicts' so zoznamom
+        výsledkov s poliami 'row' (int), 'bruteforce' (boolean)
+        a 'reason' (string)
+    """
+    # Vrátenie nakonfigurovaného agenta z cache agentov
+    return get_cached_agent(llm_client, "flow_batch_classifier_agent",
+                            FLOW_BATCH_CLASSIFIER_TEMPLATE,
+                            FlowBatchAnalysisResult)
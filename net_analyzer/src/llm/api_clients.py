@@ -5,28 +5,438 @@ rôzne LLM API rozhrania.
 
 import os
 import logging
+import threading
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+import httpx
 from dotenv import load_dotenv
+from langchain_core.language_models import BaseChatModel
 from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
 
 from src.system_core.handlers import (
     handle_dotenv_error,
     handle_missing_api_key,
-    handle_client_creation_error
+    handle_client_creation_error,
+    handle_model_not_available
+)
+from src.llm.agents import clear_agent_cache
+from src.llm.utils import (
+    estimate_tokens,
+    retry_on_failure,
+    truncate_to_token_budget
 )
-from src.llm.utils import retry_on_failure
 
 # Konštanty pre konfiguráciu Ollama klientov/modelov
 OLLAMA_BASE_URL = "http://localhost:11434"
 DEFAULT_NUM_CTX = 8000
 DEFAULT_TEMPERATURE = 0.2
 DEFAULT_NUM_PREDICT = 4096
+# Veľkosti kontextového okna, z ktorých sa vyberá pre každú požiadavku
+# (pozri plan_request). Zmena num_ctx spôsobí opätovné načítanie modelu
+# na Ollama serveri, preto je veľkostí iba niekoľko.
+NUM_CTX_BUCKETS = (2048, 4096, 8192, 16384, 32768)
+# Maximálny počet generovaných tokenov podľa typu agenta. Výstup agentov
+# je krátky JSON, nie je preto potrebné rezervovať DEFAULT_NUM_PREDICT.
+# Popisovač a kombinovaný agent píšu popis v troch odsekoch.
+AGENT_NUM_PREDICT = {
+    "flow_classifier_agent": 512,
+    "flow_verdict_agent": 64,
+    "flow_batch_classifier_agent": 4096,
+    "logs_metadata_extractor_agent": 512,
+    "logs_descriptor_agent": 2048,
+    "logs_classifier_agent": 512,
+    "logs_verdict_agent": 64,
+    "logs_combined_agent": 2048,
+}
 DEFAULT_TOP_K = 10
 DEFAULT_TOP_P = 0.5
+# Semienko generátora modelu v deterministickom režime
+DETERMINISTIC_SEED = 42
+# Predvolená doba, počas ktorej Ollama server drží model v pamäti po
+# poslednej požiadavke (None = predvolená hodnota servera, 5 minút).
+# Spolu s modelom server drží aj KV cache spoločného prefixu promptov.
+DEFAULT_KEEP_ALIVE: Optional[Union[int, str]] = None
+
+# Konštanty pre pool HTTP spojení k Ollama serveru
+OLLAMA_MAX_CONNECTIONS = 8              # Maximálny počet spojení klienta
+OLLAMA_MAX_KEEPALIVE_CONNECTIONS = 8    # Počet udržiavaných spojení
+OLLAMA_KEEPALIVE_EXPIRY = 300.0         # Doba udržania nečinného spojenia (s)
 
 # Nastavenie loggingu
 logger = logging.getLogger(__name__)
 
+# Register Ollama klientov zdieľaných v rámci procesu, kľúčovaný názvom
+# modelu a parametrami vzorkovania
+_client_registry: Dict[Tuple, ChatOllama] = {}
+# Pooly HTTP spojení (synchrónny a asynchrónny) klientov v registri,
+# cez ktoré sa spojenia zatvárajú
+_client_transports: Dict[
+    Tuple, Tuple[httpx.HTTPTransport, httpx.AsyncHTTPTransport]] = {}
+# Zámok pre vytváranie a zatváranie klientov z viacerých vlákien
+_registry_lock = threading.Lock()
+# Deterministický režim klientov (pozri set_deterministic_mode)
+_deterministic_mode = False
+# Doba držania modelu v pamäti servera (pozri set_keep_alive)
+_keep_alive: Optional[Union[int, str]] = DEFAULT_KEEP_ALIVE
+# Výber najmenšieho kontextového okna pre každú požiadavku
+# (pozri set_adaptive_context)
+_adaptive_context = False
+# Modely dostupné na Ollama serveri (None = server ešte nebol dopytovaný)
+_available_models: Optional[Set[str]] = None
+
+
+def set_deterministic_mode(enabled: bool) -> None:
+    """
+    Zapne alebo vypne deterministický režim Ollama klientov.
+
+    V deterministickom režime vytvára get_ollama_client klientov s teplotou
+    0 a pevným semienkom DETERMINISTIC_SEED, takže model pre rovnaký vstup
+    vracia rovnakú odpoveď. Je to predpoklad platnosti perzistentnej cache
+    odpovedí (src/llm/response_cache.py). Zmena sa prejaví pri ďalšom
+    získaní klienta, klienti s pôvodnými parametrami zostávajú v registri.
+
+    Parametre:
+        enabled (bool): True pre zapnutie deterministického režimu
+    """
+    global _deterministic_mode
+    _deterministic_mode = enabled
+    logger.info(f"Deterministický režim LLM klientov: "
+                f"{'zapnutý' if enabled else 'vypnutý'}")
+
+
+def set_keep_alive(keep_alive: Optional[Union[int, str]]) -> None:
+    """
+    Nastaví dobu, počas ktorej Ollama server drží model v pamäti.
+
+    Kým je model načítaný, server znovu použije KV cache spoločného
+    prefixu promptov (statické inštrukcie šablón agentov), takže opakované
+    požiadavky spracúvajú iba premennú časť promptu. Zmena sa prejaví pri
+    ďalšom získaní klienta.
+
+    Parametre:
+        keep_alive (Optional[Union[int, str]]): Doba v sekundách alebo
+            v tvare Ollama ("30m", "1h"), -1 pre neobmedzené držanie,
+            None pre predvolenú hodnotu servera
+    """
+    global _keep_alive
+    _keep_alive = keep_alive
+    logger.info(f"Doba držania modelov v pamäti servera: "
+                f"{keep_alive if keep_alive is not None else 'predvolená'}")
+
+
+def set_adaptive_context(enabled: bool) -> None:
+    """
+    Zapne alebo vypne výber kontextového okna podľa veľkosti požiadavky.
+
+    V adaptívnom režime plan_request vyberá najmenšie okno
+    z NUM_CTX_BUCKETS, do ktorého sa požiadavka zmestí, takže krátke
+    požiadavky (toky) alokujú menšiu KV cache. Inak sa používa
+    DEFAULT_NUM_CTX a väčšie okno iba pre požiadavky, ktoré sa doň
+    nezmestia.
+
+    Parametre:
+        enabled (bool): True pre zapnutie adaptívneho režimu
+    """
+    global _adaptive_context
+    _adaptive_context = enabled
+    logger.info(f"Adaptívne kontextové okno LLM klientov: "
+                f"{'zapnuté' if enabled else 'vypnuté'}")
+
+
+def plan_request(template: str, input_data: Dict[str, Any],
+                 agent_type: str,
+                 operation_name: str) -> Tuple[int, int, Dict[str, Any]]:
+    """
+    Určí veľkosť kontextového okna a limit výstupu pre požiadavku agenta.
+
+    Veľkosť promptu sa odhadne z šablóny a vstupov, ktoré šablóna
+    používa. K nej sa pripočíta limit výstupu agenta (AGENT_NUM_PREDICT)
+    a vyberie sa najmenšie vyhovujúce kontextové okno (pozri
+    set_adaptive_context). Ak sa požiadavka nezmestí ani do najväčšieho
+    okna, najväčší vstup sa skráti (truncate_to_token_budget), aby server
+    neorezal inštrukcie agenta. Prekročenie aj skrátenie sa zaloguje.
+
+    Parametre:
+        template (str): Šablóna systémovej inštrukcie agenta
+        input_data (Dict[str, Any]): Vstupné dáta agenta
+        agent_type (str): Názov typu agenta (kľúč AGENT_NUM_PREDICT)
+        operation_name (str): Popisný názov operácie pre účely loggingu
+
+    Návratová hodnota:
+        Tuple[int, int, Dict[str, Any]]: Veľkosť kontextového okna
+        (num_ctx), limit výstupu (num_predict) a vstupné dáta (pri
+        prekročení so skráteným najväčším vstupom)
+    """
+    num_predict = AGENT_NUM_PREDICT.get(agent_type, DEFAULT_NUM_PREDICT)
+    # Vstupy, ktoré šablóna nepoužíva, sa do promptu nedostanú
+    used = {key: str(value) for key, value in input_data.items()
+            if f"{{{key}}}" in template}
+    template_tokens = estimate_tokens(template)
+    prompt_tokens = template_tokens + sum(estimate_tokens(value)
+                                          for value in used.values())
+    required = prompt_tokens + num_predict
+
+    if _adaptive_context:
+        buckets = NUM_CTX_BUCKETS
+    else:
+        # Okno len o málo väčšie ako predvolené (napr. 8192 pri 8000) by
+        # iba vynútilo opätovné načítanie modelu pre niekoľko tokenov
+        buckets = (DEFAULT_NUM_CTX,) + tuple(
+            bucket for bucket in NUM_CTX_BUCKETS
+            if bucket >= 2 * DEFAULT_NUM_CTX)
+
+    for num_ctx in buckets:
+        if required <= num_ctx:
+            if num_ctx != buckets[0] and not _adaptive_context:
+                logger.warning(
+                    f"{operation_name}: prompt (~{prompt_tokens} tokenov) "
+                    f"presahuje kontextové okno {DEFAULT_NUM_CTX}, "
+                    f"používam {num_ctx}")
+            return num_ctx, num_predict, input_data
+
+    # Požiadavka sa nezmestí ani do najväčšieho okna - skráti sa najväčší
+    # vstup
+    num_ctx = buckets[-1]
+    if not used:
+        logger.warning(f"{operation_name}: šablóna (~{template_tokens} "
+                       f"tokenov) presahuje kontextové okno {num_ctx}")
+        return num_ctx, num_predict, input_data
+
+    key = max(used, key=lambda name: len(used[name]))
+    other_tokens = prompt_tokens - estimate_tokens(used[key])
+    truncated, omitted = truncate_to_token_budget(
+        used[key], max(num_ctx - num_predict - other_tokens, 0))
+    logger.warning(
+        f"{operation_name}: prompt (~{prompt_tokens} tokenov) presahuje "
+        f"najväčšie kontextové okno {num_ctx}, vstup '{key}' skrátený "
+        f"o {omitted} riadkov")
+    return num_ctx, num_predict, {**input_data, key: truncated}
+
+
+def get_ollama_client(model: str,
+                      num_ctx: int = DEFAULT_NUM_CTX,
+                      temperature: float = DEFAULT_TEMPERATURE,
+                      num_predict: int = DEFAULT_NUM_PREDICT,
+                      top_k: int = DEFAULT_TOP_K,
+                      top_p: float = DEFAULT_TOP_P,
+                      seed: Optional[int] = None,
+                      keep_alive: Optional[Union[int, str]] = None
+                      ) -> ChatOllama:
+    """
+    Vráti zdieľaného ChatOllama klienta pre zadaný model a parametre.
+
+    Klient sa vytvorí iba pri prvej požiadavke a ďalšie volania s rovnakým
+    modelom a parametrami vzorkovania vrátia tú istú inštanciu. Klient
+    používa pool HTTP spojení s keep-alive (httpx transport odovzdaný cez
+    sync_client_kwargs a async_client_kwargs), takže opakované požiadavky
+    nenadväzujú nové spojenie so serverom.
+
+    Vytváranie klientov je chránené zámkom, klienta je preto možné získať
+    z viacerých vlákien aj z asyncio kódu. Asynchrónny HTTP klient je
+    viazaný na event loop, v ktorom bol prvýkrát použitý - po ukončení
+    event loopu treba zavolať aclose_clients().
+
+    V deterministickom režime (set_deterministic_mode) sa teplota
+    a semienko nahradia hodnotami 0 a DETERMINISTIC_SEED. Bez explicitnej
+    hodnoty keep_alive sa použije hodnota nastavená set_keep_alive.
+
+    Parametre:
+        model (str): Názov modelu na Ollama serveri
+        num_ctx (int): Veľkosť kontextového okna
+        temperature (float): Teplota vzorkovania
+        num_predict (int): Maximálny počet generovaných tokenov
+        top_k (int): Parameter top-k vzorkovania
+        top_p (float): Parameter top-p vzorkovania
+        seed (Optional[int]): Semienko generátora modelu
+        keep_alive (Optional[Union[int, str]]): Doba držania modelu
+            v pamäti servera (pozri set_keep_alive)
+
+    Návratová hodnota:
+        ChatOllama: Zdieľaný ChatOllama klient
+    """
+    if _deterministic_mode:
+        temperature, seed = 0.0, DETERMINISTIC_SEED
+    if keep_alive is None:
+        keep_alive = _keep_alive
+
+    key = (model, num_ctx, temperature, num_predict, top_k, top_p, seed,
+           keep_alive, OLLAMA_BASE_URL)
+
+    with _registry_lock:
+        client = _client_registry.get(key)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=OLLAMA_KEEPALIVE_EXPIRY
+            )
+            transport = httpx.HTTPTransport(limits=limits)
+            async_transport = httpx.AsyncHTTPTransport(limits=limits)
+            client = ChatOllama(
+                model=model,
+                num_ctx=num_ctx,
+                temperature=temperature,
+                num_predict=num_predict,
+                top_k=top_k,
+                top_p=top_p,
+                seed=seed,
+                keep_alive=keep_alive,
+                base_url=OLLAMA_BASE_URL,
+                sync_client_kwargs={"transport": transport},
+                async_client_kwargs={"transport": async_transport}
+            )
+            _client_registry[key] = client
+            _client_transports[key] = (transport, async_transport)
+            logger.info(f"Vytvorený nový Ollama klient pre model {model}")
+
+    return client
+
+
+def normalize_model_name(model: str) -> str:
+    """
+    Doplní k názvu modelu predvolenú značku, ak ju nemá.
+
+    Ollama server označuje modely bez značky ako "<model>:latest".
+
+    Parametre:
+        model (str): Názov modelu
+
+    Návratová hodnota:
+        str: Názov modelu so značkou
+    """
+    return model if ":" in model else f"{model}:latest"
+
+
+def get_available_models(client: ChatOllama,
+                         refresh: bool = False) -> Set[str]:
+    """
+    Vráti modely dostupné na Ollama serveri.
+
+    Zoznam sa zistí jedinou požiadavkou na /api/tags a uloží sa pre celý
+    proces, ďalšie volania server nedopytujú.
+
+    Parametre:
+        client (ChatOllama): Klient pripojený k serveru
+        refresh (bool): True pre opätovné dopytovanie servera
+
+    Návratová hodnota:
+        Set[str]: Názvy dostupných modelov so značkou
+
+    Vyvoláva:
+        ApiClientInitializationError: Keď server nie je dostupný
+    """
+    global _available_models
+    with _registry_lock:
+        if _available_models is not None and not refresh:
+            return _available_models
+
+    try:
+        response = client._client.list()
+    except Exception as e:
+        handle_client_creation_error(f"{client.model} Ollama", e,
+                                     OLLAMA_BASE_URL)
+
+    models = {normalize_model_name(item.model) for item in response.models}
+    with _registry_lock:
+        _available_models = models
+    logger.info(f"Ollama server ponúka {len(models)} modelov")
+    return models
+
+
+def preflight_client(client: BaseChatModel) -> bool:
+    """
+    Overí dostupnosť modelu klienta a načíta ho pred prvou analýzou.
+
+    Predbežná kontrola zlyhá okamžite jednou zrozumiteľnou chybou, ak
+    model na serveri chýba, namiesto opakovaných pokusov pre každý
+    analyzovaný záznam. Dostupný model sa načíta požiadavkou na jeden
+    token s kontextovým oknom klienta, aby čas prvého záznamu nezahŕňal
+    načítanie modelu. Ollama pri inom num_ctx model načíta znovu, klient
+    má preto mať rovnaké num_ctx ako prvá skutočná požiadavka. Zlyhanie
+    načítania iba zaloguje a model sa načíta pri prvej požiadavke.
+    Klienti iných poskytovateľov ako Ollama sa nekontrolujú.
+
+    Parametre:
+        client (BaseChatModel): Klient získaný zo spawn_*_client
+
+    Návratová hodnota:
+        bool: True ak je model dostupný
+
+    Vyvoláva:
+        ModelNotAvailableError: Keď model nie je dostupný na serveri
+        ApiClientInitializationError: Keď server nie je dostupný
+    """
+    if not isinstance(client, ChatOllama):
+        return True
+
+    available_models = get_available_models(client)
+    if normalize_model_name(client.model) not in available_models:
+        handle_model_not_available(client.model, available_models,
+                                   OLLAMA_BASE_URL)
+
+    try:
+        get_ollama_client(client.model, num_ctx=client.num_ctx,
+                          num_predict=1,
+                          keep_alive=client.keep_alive).invoke("OK")
+        logger.info(f"Model {client.model} je načítaný a pripravený "
+                    f"(num_ctx={client.num_ctx})")
+    except Exception as e:
+        logger.warning(f"Načítanie modelu {client.model} zlyhalo: {e}")
+
+    return True
+
+
+def close_clients() -> None:
+    """
+    Zatvorí HTTP spojenia všetkých zdieľaných klientov a vyprázdni register.
+
+    Po zatvorení vytvorí ďalšie volanie get_ollama_client nového klienta.
+    Asynchrónne spojenia zatvára aclose_clients().
+    """
+    with _registry_lock:
+        clients = list(_client_registry.items())
+        transports = dict(_client_transports)
+        _client_registry.clear()
+        _client_transports.clear()
+    # Skompilovaní agenti odkazujú na zatváraných klientov
+    clear_agent_cache()
+
+    for key, client in clients:
+        try:
+            transports[key][0].close()
+        except Exception as e:
+            logger.warning(f"Chyba pri zatváraní klienta {client.model}: {e}")
+    if clients:
+        logger.info(f"Zatvorených {len(clients)} Ollama klientov")
+
+
+async def aclose_clients() -> None:
+    """
+    Zatvorí synchrónne aj asynchrónne HTTP spojenia všetkých zdieľaných
+    klientov a vyprázdni register.
+
+    Volá sa na konci event loopu, v ktorom boli klienti použití
+    asynchrónne (ainvoke).
+    """
+    with _registry_lock:
+        clients = list(_client_registry.items())
+        transports = dict(_client_transports)
+        _client_registry.clear()
+        _client_transports.clear()
+    # Skompilovaní agenti odkazujú na zatváraných klientov
+    clear_agent_cache()
+
+    for key, client in clients:
+        transport, async_transport = transports[key]
+        try:
+            transport.close()
+            await async_transport.aclose()
+        except Exception as e:
+            logger.warning(f"Chyba pri zatváraní klienta {client.model}: {e}")
+    if clients:
+        logger.info(f"Zatvorených {len(clients)} Ollama klientov")
+
 
 @retry_on_failure()
 def spawn_openai_client() -> ChatOpenAI:
@@ -61,90 +471,89 @@ def spawn_openai_client() -> ChatOpenAI:
 
 
 @retry_on_failure()
-def spawn_secllama_client(num_epochs: int) -> ChatOllama:
+def spawn_secllama_client(num_epochs: int,
+                          num_ctx: int = DEFAULT_NUM_CTX,
+                          num_predict: int = DEFAULT_NUM_PREDICT
+                          ) -> ChatOllama:
     """
     Vytvorí a vráti ChatOllama klienta nakonfigurovaného pre secLlama3B model.
 
     Táto funkcia inicializuje ChatOllama klienta so špecifickými parametrami
     optimalizovanými pre secLlama3B model bežiaci na Ollama serveri.
     Konfigurácia zahŕňa veľkosť kontextového okna, nastavenia teploty
-    a limity predikcií.
+    a limity predikcií. Klient je zdieľaný v rámci procesu
+    (pozri get_ollama_client), opakované volania ho znovu nevytvárajú.
 
     Parametre:
         num_epochs (int): Počet epoch ladenia modelu
+        num_ctx (int): Veľkosť kontextového okna (pozri plan_request)
+        num_predict (int): Maximálny počet generovaných tokenov
 
     Návratová hodnota:
         ChatOllama: Nakonfigurovaný ChatOllama klient pripojený k secLlama3B
     """
-    # Vytvorenie a vrátenie secLlama3B klienta s konfiguráciou pre zadaný počet epoch
+    # Získanie zdieľaného secLlama3B klienta pre zadaný počet epoch
     try:
-        return ChatOllama(
-            model=f"secLlama3B_{num_epochs}ep_Q4_K_M.gguf:latest",
-            num_ctx=DEFAULT_NUM_CTX,
-            temperature=DEFAULT_TEMPERATURE,
-            num_predict=DEFAULT_NUM_PREDICT,
-            top_k=DEFAULT_TOP_K,
-            top_p=DEFAULT_TOP_P,
-            base_url=OLLAMA_BASE_URL
-        )
+        return get_ollama_client(
+            f"secLlama3B_{num_epochs}ep_Q4_K_M.gguf:latest",
+            num_ctx=num_ctx, num_predict=num_predict)
     except Exception as e:
         handle_client_creation_error("secLlama3B Ollama", e, OLLAMA_BASE_URL)
 
 
 @retry_on_failure()
-def spawn_brutellama_client(num_epochs: int) -> ChatOllama:
+def spawn_brutellama_client(num_epochs: int,
+                            num_ctx: int = DEFAULT_NUM_CTX,
+                            num_predict: int = DEFAULT_NUM_PREDICT
+                            ) -> ChatOllama:
     """
     Vytvorí a vráti ChatOllama klienta nakonfigurovaného pre bruteLlama3B model.
 
     Táto funkcia inicializuje ChatOllama klienta so špecifickými parametrami
     optimalizovanými pre bruteLlama3B model bežiaci na Ollama serveri.
     Konfigurácia zahŕňa veľkosť kontextového okna, nastavenia teploty
-    a limity predikcií.
+    a limity predikcií. Klient je zdieľaný v rámci procesu
+    (pozri get_ollama_client), opakované volania ho znovu nevytvárajú.
 
     Parametre:
         num_epochs (int): Počet epoch ladenia modelu
+        num_ctx (int): Veľkosť kontextového okna (pozri plan_request)
+        num_predict (int): Maximálny počet generovaných tokenov
 
     Návratová hodnota:
         ChatOllama: Nakonfigurovaný ChatOllama klient pripojený k bruteLlama3B
     """
-    # Vytvorenie a vrátenie bruteLlama3B klienta s konfiguráciou pre zadaný počet epoch
+    # Získanie zdieľaného bruteLlama3B klienta pre zadaný počet epoch
     try:
-        return ChatOllama(
-            model=f"bruteLlama3B_{num_epochs}ep_Q4_K_M.gguf:latest",
-            num_ctx=DEFAULT_NUM_CTX,
-            temperature=DEFAULT_TEMPERATURE,
-            num_predict=DEFAULT_NUM_PREDICT,
-            top_k=DEFAULT_TOP_K,
-            top_p=DEFAULT_TOP_P,
-            base_url=OLLAMA_BASE_URL
-        )
+        return get_ollama_client(
+            f"bruteLlama3B_{num_epochs}ep_Q4_K_M.gguf:latest",
+            num_ctx=num_ctx, num_predict=num_predict)
     except Exception as e:
         handle_client_creation_error("bruteLlama3B Ollama", e, OLLAMA_BASE_URL)
 
 
 @retry_on_failure()
-def spawn_llama3_client() -> ChatOllama:
+def spawn_llama3_client(num_ctx: int = DEFAULT_NUM_CTX,
+                        num_predict: int = DEFAULT_NUM_PREDICT) -> ChatOllama:
     """
     Vytvorí a vráti ChatOllama klienta nakonfigurovaného pre Llama 3.2:3b model.
 
     Táto funkcia inicializuje ChatOllama klienta so špecifickými parametrami
     optimalizovanými pre Llama 3.2 3B model bežiaci na Ollama serveri.
     Konfigurácia zahŕňa veľkosť kontextového okna, nastavenia teploty
-    a limity predikcií.
+    a limity predikcií. Klient je zdieľaný v rámci procesu
+    (pozri get_ollama_client), opakované volania ho znovu nevytvárajú.
+
+    Parametre:
+        num_ctx (int): Veľkosť kontextového okna (pozri plan_request)
+        num_predict (int): Maximálny počet generovaných tokenov
 
     Návratová hodnota:
         ChatOllama: Nakonfigurovaný ChatOllama klient pripojený k llama3.2:3b
     """
-    # Vytvorenie a vrátenie Llama 3.2 klienta
+    # Získanie zdieľaného Llama 3.2 klienta
     try:
-        return ChatOllama(
-            model="llama3.2:3b",
-            num_ctx=DEFAULT_NUM_CTX,
-            temperature=DEFAULT_TEMPERATURE,
-            num_predict=DEFAULT_NUM_PREDICT,
-            top_k=DEFAULT_TOP_K,
-            top_p=DEFAULT_TOP_P,
-            base_url=OLLAMA_BASE_URL
-        )
+        return get_ollama_client("llama3.2:3b", num_ctx=num_ctx,
+                                 num_predict=num_predict)
     except Exception as e:
         handle_client_creation_error("Llama 3.2 Ollama", e, OLLAMA_BASE_URL)
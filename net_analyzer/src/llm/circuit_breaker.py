@@ -0,0 +1,233 @@
+"""
+Tento modul poskytuje istič (circuit breaker) pre požiadavky na LLM server.
+
+Istič sleduje po sebe idúce zlyhania dostupnosti servera (nedostupné
+spojenie, prekročený časový limit, chyba servera). Po dosiahnutí limitu
+zlyhaní sa otvorí a všetky požiadavky okamžite odmieta, takže nedostupný
+server nespomaľuje analýzu čakaním na každý záznam. Po uplynutí času
+obnovy prepustí jednu skúšobnú požiadavku (polootvorený stav) - ak
+uspeje, istič sa zatvorí, inak sa znovu otvorí.
+"""
+
+import logging
+import threading
+import time
+from langchain_core.exceptions import OutputParserException
+from ollama import ResponseError
+from pydantic import ValidationError
+
+from src.system_core.exceptions import (
+    AgentInitializationError,
+    EnvFileNotFoundError,
+    MissingApiKeyError,
+    ModelNotAvailableError
+)
+
+# Nastavenie loggingu
+logger = logging.getLogger(__name__)
+
+# Počet po sebe idúcich zlyhaní, po ktorom sa istič otvorí
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+# Čas v sekundách, po ktorom otvorený istič prepustí skúšobnú požiadavku
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30.0
+
+# Chyby, ktoré opakovanie neodstráni (chýbajúci model, neplatný výstup
+# modelu, chýbajúca konfigurácia). AgentInitializationError vyvoláva
+# retry_on_failure až po vyčerpaní vlastných pokusov, vonkajšie
+# opakovanie by ich iba znásobilo.
+FATAL_ERRORS = (
+    AgentInitializationError,
+    ModelNotAvailableError,
+    MissingApiKeyError,
+    EnvFileNotFoundError,
+    ValidationError,
+    OutputParserException,
+)
+# HTTP kódy chýb klienta, pri ktorých má zmysel požiadavku opakovať
+RETRYABLE_CLIENT_STATUS_CODES = (408, 429)
+# HTTP kód odpovede Ollama servera pre chýbajúci model
+MODEL_NOT_FOUND_STATUS_CODE = 404
+
+# Stavy ističa
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Rozhodne, či má zmysel operáciu po chybe opakovať.
+
+    Opakovať sa oplatí chyby dostupnosti servera (odmietnuté spojenie,
+    prekročený časový limit, chyba servera 5xx, preťaženie). Chýbajúci
+    model, neplatný štruktúrovaný výstup, chýbajúca konfigurácia a iné
+    chyby klienta 4xx sú fatálne. Neznáme chyby sa považujú za dočasné.
+
+    Parametre:
+        error (BaseException): Zachytená výnimka
+
+    Návratová hodnota:
+        bool: True pre dočasnú chybu, False pre fatálnu chybu
+    """
+    if isinstance(error, FATAL_ERRORS):
+        return False
+
+    # Chyby odpovede Ollama servera (napr. 404 pre chýbajúci model)
+    status_code = getattr(error, "status_code", None)
+    if isinstance(error, ResponseError) and status_code is not None:
+        return not (400 <= status_code < 500
+                    and status_code not in RETRYABLE_CLIENT_STATUS_CODES)
+
+    return True
+
+
+def is_model_not_found_error(error: BaseException) -> bool:
+    """
+    Rozhodne, či chyba znamená, že model na serveri nie je dostupný.
+
+    Parametre:
+        error (BaseException): Zachytená výnimka
+
+    Návratová hodnota:
+        bool: True ak model na serveri chýba
+    """
+    if isinstance(error, ModelNotAvailableError):
+        return True
+    return (isinstance(error, ResponseError)
+            and getattr(error, "status_code", None)
+            == MODEL_NOT_FOUND_STATUS_CODE)
+
+
+class CircuitBreaker:
+    """
+    Istič požiadaviek na LLM server zdieľaný všetkými volajúcimi.
+
+    Istič je možné používať z viacerých vlákien aj z asyncio kódu.
+
+    Parametre:
+        failure_threshold (int): Počet po sebe idúcich zlyhaní, po ktorom
+            sa istič otvorí
+        reset_timeout (float): Čas v sekundách, po ktorom otvorený istič
+            prepustí skúšobnú požiadavku
+    """
+
+    def __init__(self,
+                 failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.stats = {"failures": 0, "trips": 0, "rejected": 0}
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Rozhodne, či môže požiadavka pokračovať na server.
+
+        V otvorenom stave po uplynutí reset_timeout prepustí práve jednu
+        skúšobnú požiadavku, ostatné odmieta až do jej výsledku. Ak
+        skúšobná požiadavka nevráti výsledok do reset_timeout (napr. bola
+        zrušená), prepustí sa ďalšia.
+
+        Návratová hodnota:
+            bool: True ak požiadavka môže pokračovať, inak False
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if (self.state == OPEN and time.monotonic() - self._opened_at
+                    >= self.reset_timeout):
+                self.state = HALF_OPEN
+                logger.info("Istič LLM servera je polootvorený - "
+                            "skúšobná požiadavka")
+
+            if self.state == HALF_OPEN and (
+                    not self._probe_in_flight
+                    or time.monotonic() - self._probe_started
+                    >= self.reset_timeout):
+                self._probe_in_flight = True
+                self._probe_started = time.monotonic()
+                return True
+
+            self.stats["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        """
+        Zaznamená odpoveď servera a zatvorí istič.
+
+        Volá sa aj pri fatálnej chybe (napr. neplatný výstup modelu),
+        keďže server odpovedal a je dostupný.
+        """
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Istič LLM servera je zatvorený - server "
+                            "znovu odpovedá")
+            self.state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """
+        Zaznamená zlyhanie dostupnosti servera.
+
+        Istič sa otvorí po failure_threshold po sebe idúcich zlyhaniach
+        alebo po zlyhaní skúšobnej požiadavky.
+        """
+        with self._lock:
+            self.stats["failures"] += 1
+            self._consecutive_failures += 1
+            if (self.state == HALF_OPEN
+                    or self._consecutive_failures >= self.failure_threshold):
+                if self.state != OPEN:
+                    self.stats["trips"] += 1
+                    logger.warning(
+                        f"Istič LLM servera je otvorený po "
+                        f"{self._consecutive_failures} zlyhaniach - "
+                        f"požiadavky sa {self.reset_timeout:.0f} s odmietajú"
+                    )
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def reset(self) -> None:
+        """
+        Vráti istič do zatvoreného stavu a vynuluje štatistiky.
+        """
+        with self._lock:
+            self.state = CLOSED
+            self.stats = {"failures": 0, "trips": 0, "rejected": 0}
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def log_stats(self) -> None:
+        """
+        Zaloguje štatistiky ističa, ak sa počas analýzy otvoril.
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        if stats["trips"]:
+            logger.warning(
+                f"Istič LLM servera: {stats['trips']}x otvorený, "
+                f"{stats['failures']} zlyhaní, {stats['rejected']} "
+                f"odmietnutých požiadaviek"
+            )
+
+
+# Istič zdieľaný všetkými požiadavkami na LLM server v procese
+_circuit_breaker = CircuitBreaker()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """
+    Vráti istič zdieľaný všetkými požiadavkami na LLM server.
+
+    Návratová hodnota:
+        CircuitBreaker: Zdieľaný istič
+    """
+    return _circuit_breaker
@@ -4,16 +4,39 @@ Tento modul obsahuje toky pre detekciu útokov hrubou silou.
 
 import logging
 import time
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Type, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import RunnableLambda, RunnableParallel
+from pydantic import BaseModel
 
 from src.llm.agents import (
+    FLOW_BATCH_CLASSIFIER_TEMPLATE,
+    FLOW_CLASSIFIER_TEMPLATE,
+    FLOW_VERDICT_TEMPLATE,
+    LOGS_CLASSIFIER_TEMPLATE,
+    LOGS_COMBINED_TEMPLATE,
+    LOGS_DESCRIPTOR_TEMPLATE,
+    LOGS_METADATA_EXTRACTOR_TEMPLATE,
+    LOGS_VERDICT_TEMPLATE,
     spawn_logs_classifier_agent,
+    spawn_logs_verdict_agent,
     spawn_logs_metadata_extractor_agent,
     spawn_logs_descriptor_agent,
-    spawn_flow_classifier_agent
+    spawn_logs_combined_agent,
+    spawn_flow_classifier_agent,
+    spawn_flow_verdict_agent,
+    spawn_flow_stream_classifier_agent,
+    spawn_flow_batch_classifier_agent
 )
 from src.llm.utils import (
     validate_input_data,
     safe_agent_invoke,
+    safe_agent_ainvoke,
+    safe_agent_runnable,
+    safe_agent_stream_verdict,
+    safe_agent_astream_verdict,
     preprocess_metadata,
     preprocess_description,
     retry_on_failure
@@ -22,10 +45,21 @@ from src.system_core.handlers import (
     handle_metadata_extractor_agent_failure,
     handle_logs_descriptor_agent_failure,
     handle_logs_classifier_agent_failure,
-    handle_flow_classifier_agent_failure
+    handle_logs_combined_agent_failure,
+    handle_flow_classifier_agent_failure,
+    handle_flow_batch_classifier_agent_failure
 )
 from src.system_core.data_models import LogsAnalysisResult, FlowAnalysisResult
+from src.llm.prompt_store import get_prompt_store, store_prompt
+from src.llm.response_cache import get_response_cache_stats
+from src.data_processing.log_metadata_parser import (
+    fast_path_logs_metadata,
+    record_metadata_step
+)
 from src.llm.api_clients import (
+    DEFAULT_NUM_CTX,
+    DEFAULT_NUM_PREDICT,
+    plan_request,
     spawn_secllama_client,
     spawn_brutellama_client,
     spawn_llama3_client
@@ -34,10 +68,153 @@ from src.llm.api_clients import (
 # Nastavenie loggingu
 logger = logging.getLogger(__name__)
 
+# Zdôvodnenie výsledku analýzy iba s verdiktom (pozri explain)
+VERDICT_ONLY_REASON = (
+    "Verdict-only analysis, the reason can be generated with explain()."
+)
+# Vstupy Klasifikátora logov použité jeho šablónou (ukladajú sa pre
+# dodatočné vysvetlenie)
+LOGS_CLASSIFIER_INPUTS = ("logs_metadata", "logs_description")
+
+
+def spawn_logs_analysis_client(
+        num_epochs: int,
+        num_ctx: int = DEFAULT_NUM_CTX,
+        num_predict: int = DEFAULT_NUM_PREDICT) -> BaseChatModel:
+    """
+    Vráti zdieľaného LLM klienta pre analýzu logov.
+
+    Parametre:
+        num_epochs (int): Počet epoch ladenia LLM pre bruteLlama3B,
+            0 pre základný model Llama 3.2 3B
+        num_ctx (int): Veľkosť kontextového okna (pozri plan_request)
+        num_predict (int): Maximálny počet generovaných tokenov
+
+    Návratová hodnota:
+        BaseChatModel: LLM klient pre analýzu logov
+    """
+    if num_epochs > 0:
+        return spawn_brutellama_client(num_epochs, num_ctx, num_predict)
+    return spawn_llama3_client(num_ctx, num_predict)
+
+
+def spawn_flow_analysis_client(
+        num_epochs: int,
+        num_ctx: int = DEFAULT_NUM_CTX,
+        num_predict: int = DEFAULT_NUM_PREDICT) -> BaseChatModel:
+    """
+    Vráti zdieľaného LLM klienta pre analýzu tokov paketov.
+
+    Parametre:
+        num_epochs (int): Počet epoch ladenia LLM pre secLlama3B,
+            0 pre základný model Llama 3.2 3B
+        num_ctx (int): Veľkosť kontextového okna (pozri plan_request)
+        num_predict (int): Maximálny počet generovaných tokenov
+
+    Návratová hodnota:
+        BaseChatModel: LLM klient pre analýzu tokov paketov
+    """
+    if num_epochs > 0:
+        return spawn_secllama_client(num_epochs, num_ctx, num_predict)
+    return spawn_llama3_client(num_ctx, num_predict)
+
+
+def with_deferred_reason(
+        result: Any,
+        schema: Type[BaseModel]) -> Union[FlowAnalysisResult,
+                                          LogsAnalysisResult]:
+    """
+    Doplní výsledok agenta iba s verdiktom o zástupné zdôvodnenie.
+
+    Parametre:
+        result (Any): Výsledok agenta iba s verdiktom alebo výsledok
+            mechanizmu obnovy (už v tvare schema)
+        schema (Type[BaseModel]): Dátový model výsledku so zdôvodnením
+
+    Návratová hodnota:
+        Union[FlowAnalysisResult, LogsAnalysisResult]: Výsledok
+        so zdôvodnením VERDICT_ONLY_REASON
+    """
+    if isinstance(result, schema):
+        return result
+    return schema(**result.model_dump(), reason=VERDICT_ONLY_REASON)
+
+
+def explain(item_id: str) -> Union[FlowAnalysisResult, LogsAnalysisResult]:
+    """
+    Vytvorí zdôvodnenie verdiktu položky z analýzy iba s verdiktom.
+
+    Načíta vstup agenta uložený pri analýze (pozri src/llm/prompt_store.py)
+    a vyvolá naň Klasifikačného agenta so zdôvodnením. Statické inštrukcie
+    oboch agentov sa zhodujú, takže zdôvodnenie sa týka rovnakého vstupu
+    a rovnakých kritérií ako pôvodný verdikt.
+
+    Parametre:
+        item_id (str): Identifikátor položky (napr. "chunk_17" alebo
+            názov log súboru)
+
+    Návratová hodnota:
+        Union[FlowAnalysisResult, LogsAnalysisResult]: Výsledok
+        klasifikácie so zdôvodnením
+
+    Vyvoláva:
+        ValueError: Ak úložisko vstupov nie je zapnuté alebo položka
+            v ňom nie je
+
+    Poznámka:
+        Model verdikt pri vysvetlení posudzuje znovu. Mimo deterministického
+        režimu sa preto môže vrátený verdikt od pôvodného líšiť.
+    """
+    store = get_prompt_store()
+    entry = None if store is None else store.get(item_id)
+    if entry is None:
+        raise ValueError(f"Položka {item_id} nie je v úložisku vstupov "
+                         f"agentov")
+    kind, num_epochs, input_data = entry
+
+    if kind == "flow":
+        template, agent_type = (FLOW_CLASSIFIER_TEMPLATE,
+                                "flow_classifier_agent")
+        spawn_client, spawn_agent = (spawn_flow_analysis_client,
+                                     spawn_flow_classifier_agent)
+        recovery_function = handle_flow_classifier_agent_failure
+    else:
+        template, agent_type = (LOGS_CLASSIFIER_TEMPLATE,
+                                "logs_classifier_agent")
+        spawn_client, spawn_agent = (spawn_logs_analysis_client,
+                                     spawn_logs_classifier_agent)
+        recovery_function = handle_logs_classifier_agent_failure
+
+    num_ctx, num_predict, input_data = plan_request(
+        template, input_data, agent_type, "vysvetlenie verdiktu")
+    agent = spawn_agent(spawn_client(num_epochs, num_ctx, num_predict))
+    result = safe_agent_invoke(agent, input_data, "vysvetlenie verdiktu",
+                               recovery_function)
+    logger.info(f"Zdôvodnenie položky {item_id}: {result.reason}")
+    return result
+
+
+def explain_flagged() -> Dict[str, Union[FlowAnalysisResult,
+                                         LogsAnalysisResult]]:
+    """
+    Vytvorí zdôvodnenia všetkých položiek označených ako útok.
+
+    Návratová hodnota:
+        Dict[str, Union[FlowAnalysisResult, LogsAnalysisResult]]: Výsledok
+        so zdôvodnením pre každý identifikátor označenej položky
+    """
+    store = get_prompt_store()
+    if store is None:
+        return {}
+    return {item_id: explain(item_id) for item_id in store.flagged_items()}
+
 
 @retry_on_failure(max_retries=2)
 def detect_brute_force_in_logs(logs_to_process: str,
-                               num_epochs: int) -> LogsAnalysisResult:
+                               num_epochs: int,
+                               verdict_only: bool = False,
+                               item_id: Optional[str] = None
+                               ) -> LogsAnalysisResult:
     """
     Detekuje útoky hrubou silou v logových súboroch. Implementuje metódu
     analýzy logov (kapitola 2.1).
@@ -46,14 +223,21 @@ def detect_brute_force_in_logs(logs_to_process: str,
     1. validuje vstupné dáta,
     2. inicializuje LLM API klientov,
     3. inicializuje LLM agentov,
-    4. extrahuje metadáta z logov,
-    5. popíše aktivitu v logoch,
-    6. spracuje čiastočnné výstupy z krokov 4 a 5,
-    7. klasifikuje, či došlo k útoku hrubou silou.
+    4. súbežne extrahuje metadáta z logov a popíše aktivitu v logoch
+       (metadáta extrahuje parserom bez LLM, ak je zapnutý a rozhodne -
+       pozri set_metadata_fast_path),
+    5. spracuje čiastočnné výstupy z kroku 4,
+    6. klasifikuje, či došlo k útoku hrubou silou.
+
+    Pri verdict_only klasifikátor negeneruje zdôvodnenie a jeho vstup sa
+    uloží pod item_id do úložiska vstupov, zdôvodnenie je možné vytvoriť
+    neskôr funkciou explain.
 
     Parametre:
         logs_to_process (str): Logové záznamy na analýzu
         num_epochs (int): Počet epoch ladenia LLM pre bruteLlama3B
+        verdict_only (bool): Či klasifikovať bez zdôvodnenia
+        item_id (Optional[str]): Identifikátor položky v úložisku vstupov
 
     Návratová hodnota:
         LogsAnalysisResult: Výsledok klasifikácie s indikátormi útoku
@@ -69,36 +253,70 @@ def detect_brute_force_in_logs(logs_to_process: str,
         return handle_logs_classifier_agent_failure()
     logger.info("Vstupné logy sú validné.")
 
-    # Inicializácia LLM klientov
-    if num_epochs > 0:
-        llm_client = spawn_brutellama_client(num_epochs)
-    else:
-        llm_client = spawn_llama3_client()
-    logger.info("LLM klient úspešne inicializovaný")
-
-    # Inicializácia LLM agentov
-    metadata_extractor_agent = spawn_logs_metadata_extractor_agent(
-        llm_client)
-    logs_descriptor_agent = spawn_logs_descriptor_agent(llm_client)
-    logs_classifier_agent = spawn_logs_classifier_agent(llm_client)
+    # Deterministické extrahovanie metadát bez volania LLM
+    parsed_metadata = fast_path_logs_metadata(logs_to_process)
+
+    # Určenie kontextového okna a limitu výstupu pre Popisovača logov
+    description_ctx, description_predict, description_input = plan_request(
+        LOGS_DESCRIPTOR_TEMPLATE, {"input": logs_to_process},
+        "logs_descriptor_agent", "popisovanie logov")
+
+    # Inicializácia LLM klientov a agentov
+    logs_descriptor_agent = spawn_logs_descriptor_agent(
+        spawn_logs_analysis_client(num_epochs, description_ctx,
+                                   description_predict))
+    branches = {
+        "description": itemgetter("description") | safe_agent_runnable(
+            logs_descriptor_agent,
+            "popisovanie logov",
+            handle_logs_descriptor_agent_failure
+        )
+    }
+    inputs = {"description": description_input}
+    # Čas Extraktora metadát pre štatistiky parsera metadát
+    extraction_seconds = []
+
+    if parsed_metadata is None:
+        metadata_ctx, metadata_predict, metadata_input = plan_request(
+            LOGS_METADATA_EXTRACTOR_TEMPLATE, {"input": logs_to_process},
+            "logs_metadata_extractor_agent", "extrahovanie metadát")
+        metadata_extractor_agent = spawn_logs_metadata_extractor_agent(
+            spawn_logs_analysis_client(num_epochs, metadata_ctx,
+                                       metadata_predict))
+
+        def extract_metadata(input_data: dict) -> Any:
+            # Vyvolanie Extraktora metadát s meraním času pre štatistiky
+            # parsera metadát
+            start = time.perf_counter()
+            result = safe_agent_invoke(
+                metadata_extractor_agent,
+                input_data,
+                "extrahovanie metadát",
+                handle_metadata_extractor_agent_failure
+            )
+            extraction_seconds.append(time.perf_counter() - start)
+            return result
+
+        branches["metadata"] = itemgetter("metadata") | RunnableLambda(
+            extract_metadata, name="extrahovanie metadát")
+        inputs["metadata"] = metadata_input
     logger.info("LLM agenti úspešne inicializovaní")
 
-    # Vyvolanie Extrahovača metadát
-    metadata = safe_agent_invoke(
-        metadata_extractor_agent,
-        {"input": logs_to_process},
-        "extrahovanie metadát",
-        handle_metadata_extractor_agent_failure
-    )
-    logger.info(f"Extrahované metadáta: {metadata}")
+    # Súbežné vyvolanie Extrahovača metadát a Popisovača logov. Agenti
+    # na sebe nezávisia a každý má vlastný mechanizmus obnovy, zlyhanie
+    # jedného preto neovplyvní výsledok druhého.
+    step_start = time.perf_counter()
+    log_insights = RunnableParallel(**branches).invoke(inputs)
+    if not get_response_cache_stats():
+        # Trvanie kroku sa meria iba pri vypnutej cache odpovedí, odpovede
+        # z cache by odhad ušetrenej latencie skreslili
+        record_metadata_step(
+            time.perf_counter() - step_start,
+            extraction_seconds[0] if extraction_seconds else None)
 
-    # Vyvolanie Popisovača logov
-    description = safe_agent_invoke(
-        logs_descriptor_agent,
-        {"input": logs_to_process},
-        "popisovanie logov",
-        handle_logs_descriptor_agent_failure
-    )
+    metadata = log_insights.get("metadata", parsed_metadata)
+    logger.info(f"Extrahované metadáta: {metadata}")
+    description = log_insights["description"]
     logger.info(f"Popis logov: {description.description}")
 
     # Klasifikácia logov
@@ -107,18 +325,43 @@ def detect_brute_force_in_logs(logs_to_process: str,
         preprocessed_metadata = preprocess_metadata(metadata)
         preprocessed_description = preprocess_description(description)
 
-        # Vyvolanie Klasifikačného agenta
-        classification_result = safe_agent_invoke(
-            logs_classifier_agent,
+        # Inicializácia Klasifikačného agenta podľa veľkosti vstupu
+        if verdict_only:
+            template, agent_type = LOGS_VERDICT_TEMPLATE, "logs_verdict_agent"
+            spawn_agent = spawn_logs_verdict_agent
+        else:
+            template, agent_type = (LOGS_CLASSIFIER_TEMPLATE,
+                                    "logs_classifier_agent")
+            spawn_agent = spawn_logs_classifier_agent
+        classifier_ctx, classifier_predict, classifier_input = plan_request(
+            template,
             {
                 "logs": logs_to_process,
                 "logs_metadata": preprocessed_metadata,
                 "logs_description": preprocessed_description
             },
+            agent_type, "klasifikácia výsledkov")
+        logs_classifier_agent = spawn_agent(
+            spawn_logs_analysis_client(num_epochs, classifier_ctx,
+                                       classifier_predict))
+
+        # Vyvolanie Klasifikačného agenta
+        classification_result = safe_agent_invoke(
+            logs_classifier_agent,
+            classifier_input,
             "klasifikácia výsledkov",
             handle_logs_classifier_agent_failure
         )
 
+        if verdict_only:
+            # Uloženie vstupu klasifikátora pre dodatočné vysvetlenie
+            classification_result = with_deferred_reason(
+                classification_result, LogsAnalysisResult)
+            store_prompt(item_id, "logs", num_epochs,
+                         {key: classifier_input[key]
+                          for key in LOGS_CLASSIFIER_INPUTS},
+                         classification_result.bruteforce)
+
         # Zaznamenanie času spracovania
         end_time = time.time()
         processing_time = end_time - start_time
@@ -133,9 +376,83 @@ def detect_brute_force_in_logs(logs_to_process: str,
         return handle_logs_classifier_agent_failure()
 
 
+@retry_on_failure(max_retries=2)
+def detect_brute_force_in_logs_single_pass(
+        logs_to_process: str,
+        num_epochs: int) -> LogsAnalysisResult:
+    """
+    Detekuje útoky hrubou silou v logových súboroch jednou požiadavkou.
+
+    Jednoprechodový variant detect_brute_force_in_logs. Namiesto troch
+    agentov, z ktorých každý dostane celé logy, použije Kombinovaného
+    agenta pre logy, ktorý v jednej odpovedi vráti metadáta, popis aktivity
+    aj klasifikáciu:
+    1. validuje vstupné dáta,
+    2. inicializuje LLM API klienta a agenta,
+    3. extrahuje metadáta, popíše aktivitu a klasifikuje logy.
+
+    Parametre:
+        logs_to_process (str): Logové záznamy na analýzu
+        num_epochs (int): Počet epoch ladenia LLM pre bruteLlama3B
+
+    Návratová hodnota:
+        LogsAnalysisResult: Výsledok klasifikácie s indikátormi útoku
+    """
+    # Spustenie časomiery
+    start_time = time.time()
+    logger.info("Inicializujem jednoprechodovú detekciu brute force útokov "
+                "v logoch...")
+
+    # Validácia vstupných dát
+    validation_result, validation_reason = validate_input_data(logs_to_process)
+    if not validation_result:
+        logger.error(f"Neplatné vstupné logy: {validation_reason}")
+        return handle_logs_classifier_agent_failure()
+    logger.info("Vstupné logy sú validné.")
+
+    # Inicializácia LLM klienta a agenta podľa veľkosti vstupu
+    num_ctx, num_predict, input_data = plan_request(
+        LOGS_COMBINED_TEMPLATE, {"input": logs_to_process},
+        "logs_combined_agent", "jednoprechodová analýza logov")
+    llm_client = spawn_logs_analysis_client(num_epochs, num_ctx, num_predict)
+    logs_combined_agent = spawn_logs_combined_agent(llm_client)
+    logger.info("Kombinovaný agent úspešne inicializovaný")
+
+    # Vyvolanie Kombinovaného agenta
+    combined_result = safe_agent_invoke(
+        logs_combined_agent,
+        input_data,
+        "jednoprechodová analýza logov",
+        handle_logs_combined_agent_failure
+    )
+    metadata = combined_result.model_dump(
+        include={"duration", "attacker", "service"})
+    logger.info(f"Extrahované metadáta: {metadata}")
+    logger.info(f"Popis logov: {combined_result.description}")
+
+    # Výsledok klasifikácie bez metadát a popisu
+    classification_result = LogsAnalysisResult(
+        bruteforce=combined_result.bruteforce,
+        system_compromised=combined_result.system_compromised,
+        reason=combined_result.reason
+    )
+
+    # Zaznamenanie času spracovania
+    processing_time = time.time() - start_time
+    logger.info(f"Analýza dokončená za {processing_time:.2f} sekúnd")
+    logger.info(f"Výsledok: {classification_result}")
+
+    return classification_result
+
+
 @retry_on_failure(max_retries=2)
 def detect_brute_force_in_flow(flow_to_process: str,
-                               num_epochs: int) -> FlowAnalysisResult:
+                               num_epochs: int,
+                               early_exit: bool = False,
+                               complete_positive_reason: bool = False,
+                               verdict_only: bool = False,
+                               item_id: Optional[str] = None
+                               ) -> FlowAnalysisResult:
     """
     Detekuje útoky hrubou silou v tokoch paketov. Implementuje metódu
     analýzy tokov paketov (kapitola 2.1).
@@ -145,9 +462,23 @@ def detect_brute_force_in_flow(flow_to_process: str,
     1. validuje vstupné dáta,
     2. klasifikuje, či došlo k útoku hrubou silou.
 
+    Pri early_exit sa výstup agenta číta prúdovo a výsledok sa vráti hneď,
+    ako model rozhodne pole 'bruteforce' (pozri safe_agent_stream_verdict),
+    čas analýzy toku je tak časom do verdiktu namiesto času do úplného
+    zdôvodnenia.
+
+    Pri verdict_only agent zdôvodnenie vôbec negeneruje (má prednosť pred
+    early_exit) a vstup agenta sa uloží pod item_id do úložiska vstupov,
+    zdôvodnenie je možné vytvoriť neskôr funkciou explain.
+
     Parametre:
         flow_to_process (str): Toky paketov na analýzu
         num_epochs (int): Počet epoch ladenia LLM pre secLlama3B
+        early_exit (bool): Či ukončiť generovanie po rozhodnutí verdiktu
+        complete_positive_reason (bool): Či pri early_exit dogenerovať
+            zdôvodnenie pozitívnych tokov na pozadí
+        verdict_only (bool): Či klasifikovať bez zdôvodnenia
+        item_id (Optional[str]): Identifikátor položky v úložisku vstupov
 
     Návratová hodnota:
         FlowAnalysisResult: Výsledok klasifikácie s indikátormi útoku
@@ -163,25 +494,53 @@ def detect_brute_force_in_flow(flow_to_process: str,
         return handle_flow_classifier_agent_failure()
     logger.info("Vstupné dáta sú validné.")
 
-    # Inicializácia LLM klienta
-    if num_epochs > 0:
-        llm_client = spawn_secllama_client(num_epochs)
+    # Inicializácia LLM klienta podľa veľkosti vstupu
+    if verdict_only:
+        template, agent_type = FLOW_VERDICT_TEMPLATE, "flow_verdict_agent"
     else:
-        llm_client = spawn_llama3_client()
+        template, agent_type = (FLOW_CLASSIFIER_TEMPLATE,
+                                "flow_classifier_agent")
+    num_ctx, num_predict, input_data = plan_request(
+        template, {"flow_data": flow_to_process},
+        agent_type, "klasifikácia toku paketov")
+    llm_client = spawn_flow_analysis_client(num_epochs, num_ctx, num_predict)
     logger.info("LLM klient pre flow analýzu úspešne inicializovaný")
 
-    # Inicializácia LLM agenta
-    netflow_classifier_agent = spawn_flow_classifier_agent(llm_client)
-    logger.info("Klasifikačný agent úspešne inicializovaný")
-
     try:
-        # Vyvolanie Klasifikačného agenta
-        classification_result = safe_agent_invoke(
-            netflow_classifier_agent,
-            {"flow_data": flow_to_process},
-            "klasifikácia toku paketov",
-            handle_flow_classifier_agent_failure
-        )
+        if verdict_only:
+            # Vyvolanie Klasifikačného agenta iba s verdiktom a uloženie
+            # vstupu pre dodatočné vysvetlenie
+            classification_result = with_deferred_reason(safe_agent_invoke(
+                spawn_flow_verdict_agent(llm_client),
+                input_data,
+                "klasifikácia toku paketov",
+                handle_flow_classifier_agent_failure
+            ), FlowAnalysisResult)
+            store_prompt(item_id, "flow", num_epochs, input_data,
+                         classification_result.bruteforce)
+        elif early_exit:
+            # Prúdové vyvolanie Klasifikačného agenta do rozhodnutia
+            # verdiktu
+            netflow_classifier_agent = spawn_flow_stream_classifier_agent(
+                llm_client)
+            classification_result = safe_agent_stream_verdict(
+                netflow_classifier_agent,
+                input_data,
+                "klasifikácia toku paketov",
+                handle_flow_classifier_agent_failure,
+                FlowAnalysisResult,
+                complete_reason=complete_positive_reason
+            )
+        else:
+            # Vyvolanie Klasifikačného agenta
+            netflow_classifier_agent = spawn_flow_classifier_agent(
+                llm_client)
+            classification_result = safe_agent_invoke(
+                netflow_classifier_agent,
+                input_data,
+                "klasifikácia toku paketov",
+                handle_flow_classifier_agent_failure
+            )
 
         # Zaznamenanie času spracovania
         end_time = time.time()
@@ -197,3 +556,187 @@ def detect_brute_force_in_flow(flow_to_process: str,
         logger.error(f"Neočakávaná chyba počas klasifikácie: {e}")
         # Vrátenie predvoleného bezpečného výsledku v prípade chyby
         return handle_flow_classifier_agent_failure()
+
+
+@retry_on_failure(max_retries=2)
+async def adetect_brute_force_in_flow(
+        flow_to_process: str,
+        num_epochs: int,
+        timeout: Optional[float] = None,
+        early_exit: bool = False,
+        complete_positive_reason: bool = False,
+        verdict_only: bool = False,
+        item_id: Optional[str] = None) -> FlowAnalysisResult:
+    """
+    Asynchrónne detekuje útoky hrubou silou v tokoch paketov.
+
+    Asynchrónny variant detect_brute_force_in_flow s rovnakým agentom
+    a rovnakou systémovou inštrukciou. Agent sa vyvolá cez ainvoke(),
+    vďaka čomu môže viacero tokov čakať na odpoveď servera súčasne.
+    Pri early_exit sa výstup číta prúdovo do rozhodnutia verdiktu
+    (pozri safe_agent_astream_verdict), pri verdict_only sa zdôvodnenie
+    negeneruje (pozri explain).
+
+    Parametre:
+        flow_to_process (str): Toky paketov na analýzu
+        num_epochs (int): Počet epoch ladenia LLM pre secLlama3B
+        timeout (Optional[float]): Časový limit požiadavky v sekundách
+        early_exit (bool): Či ukončiť generovanie po rozhodnutí verdiktu
+        complete_positive_reason (bool): Či pri early_exit dogenerovať
+            zdôvodnenie pozitívnych tokov na pozadí
+        verdict_only (bool): Či klasifikovať bez zdôvodnenia
+        item_id (Optional[str]): Identifikátor položky v úložisku vstupov
+
+    Návratová hodnota:
+        FlowAnalysisResult: Výsledok klasifikácie s indikátormi útoku
+    """
+    # Spustenie časomiery
+    start_time = time.time()
+
+    # Validácia vstupných dát
+    validation_result, validation_reason = validate_input_data(flow_to_process)
+    if not validation_result:
+        logger.error(f"Neplatné vstupné dáta: {validation_reason}")
+        return handle_flow_classifier_agent_failure()
+
+    # Inicializácia LLM klienta a agenta (zdieľané, pozri get_cached_agent)
+    if verdict_only:
+        template, agent_type = FLOW_VERDICT_TEMPLATE, "flow_verdict_agent"
+    else:
+        template, agent_type = (FLOW_CLASSIFIER_TEMPLATE,
+                                "flow_classifier_agent")
+    num_ctx, num_predict, input_data = plan_request(
+        template, {"flow_data": flow_to_process},
+        agent_type, "klasifikácia toku paketov")
+    llm_client = spawn_flow_analysis_client(num_epochs, num_ctx, num_predict)
+
+    if verdict_only:
+        # Asynchrónne vyvolanie agenta iba s verdiktom a uloženie vstupu
+        # pre dodatočné vysvetlenie
+        classification_result = with_deferred_reason(
+            await safe_agent_ainvoke(
+                spawn_flow_verdict_agent(llm_client),
+                input_data,
+                "klasifikácia toku paketov",
+                handle_flow_classifier_agent_failure,
+                timeout=timeout
+            ), FlowAnalysisResult)
+        store_prompt(item_id, "flow", num_epochs, input_data,
+                     classification_result.bruteforce)
+    elif early_exit:
+        # Asynchrónne prúdové vyvolanie do rozhodnutia verdiktu
+        classification_result = await safe_agent_astream_verdict(
+            spawn_flow_stream_classifier_agent(llm_client),
+            input_data,
+            "klasifikácia toku paketov",
+            handle_flow_classifier_agent_failure,
+            FlowAnalysisResult,
+            complete_reason=complete_positive_reason,
+            timeout=timeout
+        )
+    else:
+        # Asynchrónne vyvolanie Klasifikačného agenta
+        classification_result = await safe_agent_ainvoke(
+            spawn_flow_classifier_agent(llm_client),
+            input_data,
+            "klasifikácia toku paketov",
+            handle_flow_classifier_agent_failure,
+            timeout=timeout
+        )
+
+    # Zaznamenanie času spracovania
+    processing_time = time.time() - start_time
+    logger.info(
+        f"Analýza toku paketov dokončená za {processing_time:.2f} sekúnd"
+    )
+    logger.info(f"Výsledok: {classification_result}")
+
+    return classification_result
+
+
+@retry_on_failure(max_retries=2)
+def detect_brute_force_in_flow_batch(
+        flows_to_process: str,
+        row_indexes: List[Any],
+        num_epochs: int) -> Dict[Any, FlowAnalysisResult]:
+    """
+    Detekuje útoky hrubou silou v dávke tokov paketov jedným volaním LLM.
+
+    Dávkový variant detect_brute_force_in_flow. Systémová inštrukcia
+    sa posiela raz pre celú dávku tokov (pozri pack_rows_by_token_budget)
+    a agent vráti výsledok pre každý tok podľa jeho pôvodného indexu:
+    1. validuje vstupné dáta,
+    2. klasifikuje všetky toky dávky,
+    3. priradí výsledky k indexom riadkov.
+
+    Parametre:
+        flows_to_process (str): Dávka tokov paketov na analýzu vo formáte
+            parse_chunk_to_string
+        row_indexes (List[Any]): Pôvodné indexy riadkov v dávke
+        num_epochs (int): Počet epoch ladenia LLM pre secLlama3B
+
+    Návratová hodnota:
+        Dict[Any, FlowAnalysisResult]: Výsledok klasifikácie pre každý
+            index riadku. Tokom bez výsledku od agenta sa priradí
+            predvolená bezpečná klasifikácia.
+    """
+    # Spustenie časomiery
+    start_time = time.time()
+    logger.info(f"Inicializujem detekciu brute force útokov v dávke "
+                f"{len(row_indexes)} tokov paketov...")
+
+    # Validácia vstupných dát
+    validation_result, validation_reason = validate_input_data(
+        flows_to_process)
+    if not validation_result:
+        logger.error(f"Neplatné vstupné dáta: {validation_reason}")
+        return {index: handle_flow_classifier_agent_failure()
+                for index in row_indexes}
+    logger.info("Vstupné dáta sú validné.")
+
+    # Inicializácia LLM klienta podľa veľkosti dávky
+    num_ctx, num_predict, input_data = plan_request(
+        FLOW_BATCH_CLASSIFIER_TEMPLATE, {"flow_data": flows_to_process},
+        "flow_batch_classifier_agent", "dávková klasifikácia tokov paketov")
+    llm_client = spawn_flow_analysis_client(num_epochs, num_ctx, num_predict)
+    logger.info("LLM klient pre flow analýzu úspešne inicializovaný")
+
+    # Inicializácia LLM agenta
+    batch_classifier_agent = spawn_flow_batch_classifier_agent(llm_client)
+    logger.info("Dávkový klasifikačný agent úspešne inicializovaný")
+
+    # Vyvolanie Dávkového klasifikačného agenta
+    batch_result = safe_agent_invoke(
+        batch_classifier_agent,
+        input_data,
+        "dávková klasifikácia tokov paketov",
+        handle_flow_batch_classifier_agent_failure
+    )
+
+    # Priradenie výsledkov k indexom riadkov podľa textovej reprezentácie
+    expected = {str(index): index for index in row_indexes}
+    results: Dict[Any, FlowAnalysisResult] = {}
+    for verdict in batch_result.verdicts:
+        index = expected.get(str(verdict.row))
+        if index is None:
+            logger.warning(f"Agent vrátil výsledok pre neznámy riadok "
+                           f"{verdict.row}, ignorujem ho")
+            continue
+        # Pri opakovanom výsledku pre rovnaký riadok platí prvý
+        results.setdefault(index, FlowAnalysisResult(
+            bruteforce=verdict.bruteforce, reason=verdict.reason))
+
+    missing = [index for index in row_indexes if index not in results]
+    if missing:
+        logger.warning(f"Agent nevrátil výsledok pre riadky: {missing}")
+        for index in missing:
+            results[index] = handle_flow_classifier_agent_failure()
+
+    # Zaznamenanie času spracovania
+    processing_time = time.time() - start_time
+    logger.info(
+        f"Analýza dávky tokov paketov dokončená za {processing_time:.2f} "
+        f"sekúnd"
+    )
+
+    return {index: results[index] for index in row_indexes}
@@ -0,0 +1,235 @@
+"""
+Tento modul poskytuje úložisko vstupov agentov pre dodatočné vysvetlenia.
+
+Pri analýze iba s verdiktmi (verdict_only) sa zdôvodnenie negeneruje.
+Vstup agenta sa namiesto toho uloží pod identifikátorom položky (napr.
+"chunk_17" alebo názov log súboru) a zdôvodnenie je možné vytvoriť
+neskôr funkciou explain (src/llm/flows.py) - iba pre označené položky
+alebo na požiadanie.
+
+Ukladá sa iba premenná časť promptu (vstupy použité šablónou agenta),
+komprimovaná zlib, statické inštrukcie sú v šablónach agentov.
+
+Identifikátory položiek sa v ďalšom behu opakujú, úložisko preto drží
+iba vstupy posledného behu analýzy - pred každým behom ho vyprázdni
+start_prompt_store_run.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Nastavenie loggingu
+logger = logging.getLogger(__name__)
+
+# Cesta k databáze úložiska v pamäti (úložisko zanikne s procesom)
+IN_MEMORY_PROMPT_STORE = ":memory:"
+
+# Aktívne úložisko vstupov (None = úložisko je vypnuté)
+_prompt_store: Optional["PromptStore"] = None
+
+
+class PromptStore:
+    """
+    Úložisko komprimovaných vstupov agentov v SQLite databáze.
+
+    Úložisko je možné používať z viacerých vlákien.
+
+    Parametre:
+        path (Union[str, Path]): Cesta k súboru SQLite databázy alebo
+            IN_MEMORY_PROMPT_STORE
+    """
+
+    def __init__(self, path: Union[str, Path] = IN_MEMORY_PROMPT_STORE):
+        self.path = str(path)
+        self._lock = threading.Lock()
+
+        if self.path != IN_MEMORY_PROMPT_STORE:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path,
+                                           check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS prompts ("
+            "item_id TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+            "num_epochs INTEGER NOT NULL, input BLOB NOT NULL, "
+            "flagged INTEGER NOT NULL)"
+        )
+        self._connection.commit()
+
+    def put(self, item_id: str, kind: str, num_epochs: int,
+            input_data: Dict[str, Any], flagged: bool) -> None:
+        """
+        Uloží vstup agenta pre položku.
+
+        Parametre:
+            item_id (str): Identifikátor položky
+            kind (str): Druh položky ("flow" alebo "logs")
+            num_epochs (int): Počet epoch ladenia modelu analýzy
+            input_data (Dict[str, Any]): Vstupné dáta agenta
+            flagged (bool): Či bola položka označená ako útok
+        """
+        payload = zlib.compress(json.dumps(
+            input_data, ensure_ascii=False, default=str).encode("utf-8"))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO prompts "
+                "(item_id, kind, num_epochs, input, flagged) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (item_id, kind, num_epochs, payload, int(flagged)))
+            self._connection.commit()
+
+    def get(self, item_id: str) -> Optional[Tuple[str, int, Dict[str, Any]]]:
+        """
+        Vráti uložený vstup agenta pre položku.
+
+        Parametre:
+            item_id (str): Identifikátor položky
+
+        Návratová hodnota:
+            Optional[Tuple[str, int, Dict[str, Any]]]: Druh položky, počet
+            epoch ladenia modelu a vstupné dáta agenta, None ak položka
+            nie je uložená
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT kind, num_epochs, input FROM prompts "
+                "WHERE item_id = ?", (item_id,)).fetchone()
+        if row is None:
+            return None
+
+        kind, num_epochs, payload = row
+        return kind, num_epochs, json.loads(zlib.decompress(payload))
+
+    def flagged_items(self) -> List[str]:
+        """
+        Vráti identifikátory položiek označených ako útok.
+
+        Návratová hodnota:
+            List[str]: Identifikátory v poradí uloženia
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT item_id FROM prompts WHERE flagged = 1 "
+                "ORDER BY rowid").fetchall()
+        return [item_id for item_id, in rows]
+
+    def clear(self) -> None:
+        """
+        Odstráni všetky uložené vstupy.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM prompts")
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM prompts").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Zatvorí spojenie s databázou.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+def store_prompt(item_id: Optional[str], kind: str, num_epochs: int,
+                 input_data: Dict[str, Any], flagged: bool) -> None:
+    """
+    Uloží vstup agenta do aktívneho úložiska.
+
+    Parametre:
+        item_id (Optional[str]): Identifikátor položky (None = neukladá sa)
+        kind (str): Druh položky ("flow" alebo "logs")
+        num_epochs (int): Počet epoch ladenia modelu analýzy
+        input_data (Dict[str, Any]): Vstupné dáta agenta
+        flagged (bool): Či bola položka označená ako útok
+    """
+    store = _prompt_store
+    if store is None or item_id is None:
+        return
+
+    try:
+        store.put(item_id, kind, num_epochs, input_data, flagged)
+    except Exception as e:
+        # Chyba úložiska nesmie prerušiť analýzu
+        logger.warning(f"Chyba pri ukladaní vstupu položky {item_id}: {e}")
+
+
+def start_prompt_store_run() -> None:
+    """
+    Pripraví aktívne úložisko na nový beh analýzy.
+
+    Odstráni vstupy predchádzajúceho behu, aby explain_flagged
+    nevysvetľoval položky, ktoré v aktuálnom behu neboli analyzované.
+    """
+    store = _prompt_store
+    if store is None:
+        return
+
+    stale = len(store)
+    store.clear()
+    if stale:
+        logger.info(f"Úložisko vstupov agentov: odstránených {stale} "
+                    f"položiek predchádzajúceho behu")
+
+
+def get_prompt_store() -> Optional[PromptStore]:
+    """
+    Vráti aktívne úložisko vstupov.
+
+    Návratová hodnota:
+        Optional[PromptStore]: Aktívne úložisko alebo None, ak je vypnuté
+    """
+    return _prompt_store
+
+
+def log_prompt_store_stats() -> None:
+    """
+    Zaloguje počet uložených a označených položiek aktívneho úložiska.
+    """
+    store = _prompt_store
+    if store is None or not len(store):
+        return
+
+    logger.info(
+        f"Úložisko vstupov agentov: {len(store)} položiek, "
+        f"{len(store.flagged_items())} označených ako útok - zdôvodnenie "
+        f"vytvorí explain(item_id) alebo explain_flagged() "
+        f"(src/llm/flows.py)"
+    )
+
+
+def enable_prompt_store(path: Union[str, Path] = IN_MEMORY_PROMPT_STORE
+                        ) -> PromptStore:
+    """
+    Zapne úložisko vstupov agentov.
+
+    Parametre:
+        path (Union[str, Path]): Cesta k súboru SQLite databázy alebo
+            IN_MEMORY_PROMPT_STORE
+
+    Návratová hodnota:
+        PromptStore: Aktívne úložisko
+    """
+    global _prompt_store
+    disable_prompt_store()
+    _prompt_store = PromptStore(path)
+    logger.info(f"Úložisko vstupov agentov: {path} ({len(_prompt_store)} "
+                f"uložených položiek)")
+    return _prompt_store
+
+
+def disable_prompt_store() -> None:
+    """
+    Vypne úložisko vstupov a zatvorí jeho databázu.
+    """
+    global _prompt_store
+    store, _prompt_store = _prompt_store, None
+    if store is not None:
+        store.close()
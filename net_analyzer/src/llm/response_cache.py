@@ -0,0 +1,310 @@
+"""
+Tento modul poskytuje perzistentnú cache odpovedí LLM agentov.
+
+Odpovede sa ukladajú do SQLite databázy pod kľúčom odvodeným z identity
+agenta (model, parametre vzorkovania, typ agenta, hash šablóny a schéma
+výstupu - pozri src/llm/agents.py) a presného vstupu agenta. Opakované
+vyhodnotenie s rovnakým modelom a vstupmi tak nemusí znovu volať LLM.
+
+Cache je platná iba vtedy, keď model pre rovnaký vstup vracia rovnakú
+odpoveď - preto ju odporúčame používať s deterministickým režimom klientov
+(pozri set_deterministic_mode v src/llm/api_clients.py).
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from langchain.schema.runnable import Runnable
+
+from src.system_core import data_models
+
+# Nastavenie loggingu
+logger = logging.getLogger(__name__)
+
+# Predvolená doba platnosti odpovede v cache (s)
+RESPONSE_CACHE_TTL = 7 * 24 * 3600.0
+# Predvolený maximálny počet odpovedí v cache (staršie sa vyraďujú LRU)
+RESPONSE_CACHE_MAX_ENTRIES = 100000
+# Kľúč metadát agenta, pod ktorým je uložená jeho identita pre cache
+RESPONSE_CACHE_METADATA_KEY = "response_cache_identity"
+
+# Aktívna cache odpovedí (None = cache je vypnutá)
+_response_cache: Optional["ResponseCache"] = None
+
+
+class ResponseCache:
+    """
+    Perzistentná cache odpovedí LLM agentov v SQLite databáze.
+
+    Odpoveď je platná RESPONSE_CACHE_TTL sekúnd od uloženia. Pri prekročení
+    maximálneho počtu záznamov sa vyraďujú najdlhšie nepoužité odpovede
+    (LRU). Cache je možné používať z viacerých vlákien.
+
+    Parametre:
+        path (Union[str, Path]): Cesta k súboru SQLite databázy
+        ttl_seconds (Optional[float]): Doba platnosti odpovede v sekundách,
+            None pre neobmedzenú platnosť
+        max_entries (int): Maximálny počet odpovedí v cache
+    """
+
+    def __init__(self, path: Union[str, Path],
+                 ttl_seconds: Optional[float] = RESPONSE_CACHE_TTL,
+                 max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0,
+                      "evictions": 0}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path),
+                                           check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, schema TEXT NOT NULL, "
+            "value TEXT NOT NULL, created_at REAL NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access "
+            "ON responses (last_access)"
+        )
+        self._connection.commit()
+        self._size = self._connection.execute(
+            "SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        """
+        Vráti odpoveď uloženú pod kľúčom.
+
+        Parametre:
+            key (str): Kľúč odpovede (pozri response_cache_key)
+
+        Návratová hodnota:
+            Optional[BaseModel]: Uložená odpoveď alebo None, ak v cache
+            nie je alebo jej vypršala platnosť
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT schema, value, created_at FROM responses "
+                "WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            schema_name, value, created_at = row
+            if (self.ttl_seconds is not None
+                    and now - created_at > self.ttl_seconds):
+                # Odpoveď s vypršanou platnosťou sa odstráni
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,))
+                self._connection.commit()
+                self._size -= 1
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            # Aktualizácia času posledného použitia pre LRU
+            self._connection.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (now, key))
+            self._connection.commit()
+            self.stats["hits"] += 1
+
+        return getattr(data_models, schema_name).model_validate_json(value)
+
+    def put(self, key: str, response: BaseModel) -> None:
+        """
+        Uloží odpoveď agenta pod kľúčom.
+
+        Parametre:
+            key (str): Kľúč odpovede (pozri response_cache_key)
+            response (BaseModel): Štruktúrovaný výstup agenta
+        """
+        now = time.time()
+        with self._lock:
+            exists = self._connection.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, schema, value, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, type(response).__name__, response.model_dump_json(),
+                 now, now))
+            if exists is None:
+                self._size += 1
+            self.stats["writes"] += 1
+
+            # Vyradenie najdlhšie nepoužitých odpovedí nad limit
+            excess = self._size - self.max_entries
+            if excess > 0:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM "
+                    "responses ORDER BY last_access LIMIT ?)", (excess,))
+                self._size -= excess
+                self.stats["evictions"] += excess
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        """
+        Zatvorí spojenie s databázou.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+def response_cache_key(identity: str, input_data: dict) -> str:
+    """
+    Vytvorí kľúč odpovede z identity agenta a jeho vstupu.
+
+    Parametre:
+        identity (str): Identita agenta (pozri get_agent_identity)
+        input_data (dict): Vstupné dáta agenta
+
+    Návratová hodnota:
+        str: SHA-256 hash identity a vstupu
+    """
+    payload = json.dumps([identity, input_data], sort_keys=True,
+                         ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def read_agent_identity(agent: Runnable) -> Optional[str]:
+    """
+    Vráti identitu agenta pre cache odpovedí.
+
+    Identitu nastavuje get_cached_agent do metadát agenta. Agenti bez
+    identity sa do cache neukladajú.
+
+    Parametre:
+        agent (Runnable): LLM agent
+
+    Návratová hodnota:
+        Optional[str]: Identita agenta alebo None
+    """
+    config = getattr(agent, "config", None) or {}
+    return (config.get("metadata") or {}).get(RESPONSE_CACHE_METADATA_KEY)
+
+
+def lookup_response(agent: Runnable, input_data: dict
+                    ) -> Tuple[Optional[str], Optional[BaseModel]]:
+    """
+    Vyhľadá odpoveď agenta v aktívnej cache odpovedí.
+
+    Parametre:
+        agent (Runnable): LLM agent
+        input_data (dict): Vstupné dáta agenta
+
+    Návratová hodnota:
+        Tuple[Optional[str], Optional[BaseModel]]: Kľúč odpovede (None, ak
+        je cache vypnutá alebo agent nemá identitu) a uložená odpoveď
+        (None pri chýbajúcej odpovedi)
+    """
+    cache = _response_cache
+    identity = read_agent_identity(agent)
+    if cache is None or identity is None:
+        return None, None
+
+    key = response_cache_key(identity, input_data)
+    try:
+        return key, cache.get(key)
+    except Exception as e:
+        # Chyba cache nesmie prerušiť analýzu
+        logger.warning(f"Chyba pri čítaní z cache odpovedí: {e}")
+        return None, None
+
+
+def store_response(key: Optional[str], response: Any) -> None:
+    """
+    Uloží odpoveď agenta do aktívnej cache odpovedí.
+
+    Parametre:
+        key (Optional[str]): Kľúč z lookup_response (None = neukladá sa)
+        response (Any): Štruktúrovaný výstup agenta
+    """
+    cache = _response_cache
+    if cache is None or key is None or not isinstance(response, BaseModel):
+        return
+
+    try:
+        cache.put(key, response)
+    except Exception as e:
+        logger.warning(f"Chyba pri zápise do cache odpovedí: {e}")
+
+
+def enable_response_cache(path: Union[str, Path],
+                          ttl_seconds: Optional[float] = RESPONSE_CACHE_TTL,
+                          max_entries: int = RESPONSE_CACHE_MAX_ENTRIES
+                          ) -> ResponseCache:
+    """
+    Zapne perzistentnú cache odpovedí LLM agentov.
+
+    Parametre:
+        path (Union[str, Path]): Cesta k súboru SQLite databázy
+        ttl_seconds (Optional[float]): Doba platnosti odpovede v sekundách
+        max_entries (int): Maximálny počet odpovedí v cache
+
+    Návratová hodnota:
+        ResponseCache: Aktívna cache odpovedí
+    """
+    global _response_cache
+    disable_response_cache()
+    _response_cache = ResponseCache(path, ttl_seconds, max_entries)
+    logger.info(f"Cache odpovedí LLM: {path} ({len(_response_cache)} "
+                f"uložených odpovedí)")
+    return _response_cache
+
+
+def disable_response_cache() -> None:
+    """
+    Vypne cache odpovedí a zatvorí jej databázu.
+    """
+    global _response_cache
+    cache, _response_cache = _response_cache, None
+    if cache is not None:
+        cache.close()
+
+
+def get_response_cache_stats() -> Dict[str, int]:
+    """
+    Vráti štatistiky aktívnej cache odpovedí.
+
+    Návratová hodnota:
+        Dict[str, int]: Počet zásahov ('hits'), chýbajúcich odpovedí
+        ('misses'), odpovedí s vypršanou platnosťou ('expired'), zápisov
+        ('writes') a vyradených odpovedí ('evictions'). Prázdny slovník,
+        ak je cache vypnutá.
+    """
+    cache = _response_cache
+    return dict(cache.stats) if cache is not None else {}
+
+
+def log_response_cache_stats() -> None:
+    """
+    Zaloguje štatistiky aktívnej cache odpovedí.
+    """
+    stats = get_response_cache_stats()
+    if not stats:
+        return
+
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+    logger.info(
+        f"Cache odpovedí: {stats['hits']} zásahov, {stats['misses']} "
+        f"chýbajúcich ({hit_rate:.1f} %), {stats['expired']} neplatných, "
+        f"{stats['writes']} zápisov, {stats['evictions']} vyradených"
+    )
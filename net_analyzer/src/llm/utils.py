@@ -2,14 +2,28 @@
 Pomocné funkcie pre llm balík.
 """
 
+import asyncio
 import logging
+import random
+import re
+import threading
 import time
-from typing import Tuple, Any, Callable
+from typing import (
+    Tuple, Any, Callable, Iterable, Iterator, List, Optional, Set, Type
+)
 from functools import wraps
+from pydantic import BaseModel
 from langchain.schema.runnable import Runnable
+from langchain_core.runnables import RunnableLambda
 
 from src.system_core.data_models import LogsMetadata, LogsDescription
 from src.system_core.exceptions import AgentInitializationError
+from src.llm.response_cache import lookup_response, store_response
+from src.llm.circuit_breaker import (
+    get_circuit_breaker,
+    is_model_not_found_error,
+    is_retryable_error
+)
 
 # Nastavenie loggera pre tento modul
 logger = logging.getLogger(__name__)
@@ -17,8 +31,26 @@ logger = logging.getLogger(__name__)
 # Konfigurácia pre robustnosť
 # Maximálny počet opakovaní pri zlyhaní agenta
 MAX_RETRIES = 2
-# Časový interval medzi opakovanými pokusmi v sekundách
+# Základný časový interval medzi opakovanými pokusmi v sekundách
+# (s každým ďalším pokusom sa zdvojnásobuje)
 RETRY_DELAY = 2.0
+# Maximálny časový interval medzi opakovanými pokusmi v sekundách
+RETRY_MAX_DELAY = 30.0
+
+# Priemerný počet znakov na jeden token pre odhad veľkosti promptu
+CHARS_PER_TOKEN = 4
+
+# Zdôvodnenie výsledku, ktorého verdikt bol prečítaný z prúdu výstupu
+# skôr, než model vygeneroval zdôvodnenie
+STREAMED_VERDICT_REASON = (
+    "Verdict read from the streamed output before the reason was generated."
+)
+
+# Vlákna a úlohy dokončujúce zdôvodnenia na pozadí
+# (pozri safe_agent_stream_verdict)
+_background_threads: Set[threading.Thread] = set()
+_background_tasks: Set[asyncio.Task] = set()
+_background_lock = threading.Lock()
 
 
 def validate_input_data(data: str) -> Tuple[bool, str]:
@@ -48,13 +80,40 @@ def validate_input_data(data: str) -> Tuple[bool, str]:
     return True, ""
 
 
+def record_request_error(error: BaseException) -> None:
+    """
+    Zaznamená chybu požiadavky na LLM server do zdieľaného ističa.
+
+    Dočasné chyby (nedostupný server, časový limit) a chýbajúci model
+    sa počítajú ako zlyhanie - server nemôže požiadavku vybaviť a istič
+    po opakovaných zlyhaniach ďalšie požiadavky odmietne. Pri ostatných
+    fatálnych chybách (napr. neplatný výstup modelu) server odpovedal,
+    preto sa zaznamenajú ako odpoveď servera.
+
+    Parametre:
+        error (BaseException): Výnimka vyvolaná požiadavkou
+    """
+    breaker = get_circuit_breaker()
+    if is_retryable_error(error) or is_model_not_found_error(error):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
 def safe_agent_invoke(agent: Runnable, input_data: dict, operation_name: str,
                       recovery_function: Callable) -> Any:
     """
     Robustným spôsobom vyvolá LLM agenta.
 
     Táto funkcia zabezpečuje spoľahlivú komunikáciu s LLM agentmi pomocou
-    robustného mechanizmu obnovy v prípade chyby.
+    robustného mechanizmu obnovy v prípade chyby. Ak je zapnutá cache
+    odpovedí (src/llm/response_cache.py), uložená odpoveď agenta sa vráti
+    bez volania LLM a úspešné odpovede sa do cache ukladajú. Výsledky
+    recovery funkcie sa neukladajú.
+
+    Výsledok požiadavky sa zaznamená do zdieľaného ističa
+    (src/llm/circuit_breaker.py). Kým je istič otvorený, agent sa
+    nevolá a okamžite sa vráti výsledok recovery funkcie.
 
     Parametre:
         agent (Runnable): AI agent objekt s invoke() metódou
@@ -69,8 +128,27 @@ def safe_agent_invoke(agent: Runnable, input_data: dict, operation_name: str,
         # Logovanie začiatku operácie
         logger.info(f"Spúšťam {operation_name}...")
 
+        # Vyhľadanie uloženej odpovede agenta
+        cache_key, cached = lookup_response(agent, input_data)
+        if cached is not None:
+            logger.info(f"{operation_name}: použitá odpoveď z cache")
+            return cached
+
+        # Otvorený istič - server je nedostupný, agent sa nevolá
+        breaker = get_circuit_breaker()
+        if not breaker.allow_request():
+            logger.info(f"{operation_name}: istič LLM servera je "
+                        f"otvorený, používam mechanizmus obnovy")
+            return recovery_function()
+
         # Vyvolanie agenta s vstupnými dátami
-        result = agent.invoke(input_data)
+        try:
+            result = agent.invoke(input_data)
+        except Exception as e:
+            record_request_error(e)
+            raise
+        breaker.record_success()
+        store_response(cache_key, result)
 
         # Logovanie úspechu
         logger.info(f"{operation_name} úspešne dokončená")
@@ -84,6 +162,456 @@ def safe_agent_invoke(agent: Runnable, input_data: dict, operation_name: str,
         return recovery_function()
 
 
+async def safe_agent_ainvoke(agent: Runnable, input_data: dict,
+                             operation_name: str,
+                             recovery_function: Callable,
+                             timeout: Optional[float] = None) -> Any:
+    """
+    Robustným spôsobom asynchrónne vyvolá LLM agenta.
+
+    Asynchrónny variant safe_agent_invoke. Agent sa vyvolá cez ainvoke(),
+    takže čakanie na odpoveď servera neblokuje ostatné požiadavky
+    v event loope. Prekročenie časového limitu sa spracuje rovnako ako
+    chyba agenta - zavolá sa recovery funkcia. Cache odpovedí a istič sa
+    používajú rovnako ako v safe_agent_invoke.
+
+    Parametre:
+        agent (Runnable): AI agent objekt s ainvoke() metódou
+        input_data (dict): Vstupné dáta pre agenta vo forme slovníka
+        operation_name (str): Popisný názov operácie pre účely loggingu
+        recovery_function (Callable): Funkcia volaná pri chybe agenta
+        timeout (Optional[float]): Časový limit požiadavky v sekundách,
+            None pre požiadavku bez limitu
+
+    Návratová hodnota:
+        Any: Výsledok úspešného vyvolania agenta alebo recovery funkcie
+    """
+    try:
+        # Logovanie začiatku operácie
+        logger.info(f"Spúšťam {operation_name}...")
+
+        # Vyhľadanie uloženej odpovede agenta
+        cache_key, cached = lookup_response(agent, input_data)
+        if cached is not None:
+            logger.info(f"{operation_name}: použitá odpoveď z cache")
+            return cached
+
+        # Otvorený istič - server je nedostupný, agent sa nevolá
+        breaker = get_circuit_breaker()
+        if not breaker.allow_request():
+            logger.info(f"{operation_name}: istič LLM servera je "
+                        f"otvorený, používam mechanizmus obnovy")
+            return recovery_function()
+
+        # Asynchrónne vyvolanie agenta s časovým limitom
+        try:
+            result = await asyncio.wait_for(agent.ainvoke(input_data),
+                                            timeout)
+        except Exception as e:
+            record_request_error(e)
+            raise
+        breaker.record_success()
+        store_response(cache_key, result)
+
+        # Logovanie úspechu
+        logger.info(f"{operation_name} úspešne dokončená")
+        # Vrátenie výsledku agenta
+        return result
+
+    except asyncio.TimeoutError:
+        # Prekročený časový limit - spustenie mechanizmu obnovy
+        logger.error(f"Chyba pri {operation_name}: prekročený časový limit "
+                     f"{timeout} s")
+        logger.info(f"Používam mechanizmus obnovy pre {operation_name}")
+        return recovery_function()
+
+    except Exception as e:
+        # Logovanie chyby a spustenie mechanizmu obnovy
+        logger.error(f"Chyba pri {operation_name}: {e}")
+        logger.info(f"Používam mechanizmus obnovy pre {operation_name}")
+        return recovery_function()
+
+
+def parse_streamed_verdict(text: str, field: str) -> Optional[bool]:
+    """
+    Prečíta booleovský verdikt z neúplného JSON výstupu modelu.
+
+    Parametre:
+        text (str): Doteraz vygenerovaný text výstupu
+        field (str): Názov booleovského poľa verdiktu
+
+    Návratová hodnota:
+        Optional[bool]: Hodnota poľa alebo None, ak ešte nie je rozhodnutá
+    """
+    match = re.search(rf'"{re.escape(field)}"\s*:\s*(true|false)', text)
+    return None if match is None else match.group(1) == "true"
+
+
+def _streamed_result(text: str, schema: Type[BaseModel], field: str,
+                     verdict: Optional[bool]) -> BaseModel:
+    # Úplný výstup sa parsuje celý, pri skoršom ukončení sa výsledok
+    # vytvorí z verdiktu
+    if verdict is None:
+        return schema.model_validate_json(text)
+    return schema(**{field: verdict, "reason": STREAMED_VERDICT_REASON})
+
+
+def _complete_reason(stream: Iterator, text: str, result: BaseModel,
+                     schema: Type[BaseModel], operation_name: str) -> None:
+    # Dočítanie prúdu a doplnenie zdôvodnenia do už vráteného výsledku
+    try:
+        for chunk in stream:
+            text += chunk.content
+        result.reason = schema.model_validate_json(text).reason
+        logger.info(f"{operation_name}: zdôvodnenie - {result.reason}")
+    except Exception as e:
+        logger.warning(f"{operation_name}: zdôvodnenie sa nepodarilo "
+                       f"dokončiť: {e}")
+    finally:
+        stream.close()
+        with _background_lock:
+            _background_threads.discard(threading.current_thread())
+
+
+async def _acomplete_reason(stream: Any, text: str, result: BaseModel,
+                            schema: Type[BaseModel],
+                            operation_name: str) -> None:
+    # Asynchrónny variant _complete_reason
+    try:
+        async for chunk in stream:
+            text += chunk.content
+        result.reason = schema.model_validate_json(text).reason
+        logger.info(f"{operation_name}: zdôvodnenie - {result.reason}")
+    except Exception as e:
+        logger.warning(f"{operation_name}: zdôvodnenie sa nepodarilo "
+                       f"dokončiť: {e}")
+    finally:
+        await stream.aclose()
+
+
+def safe_agent_stream_verdict(agent: Runnable, input_data: dict,
+                              operation_name: str,
+                              recovery_function: Callable,
+                              schema: Type[BaseModel],
+                              field: str = "bruteforce",
+                              complete_reason: bool = False) -> BaseModel:
+    """
+    Robustným spôsobom vyvolá prúdového agenta a vráti výsledok hneď,
+    ako je rozhodnutý verdikt.
+
+    Výstup agenta (pozri spawn_flow_stream_classifier_agent) sa číta po
+    častiach. Keď je v JSON výstupe rozhodnuté booleovské pole verdiktu,
+    prúd sa zatvorí - server preruší generovanie zdôvodnenia - a vráti
+    sa výsledok so zdôvodnením STREAMED_VERDICT_REASON. Pri complete_reason
+    sa zdôvodnenie pozitívneho verdiktu dogeneruje vo vlákne na pozadí
+    a doplní do vráteného výsledku (pozri wait_for_background_reasons).
+
+    Chyby a istič sa spracujú rovnako ako v safe_agent_invoke. Cache
+    odpovedí sa nepoužíva, pretože výsledok nemusí obsahovať zdôvodnenie.
+
+    Parametre:
+        agent (Runnable): Prúdový agent s metódou stream()
+        input_data (dict): Vstupné dáta pre agenta vo forme slovníka
+        operation_name (str): Popisný názov operácie pre účely loggingu
+        recovery_function (Callable): Funkcia volaná pri chybe agenta
+        schema (Type[BaseModel]): Schéma výstupu s poliami field a 'reason'
+        field (str): Názov booleovského poľa verdiktu
+        complete_reason (bool): Či dogenerovať zdôvodnenie pozitívneho
+            verdiktu na pozadí
+
+    Návratová hodnota:
+        BaseModel: Výsledok agenta alebo recovery funkcie
+    """
+    logger.info(f"Spúšťam {operation_name} (prúdovo)...")
+
+    # Otvorený istič - server je nedostupný, agent sa nevolá
+    breaker = get_circuit_breaker()
+    if not breaker.allow_request():
+        logger.info(f"{operation_name}: istič LLM servera je "
+                    f"otvorený, používam mechanizmus obnovy")
+        return recovery_function()
+
+    stream = agent.stream(input_data)
+    text, verdict = "", None
+    try:
+        # Čítanie výstupu po častiach, kým nie je verdikt rozhodnutý
+        for chunk in stream:
+            text += chunk.content
+            verdict = parse_streamed_verdict(text, field)
+            if verdict is not None:
+                break
+        breaker.record_success()
+        result = _streamed_result(text, schema, field, verdict)
+    except Exception as e:
+        record_request_error(e)
+        stream.close()
+        logger.error(f"Chyba pri {operation_name}: {e}")
+        logger.info(f"Používam mechanizmus obnovy pre {operation_name}")
+        return recovery_function()
+
+    if verdict and complete_reason:
+        # Zdôvodnenie pozitívneho verdiktu sa dogeneruje na pozadí
+        thread = threading.Thread(
+            target=_complete_reason,
+            args=(stream, text, result, schema, operation_name),
+            daemon=True)
+        with _background_lock:
+            _background_threads.add(thread)
+        thread.start()
+    else:
+        stream.close()
+
+    logger.info(f"{operation_name} úspešne dokončená")
+    return result
+
+
+async def safe_agent_astream_verdict(agent: Runnable, input_data: dict,
+                                     operation_name: str,
+                                     recovery_function: Callable,
+                                     schema: Type[BaseModel],
+                                     field: str = "bruteforce",
+                                     complete_reason: bool = False,
+                                     timeout: Optional[float] = None
+                                     ) -> BaseModel:
+    """
+    Asynchrónny variant safe_agent_stream_verdict.
+
+    Zdôvodnenie pozitívneho verdiktu sa pri complete_reason dogeneruje
+    v úlohe event loopu (pozri await_background_reasons). Prekročenie
+    časového limitu čítania verdiktu sa spracuje ako chyba agenta.
+
+    Parametre:
+        agent (Runnable): Prúdový agent s metódou astream()
+        input_data (dict): Vstupné dáta pre agenta vo forme slovníka
+        operation_name (str): Popisný názov operácie pre účely loggingu
+        recovery_function (Callable): Funkcia volaná pri chybe agenta
+        schema (Type[BaseModel]): Schéma výstupu s poliami field a 'reason'
+        field (str): Názov booleovského poľa verdiktu
+        complete_reason (bool): Či dogenerovať zdôvodnenie pozitívneho
+            verdiktu na pozadí
+        timeout (Optional[float]): Časový limit čítania verdiktu
+            v sekundách, None pre požiadavku bez limitu
+
+    Návratová hodnota:
+        BaseModel: Výsledok agenta alebo recovery funkcie
+    """
+    logger.info(f"Spúšťam {operation_name} (prúdovo)...")
+
+    # Otvorený istič - server je nedostupný, agent sa nevolá
+    breaker = get_circuit_breaker()
+    if not breaker.allow_request():
+        logger.info(f"{operation_name}: istič LLM servera je "
+                    f"otvorený, používam mechanizmus obnovy")
+        return recovery_function()
+
+    stream = agent.astream(input_data)
+
+    async def read_verdict() -> Tuple[str, Optional[bool]]:
+        # Čítanie výstupu po častiach, kým nie je verdikt rozhodnutý
+        text = ""
+        async for chunk in stream:
+            text += chunk.content
+            verdict = parse_streamed_verdict(text, field)
+            if verdict is not None:
+                return text, verdict
+        return text, None
+
+    try:
+        text, verdict = await asyncio.wait_for(read_verdict(), timeout)
+        breaker.record_success()
+        result = _streamed_result(text, schema, field, verdict)
+    except Exception as e:
+        record_request_error(e)
+        await stream.aclose()
+        logger.error(f"Chyba pri {operation_name}: {e}")
+        logger.info(f"Používam mechanizmus obnovy pre {operation_name}")
+        return recovery_function()
+
+    if verdict and complete_reason:
+        # Zdôvodnenie pozitívneho verdiktu sa dogeneruje na pozadí
+        task = asyncio.create_task(_acomplete_reason(
+            stream, text, result, schema, operation_name))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    else:
+        await stream.aclose()
+
+    logger.info(f"{operation_name} úspešne dokončená")
+    return result
+
+
+def wait_for_background_reasons(timeout: Optional[float] = None) -> None:
+    """
+    Počká na dokončenie zdôvodnení generovaných vo vláknach na pozadí.
+
+    Parametre:
+        timeout (Optional[float]): Maximálny čas čakania na každé vlákno
+            v sekundách, None pre neobmedzené čakanie
+    """
+    with _background_lock:
+        threads = list(_background_threads)
+    for thread in threads:
+        thread.join(timeout)
+
+
+async def await_background_reasons() -> None:
+    """
+    Počká na dokončenie zdôvodnení generovaných v úlohách event loopu.
+
+    Volá sa pred zatvorením asynchrónnych klientov (aclose_clients).
+    """
+    if _background_tasks:
+        await asyncio.gather(*list(_background_tasks),
+                             return_exceptions=True)
+
+
+def safe_agent_runnable(agent: Runnable, operation_name: str,
+                        recovery_function: Callable) -> Runnable:
+    """
+    Obalí LLM agenta do Runnable s robustným vyvolaním.
+
+    Vrátený Runnable volá agenta cez safe_agent_invoke (resp.
+    safe_agent_ainvoke pri asynchrónnom volaní), takže chyba agenta
+    vráti výsledok recovery funkcie namiesto výnimky. Takto obalených
+    agentov je možné spúšťať súbežne (napr. v RunnableParallel) bez toho,
+    aby zlyhanie jedného agenta ovplyvnilo ostatných.
+
+    Parametre:
+        agent (Runnable): AI agent objekt s invoke() metódou
+        operation_name (str): Popisný názov operácie pre účely loggingu
+        recovery_function (Callable): Funkcia volaná pri chybe agenta
+
+    Návratová hodnota:
+        Runnable: Agent s mechanizmom obnovy
+    """
+    def invoke(input_data: dict) -> Any:
+        return safe_agent_invoke(agent, input_data, operation_name,
+                                 recovery_function)
+
+    async def ainvoke(input_data: dict) -> Any:
+        return await safe_agent_ainvoke(agent, input_data, operation_name,
+                                        recovery_function)
+
+    return RunnableLambda(invoke, afunc=ainvoke, name=operation_name)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Odhadne počet tokenov textu pre plánovanie kontextového okna.
+
+    Odhad je založený na priemernom počte znakov na token a je zámerne
+    zaokrúhlený nahor, keďže tokenizér modelu nie je lokálne dostupný.
+
+    Parametre:
+        text (str): Text na odhad
+
+    Návratová hodnota:
+        int: Odhadovaný počet tokenov
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_token_budget(text: str, max_tokens: int) -> Tuple[str, int]:
+    """
+    Skráti text po riadkoch tak, aby sa zmestil do rozpočtu tokenov.
+
+    Zachová sa začiatok a koniec textu (pri logoch priebeh pokusov aj ich
+    výsledok) a vynechané riadky v strede nahradí jeden označujúci riadok.
+    Ak sa do rozpočtu nezmestí ani prvý či posledný riadok, text sa
+    skráti po znakoch vo vnútri riadku.
+
+    Parametre:
+        text (str): Text na skrátenie
+        max_tokens (int): Rozpočet tokenov
+
+    Návratová hodnota:
+        Tuple[str, int]: Skrátený text a počet vynechaných (aj čiastočne)
+        riadkov
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text, 0
+
+    lines = text.splitlines()
+    budget = max(max_tokens * CHARS_PER_TOKEN // 2, 1)
+    head: List[str] = []
+    tail: List[str] = []
+    head_chars = tail_chars = 0
+
+    # Striedavé pridávanie riadkov zo začiatku a z konca textu
+    start, end = 0, len(lines) - 1
+    while start <= end:
+        if head_chars + len(lines[start]) + 1 > budget:
+            break
+        head_chars += len(lines[start]) + 1
+        head.append(lines[start])
+        start += 1
+        if start > end or tail_chars + len(lines[end]) + 1 > budget:
+            break
+        tail_chars += len(lines[end]) + 1
+        tail.append(lines[end])
+        end -= 1
+
+    if not head and not tail:
+        # Ani jeden celý riadok sa nezmestí - skrátenie vo vnútri riadku
+        cut_end = len(text) - budget
+        omitted = text.count("\n", budget, cut_end) + 1
+        marker = f"[... {cut_end - budget} characters omitted ...]"
+        return text[:budget] + marker + text[cut_end:], omitted
+
+    omitted = end - start + 1
+    marker = [f"[... {omitted} lines omitted ...]"] if omitted > 0 else []
+    return "\n".join(head + marker + tail[::-1]), omitted
+
+
+def pack_rows_by_token_budget(
+    rows: Iterable[Tuple[Any, str]],
+    header: str,
+    max_tokens: int,
+    output_tokens_per_row: int = 0,
+    max_output_tokens: Optional[int] = None
+) -> Iterator[Tuple[List[Any], str]]:
+    """
+    Rozdelí textové riadky do dávok, ktoré sa zmestia do rozpočtu tokenov.
+
+    Každá dávka začína hlavičkou a obsahuje čo najviac riadkov tak, aby
+    odhad tokenov vstupu spolu s rezervou pre výstup (output_tokens_per_row
+    na každý riadok) neprekročil max_tokens. Dávka má vždy aspoň jeden
+    riadok, aj keď by sám rozpočet prekročil.
+
+    Parametre:
+        rows (Iterable[Tuple[Any, str]]): Dvojice (index riadku, text riadku)
+        header (str): Hlavička opakovaná na začiatku každej dávky
+        max_tokens (int): Rozpočet tokenov pre vstup a výstup jednej dávky
+        output_tokens_per_row (int): Rezerva tokenov výstupu na riadok
+        max_output_tokens (Optional[int]): Limit tokenov výstupu jednej dávky
+            (napr. num_predict). Predvolené: None (bez limitu)
+
+    Návratová hodnota:
+        Iterator[Tuple[List[Any], str]]: Indexy riadkov dávky a text dávky
+    """
+    header_tokens = estimate_tokens(header)
+    indexes: List[Any] = []
+    lines: List[str] = [header]
+    used_tokens = header_tokens
+
+    for index, row in rows:
+        row_tokens = estimate_tokens(row) + 1 + output_tokens_per_row
+        over_budget = used_tokens + row_tokens > max_tokens
+        over_output = (max_output_tokens is not None and
+                       (len(indexes) + 1) * output_tokens_per_row
+                       > max_output_tokens)
+        if indexes and (over_budget or over_output):
+            yield indexes, "\n".join(lines)
+            indexes, lines, used_tokens = [], [header], header_tokens
+
+        indexes.append(index)
+        lines.append(row)
+        used_tokens += row_tokens
+
+    if indexes:
+        yield indexes, "\n".join(lines)
+
+
 def preprocess_metadata(metadata: LogsMetadata) -> str:
     """
     Úpraví výstup Extraktora metadát do formy vhodnej pre
@@ -118,13 +646,39 @@ def preprocess_description(description: LogsDescription) -> str:
     return description.model_dump_json().replace('{', '{{').replace("}", "}}")
 
 
+def backoff_delay(attempt: int, delay: float = RETRY_DELAY,
+                  max_delay: float = RETRY_MAX_DELAY) -> float:
+    """
+    Vypočíta čakanie pred ďalším pokusom.
+
+    Čakanie sa s každým pokusom zdvojnásobuje až po max_delay a náhodne
+    sa rozptýli v druhej polovici intervalu, aby súbežní volajúci
+    neopakovali požiadavky v rovnakom okamihu.
+
+    Parametre:
+        attempt (int): Poradové číslo neúspešného pokusu (od 0)
+        delay (float): Základné čakanie v sekundách
+        max_delay (float): Maximálne čakanie v sekundách
+
+    Návratová hodnota:
+        float: Čakanie v sekundách
+    """
+    ceiling = min(max_delay, delay * 2 ** attempt)
+    return random.uniform(ceiling / 2, ceiling)
+
+
 def retry_on_failure(max_retries: int = MAX_RETRIES,
                      delay: float = RETRY_DELAY) -> Callable:
     """
     Dekorátor pre automatické opakovanie neúspešných operácií.
 
     Implementuje stratégiu pre zotavenie sa z dočasných chýb.
-    Užitočné pre API volania a nestabilné sieťové operácie.
+    Užitočné pre API volania a nestabilné sieťové operácie. Čakanie medzi
+    pokusmi rastie exponenciálne s náhodným rozptylom (pozri
+    backoff_delay). Fatálne chyby (chýbajúci model, neplatný výstup -
+    pozri is_retryable_error) sa neopakujú. Asynchrónne funkcie sa
+    dekorujú asynchrónnym wrapperom, ktorý medzi pokusmi neblokuje
+    event loop.
 
     Parametre:
         max_retries (int): Maximálny počet pokusov
@@ -137,6 +691,52 @@ def retry_on_failure(max_retries: int = MAX_RETRIES,
         AgentInitializationError: Ak všetky pokusy zlyhajú
     """
     def decorator(func: Callable) -> Callable:
+        def retry_wait(attempt: int, error: Exception) -> Optional[float]:
+            # Čakanie pred ďalším pokusom, None ak sa už neopakuje
+
+            # Fatálna chyba - opakovanie nepomôže
+            if not is_retryable_error(error):
+                logger.error(
+                    f"Fatálna chyba v {func.__name__}, "
+                    f"neopakujem: {error}"
+                )
+                raise AgentInitializationError() from error
+
+            # Ak nie je posledný pokus, čakaj a opakuj
+            if attempt < max_retries:
+                wait = backoff_delay(attempt, delay)
+                logger.warning(
+                    f"Pokus {attempt + 1}/{max_retries + 1} pre "
+                    f"{func.__name__} neúspešný: {error}. "
+                    f"Opakujem za {wait:.1f}s..."
+                )
+                return wait
+
+            # Všetky pokusy vyčerpané
+            logger.error(
+                f"Všetky pokusy pre {func.__name__} neúspešné. "
+                f"Posledná chyba: {error}"
+            )
+            return None
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+
+                # Vykonávaj opakované pokusy
+                for attempt in range(max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        wait = retry_wait(attempt, e)
+                        if wait is not None:
+                            await asyncio.sleep(wait)
+
+                # Ak všetky pokusy zlyhali, vyvolaj špecializovanú výnimku
+                raise AgentInitializationError()
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
 
@@ -145,21 +745,9 @@ def retry_on_failure(max_retries: int = MAX_RETRIES,
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
-
-                    # Ak nie je posledný pokus, čakaj a opakuj
-                    if attempt < max_retries:
-                        logger.warning(
-                            f"Pokus {attempt + 1}/{max_retries + 1} pre "
-                            f"{func.__name__} neúspešný: {e}. "
-                            f"Opakujem za {delay}s..."
-                        )
-                        time.sleep(delay)
-                    else:
-                        # Všetky pokusy vyčerpané
-                        logger.error(
-                            f"Všetky pokusy pre {func.__name__} neúspešné. "
-                            f"Posledná chyba: {e}"
-                        )
+                    wait = retry_wait(attempt, e)
+                    if wait is not None:
+                        time.sleep(wait)
 
             # Ak všetky pokusy zlyhali, vyvolaj špecializovanú výnimku
             raise AgentInitializationError()
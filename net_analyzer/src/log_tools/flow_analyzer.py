@@ -5,13 +5,19 @@ na časti, detekciu útokov hrubou silou pomocou LLM analýzy
 a výpočet výkonnostných metrík (presnosť, citlivosť, F1 skóre).
 """
 
+import asyncio
 import logging
-from typing import Callable
+from collections import deque
+from typing import (
+    Any, Callable, Deque, Dict, Hashable, Iterator, Optional, Tuple, Union
+)
 from pandas import DataFrame
 
 from src.data_processing.utils import (
-    chunk_dataset,
-    parse_chunk_to_string
+    iter_dataset_records,
+    parse_record_to_string,
+    render_rows,
+    RECORD_BLOCK_ROWS
 )
 from src.log_tools.utils import (
     print_progress_report,
@@ -19,19 +25,59 @@ from src.log_tools.utils import (
     print_final_report,
     evaluate_result
 )
-from src.llm.flows import detect_brute_force_in_flow
+from src.llm.flows import (
+    adetect_brute_force_in_flow,
+    detect_brute_force_in_flow,
+    detect_brute_force_in_flow_batch
+)
+from src.llm.agents import (
+    FLOW_BATCH_CLASSIFIER_TEMPLATE,
+    get_agent_cache_stats,
+    log_agent_cache_stats
+)
+from src.llm.api_clients import (
+    DEFAULT_NUM_CTX,
+    DEFAULT_NUM_PREDICT,
+    aclose_clients
+)
+from src.llm.utils import (
+    await_background_reasons,
+    estimate_tokens,
+    pack_rows_by_token_budget,
+    wait_for_background_reasons
+)
+from src.log_tools.flow_verdict_cache import FlowVerdictCache
+from src.llm.prompt_store import start_prompt_store_run, store_prompt
 from src.system_core.data_models import AnalysisState
 
 # Nastavenie logovania pre tento modul
 logger = logging.getLogger(__name__)
 
+# Rezerva výstupných tokenov na jeden tok pri dávkovej analýze
+# (jeden výsledok {"row", "bruteforce", "reason"} s krátkym zdôvodnením)
+FLOW_BATCH_OUTPUT_TOKENS_PER_ROW = 64
+
+# Časový limit jednej požiadavky na LLM pri asynchrónnej analýze (s)
+FLOW_REQUEST_TIMEOUT = 300.0
+# Počet rozpracovaných tokov pri asynchrónnej analýze ako násobok počtu
+# súbežných požiadaviek (obmedzuje pamäť pri veľkých datasetoch)
+FLOW_ASYNC_WINDOW_FACTOR = 4
+
 
 def analyze_flow(dataset: DataFrame, unlabel_dataset: Callable,
-                 get_label: Callable, num_epochs: int = 8) -> AnalysisState:
+                 get_label: Callable, num_epochs: int = 8,
+                 packing: bool = False,
+                 concurrency: Optional[int] = None,
+                 signature_buckets: Optional[
+                     Dict[str, Union[float, str]]] = None,
+                 early_exit: bool = False,
+                 complete_positive_reasons: bool = False,
+                 verdict_only: bool = False) -> AnalysisState:
     """
     Analyzuje toky paketov pomocou LLM technológie.
 
-    Funkcia rozdelí dataset na jednotlivé časti (jeden záznam = jedna časť),
+    Funkcia prechádza dataset po jednotlivých záznamoch (jeden záznam = jedna
+    časť) bez vytvárania jednoriadkových DataFrame objektov,
     odstráni štítky pre objektívnu analýzu, konvertuje každý záznam
     do textovej formy a použije LLM na detekciu útokov hrubou silou. Výsledky
     sa vyhodnocujú proti skutočnej hodnote získanej zo štítkov a počítajú sa
@@ -53,19 +99,78 @@ def analyze_flow(dataset: DataFrame, unlabel_dataset: Callable,
         unlabel_dataset (Callable): Funkcia na odstránenie štítkov z datasetu
         get_label (Callable): Funkcia na získanie štítku pre daný záznam
         num_epochs (int): Počet epoch ladenia pre LLM analýzu (predvolene 8)
+        packing (bool): Či analyzovať toky v dávkach naplnených podľa
+            kontextového okna namiesto jedného volania LLM na tok
+            (predvolene False). Voľby concurrency, signature_buckets,
+            early_exit, complete_positive_reasons a verdict_only sa pri
+            dávkovej analýze nepoužijú, pre každú zadanú voľbu sa zaloguje
+            upozornenie.
+        concurrency (Optional[int]): Počet súbežných požiadaviek na LLM.
+            Hodnota väčšia ako 1 spustí asynchrónnu analýzu
+            (analyze_flow_async), None alebo 1 analyzuje toky postupne.
+            Pri dávkovej analýze sa nepoužíva (zaloguje sa upozornenie).
+        signature_buckets (Optional[Dict[str, Union[float, str]]]): Pravidlá
+            kvantizácie tokov pre cache výsledkov takmer zhodných tokov
+            (FlowVerdictCache). Tok so signatúrou, ktorá už bola
+            analyzovaná, prevezme jej výsledok bez volania LLM. None cache
+            vypne. Pri dávkovej analýze sa nepoužíva.
+        early_exit (bool): Či ukončiť generovanie odpovede hneď po
+            rozhodnutí verdiktu 'bruteforce' (pozri
+            detect_brute_force_in_flow). Pri dávkovej analýze sa
+            nepoužíva.
+        complete_positive_reasons (bool): Či pri early_exit dogenerovať
+            zdôvodnenia pozitívnych tokov na pozadí. Analýza na ne počká
+            pred finálnym zhrnutím.
+        verdict_only (bool): Či klasifikovať toky bez zdôvodnenia. Vstupy
+            analyzovaných tokov sa uložia do úložiska vstupov pod
+            identifikátorom "chunk_<číslo>" a zdôvodnenie je možné
+            vytvoriť neskôr (pozri explain v src/llm/flows.py). Pri
+            dávkovej analýze sa nepoužíva.
 
     Návratová hodnota:
         AnalysisState: Finálny stav analýzy obsahujúci všetky metriky
     """
-    # Rozdelenie datasetu na jednotlivé záznamy
+    verdict_cache = (FlowVerdictCache(signature_buckets)
+                     if signature_buckets is not None else None)
+    # Úložisko vstupov drží iba položky tohto behu
+    start_prompt_store_run()
+
+    if concurrency is not None and concurrency > 1 and not packing:
+        return asyncio.run(analyze_flow_async(
+            dataset, unlabel_dataset, get_label, num_epochs, concurrency,
+            verdict_cache=verdict_cache, early_exit=early_exit,
+            complete_positive_reasons=complete_positive_reasons,
+            verdict_only=verdict_only))
+
+    if packing:
+        if concurrency is not None and concurrency > 1:
+            logger.warning(f"Dávková analýza tokov posiela dávky postupne, "
+                           f"súbežnosť {concurrency} sa nepoužije")
+        # Voľby analýzy jednotlivých tokov, ktoré dávková analýza nepozná
+        ignored_options = {
+            "signature_buckets": signature_buckets is not None,
+            "early_exit": early_exit,
+            "complete_positive_reasons": complete_positive_reasons,
+            "verdict_only": verdict_only,
+        }
+        for option, enabled in ignored_options.items():
+            if enabled:
+                logger.warning(f"Dávková analýza tokov nepodporuje voľbu "
+                               f"{option}, voľba sa nepoužije")
+        return analyze_flow_packed(dataset, unlabel_dataset, get_label,
+                                   num_epochs)
+
+    # Prúdové prechádzanie datasetu po jednotlivých záznamoch
     # Toto umožňuje detailnú analýzu každého sieťového toku
-    dataset_chunks = chunk_dataset(dataset, max_logs_per_chunk=1)
-    total_chunks = len(dataset_chunks)
-    logger.info(f"Dataset rozdelený na {total_chunks} chunk-ov")
+    dataset_chunks = iter_dataset_records(dataset, label_column="Label")
+    total_chunks = len(dataset)
+    logger.info(f"Dataset obsahuje {total_chunks} záznamov na analýzu")
 
     print("Začína sa analýza...")
     # Inicializácia stavu analýzy s nulovými hodnotami
     analysis_state = AnalysisState()
+    # Štatistiky cache agentov pred analýzou pre výpis za tento beh
+    agent_cache_before = get_agent_cache_stats()
 
     # Spracovanie každého záznamu jednotlivo
     for i, chunk in enumerate(dataset_chunks, start=1):
@@ -76,12 +181,28 @@ def analyze_flow(dataset: DataFrame, unlabel_dataset: Callable,
             # Odstránenie štítku pre objektívnu analýzu
             unlabeled_chunk = unlabel_dataset(chunk, label_column="Label")
 
-            # Konverzia záznamu do textovej formy pre LLM analýzu
-            chunk_string = parse_chunk_to_string(unlabeled_chunk)
+            # Výsledok takmer zhodného toku, ak už bol analyzovaný
+            result_of_analysis = None
+            if verdict_cache is not None:
+                signature = verdict_cache.signature(unlabeled_chunk)
+                result_of_analysis = verdict_cache.get(signature)
 
-            # Detekcia útokov hrubou silou pomocou LLM
-            result_of_analysis = detect_brute_force_in_flow(
-                chunk_string, num_epochs)
+            if result_of_analysis is None:
+                # Konverzia záznamu do textovej formy pre LLM analýzu
+                chunk_string = parse_record_to_string(unlabeled_chunk)
+
+                # Detekcia útokov hrubou silou pomocou LLM
+                result_of_analysis = detect_brute_force_in_flow(
+                    chunk_string, num_epochs, early_exit,
+                    complete_positive_reasons, verdict_only, f"chunk_{i}")
+                if verdict_cache is not None:
+                    verdict_cache.put(signature, result_of_analysis)
+            elif verdict_only:
+                # Tok prevzatý z cache potrebuje vlastný vstup pre explain
+                store_prompt(f"chunk_{i}", "flow", num_epochs,
+                             {"flow_data": parse_record_to_string(
+                                 unlabeled_chunk)},
+                             result_of_analysis.bruteforce)
 
             malicious = get_label(chunk)
 
@@ -99,8 +220,277 @@ def analyze_flow(dataset: DataFrame, unlabel_dataset: Callable,
             print(f"Chyba pri spracovaní chunk-u {i}: {e}")
             continue
 
+    # Dokončenie zdôvodnení pozitívnych tokov generovaných na pozadí
+    wait_for_background_reasons()
+
     # Zobrazenie finálnej správy s výsledkami analýzy
     print_final_report(analysis_state)
     logger.info("Analýza sieťových tokov dokončená")
+    log_agent_cache_stats(total_chunks, agent_cache_before)
+    if verdict_cache is not None:
+        verdict_cache.log_stats()
+
+    return analysis_state
+
+
+async def analyze_flow_async(dataset: DataFrame, unlabel_dataset: Callable,
+                             get_label: Callable, num_epochs: int = 8,
+                             concurrency: int = 4,
+                             timeout: Optional[float] = FLOW_REQUEST_TIMEOUT,
+                             verdict_cache: Optional[FlowVerdictCache] = None,
+                             early_exit: bool = False,
+                             complete_positive_reasons: bool = False,
+                             verdict_only: bool = False
+                             ) -> AnalysisState:
+    """
+    Asynchrónne analyzuje toky paketov s viacerými súbežnými požiadavkami.
+
+    Asynchrónny variant analyze_flow pre Ollama server, ktorý spracováva
+    viacero požiadaviek naraz (OLLAMA_NUM_PARALLEL > 1). Toky sa
+    klasifikujú rovnakým agentom ako pri postupnej analýze, počet
+    súbežných požiadaviek obmedzuje semafor. Výsledky sa vyhodnocujú
+    a progres sa vypisuje v pôvodnom poradí tokov, takže finálny stav
+    analýzy je zhodný s postupnou analýzou.
+
+    Po skončení analýzy sa zatvoria HTTP spojenia klientov, pretože
+    asynchrónny HTTP klient je viazaný na event loop analýzy.
+
+    Parametre:
+        dataset (DataFrame): Predspracovaný dataset obsahujúci sieťové toky
+        unlabel_dataset (Callable): Funkcia na odstránenie štítkov z datasetu
+        get_label (Callable): Funkcia na získanie štítku pre daný záznam
+        num_epochs (int): Počet epoch ladenia pre LLM analýzu (predvolene 8)
+        concurrency (int): Maximálny počet súbežných požiadaviek na LLM
+        timeout (Optional[float]): Časový limit jednej požiadavky
+            v sekundách, po jeho prekročení sa tok klasifikuje predvolenou
+            bezpečnou klasifikáciou
+        verdict_cache (Optional[FlowVerdictCache]): Cache výsledkov takmer
+            zhodných tokov. Takmer zhodné toky, ktoré sa ešte analyzujú,
+            čakajú na výsledok jedinej požiadavky.
+        early_exit (bool): Či ukončiť generovanie odpovede hneď po
+            rozhodnutí verdiktu 'bruteforce'
+        complete_positive_reasons (bool): Či pri early_exit dogenerovať
+            zdôvodnenia pozitívnych tokov na pozadí
+        verdict_only (bool): Či klasifikovať toky bez zdôvodnenia
+
+    Návratová hodnota:
+        AnalysisState: Finálny stav analýzy obsahujúci všetky metriky
+    """
+    dataset_chunks = iter_dataset_records(dataset, label_column="Label")
+    total_chunks = len(dataset)
+    logger.info(f"Dataset obsahuje {total_chunks} záznamov na analýzu "
+                f"({concurrency} súbežných požiadaviek)")
+
+    print("Začína sa analýza...")
+    # Inicializácia stavu analýzy s nulovými hodnotami
+    analysis_state = AnalysisState()
+    # Štatistiky cache agentov pred analýzou pre výpis za tento beh
+    agent_cache_before = get_agent_cache_stats()
+    # Semafor obmedzujúci počet súbežných požiadaviek na server
+    semaphore = asyncio.Semaphore(concurrency)
+    # Rozpracované toky v pôvodnom poradí (číslo, záznam, signatúra,
+    # úloha alebo výsledok z cache, záznam bez štítku pre úložisko vstupov
+    # pri toku prevzatom z cache)
+    pending: Deque[Tuple[int, Any, Optional[Hashable], Any,
+                         Optional[Any]]] = deque()
+
+    async def classify(i: int, unlabeled_chunk: Any) -> Any:
+        # Konverzia záznamu bez štítku do textovej formy
+        chunk_string = parse_record_to_string(unlabeled_chunk)
+
+        # Detekcia útokov hrubou silou pomocou LLM
+        async with semaphore:
+            return await adetect_brute_force_in_flow(
+                chunk_string, num_epochs, timeout, early_exit,
+                complete_positive_reasons, verdict_only, f"chunk_{i}")
+
+    async def collect(state: AnalysisState) -> AnalysisState:
+        # Vyhodnotenie najstaršieho rozpracovaného toku
+        i, chunk, signature, task, cached_chunk = pending.popleft()
+        print_progress_report(i, total_chunks, f"chunk_{i}")
+
+        try:
+            result_of_analysis = (
+                await task if isinstance(task, asyncio.Future) else task)
+            if verdict_cache is not None:
+                # Nahradenie úlohy jej výsledkom
+                verdict_cache.put(signature, result_of_analysis)
+            if cached_chunk is not None:
+                # Tok prevzatý z cache potrebuje vlastný vstup pre explain
+                store_prompt(f"chunk_{i}", "flow", num_epochs,
+                             {"flow_data": parse_record_to_string(
+                                 cached_chunk)},
+                             result_of_analysis.bruteforce)
+            malicious = get_label(chunk)
+
+            # Vyhodnotenie výsledku proti štítkom a aktualizácia metrík
+            state = evaluate_result(
+                malicious, result_of_analysis.bruteforce, state
+            )
+
+            # Zobrazenie aktuálnych metrík po spracovaní záznamu
+            print_current_metrics(state)
+
+        except Exception as e:
+            # Zaznamenanie chyby a pokračovanie v spracovaní ďalších záznamov
+            logger.error(f"Chyba pri spracovaní chunk-u {i}: {e}")
+            print(f"Chyba pri spracovaní chunk-u {i}: {e}")
+            if verdict_cache is not None:
+                verdict_cache.discard(signature)
+
+        return state
+
+    try:
+        for i, chunk in enumerate(dataset_chunks, start=1):
+            # Odstránenie štítku pre objektívnu analýzu
+            unlabeled_chunk = unlabel_dataset(chunk, label_column="Label")
+
+            # Takmer zhodný tok už analyzovaný alebo práve analyzovaný
+            signature, task, cached_chunk = None, None, None
+            if verdict_cache is not None:
+                signature = verdict_cache.signature(unlabeled_chunk)
+                task = verdict_cache.get(signature)
+
+            if task is None:
+                task = asyncio.create_task(classify(i, unlabeled_chunk))
+                if verdict_cache is not None:
+                    verdict_cache.put(signature, task)
+            elif verdict_only:
+                cached_chunk = unlabeled_chunk
+            pending.append((i, chunk, signature, task, cached_chunk))
+            # Pri plnom okne sa najskôr vyhodnotí najstarší tok
+            if len(pending) >= concurrency * FLOW_ASYNC_WINDOW_FACTOR:
+                analysis_state = await collect(analysis_state)
+
+        while pending:
+            analysis_state = await collect(analysis_state)
+    finally:
+        # Zrušenie nedokončených úloh (napr. pri prerušení analýzy)
+        tasks = [task for _, _, _, task, _ in pending
+                 if isinstance(task, asyncio.Future)]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Dokončenie zdôvodnení pozitívnych tokov generovaných na pozadí
+        await await_background_reasons()
+        # Zatvorenie spojení viazaných na tento event loop
+        await aclose_clients()
+
+    # Zobrazenie finálnej správy s výsledkami analýzy
+    print_final_report(analysis_state)
+    logger.info("Asynchrónna analýza sieťových tokov dokončená")
+    log_agent_cache_stats(total_chunks, agent_cache_before)
+    if verdict_cache is not None:
+        verdict_cache.log_stats()
+
+    return analysis_state
+
+
+def iter_rendered_flows(dataset: DataFrame,
+                        unlabel_dataset: Callable) -> Iterator[Tuple[Any, str]]:
+    """
+    Postupne vytvorí textovú reprezentáciu tokov bez štítkov.
+
+    Dataset sa spracováva po blokoch, každý blok sa zbaví štítku
+    a prevedie vektorovo (render_rows), takže riadky sú zhodné
+    s parse_chunk_to_string.
+
+    Parametre:
+        dataset (DataFrame): Dataset so sieťovými tokmi a štítkami
+        unlabel_dataset (Callable): Funkcia na odstránenie štítkov z datasetu
+
+    Návratová hodnota:
+        Iterator[Tuple[Any, str]]: Dvojice (pôvodný index, text riadku)
+    """
+    for start in range(0, len(dataset), RECORD_BLOCK_ROWS):
+        block = unlabel_dataset(
+            dataset.iloc[start:start + RECORD_BLOCK_ROWS],
+            label_column="Label")
+        yield from zip(block.index, render_rows(block))
+
+
+def analyze_flow_packed(dataset: DataFrame, unlabel_dataset: Callable,
+                        get_label: Callable,
+                        num_epochs: int = 8) -> AnalysisState:
+    """
+    Analyzuje toky paketov v dávkach naplnených podľa kontextového okna.
+
+    Namiesto jedného volania LLM na tok sa do každej požiadavky vloží
+    toľko tokov, koľko sa zmestí do DEFAULT_NUM_CTX spolu so systémovou
+    inštrukciou a rezervou pre výstup (FLOW_BATCH_OUTPUT_TOKENS_PER_ROW
+    na tok, najviac DEFAULT_NUM_PREDICT). Agent vráti výsledok pre každý
+    tok podľa pôvodného indexu riadku a výsledky sa vyhodnocujú po
+    jednotlivých tokoch rovnako ako v analyze_flow.
+
+    Parametre:
+        dataset (DataFrame): Predspracovaný dataset obsahujúci sieťové toky
+        unlabel_dataset (Callable): Funkcia na odstránenie štítkov z datasetu
+        get_label (Callable): Funkcia na získanie štítku pre daný záznam
+        num_epochs (int): Počet epoch ladenia pre LLM analýzu (predvolene 8)
+
+    Návratová hodnota:
+        AnalysisState: Finálny stav analýzy obsahujúci všetky metriky
+    """
+    total_flows = len(dataset)
+    columns = unlabel_dataset(dataset.iloc[:0], label_column="Label").columns
+    header = f"Columns: {', '.join(columns.astype(str))}"
+
+    # Rozpočet tokenov dávky - kontextové okno bez systémovej inštrukcie
+    max_tokens = (DEFAULT_NUM_CTX -
+                  estimate_tokens(FLOW_BATCH_CLASSIFIER_TEMPLATE))
+    batches = pack_rows_by_token_budget(
+        iter_rendered_flows(dataset, unlabel_dataset),
+        header,
+        max_tokens,
+        output_tokens_per_row=FLOW_BATCH_OUTPUT_TOKENS_PER_ROW,
+        max_output_tokens=DEFAULT_NUM_PREDICT
+    )
+    # Štítky sa čítajú v rovnakom poradí ako riadky dávok
+    records = iter_dataset_records(dataset, label_column="Label")
+    logger.info(f"Dataset obsahuje {total_flows} záznamov na dávkovú "
+                f"analýzu (rozpočet {max_tokens} tokenov na dávku)")
+
+    print("Začína sa analýza...")
+    # Inicializácia stavu analýzy s nulovými hodnotami
+    analysis_state = AnalysisState()
+    # Štatistiky cache agentov pred analýzou pre výpis za tento beh
+    agent_cache_before = get_agent_cache_stats()
+    processed = 0
+
+    for batch_number, (row_indexes, batch_string) in enumerate(batches,
+                                                                start=1):
+        batch_records = [next(records) for _ in row_indexes]
+        processed += len(row_indexes)
+        # Zobrazenie pokroku spracovania po dávkach
+        print_progress_report(
+            processed, total_flows,
+            f"batch_{batch_number} ({len(row_indexes)} tokov)")
+
+        try:
+            # Detekcia útokov hrubou silou pre celú dávku jedným volaním
+            results = detect_brute_force_in_flow_batch(
+                batch_string, row_indexes, num_epochs)
+
+            # Vyhodnotenie výsledkov po jednotlivých tokoch
+            for record in batch_records:
+                malicious = get_label(record)
+                analysis_state = evaluate_result(
+                    malicious, results[record.index].bruteforce,
+                    analysis_state
+                )
+
+            # Zobrazenie aktuálnych metrík po spracovaní dávky
+            print_current_metrics(analysis_state)
+
+        except Exception as e:
+            # Zaznamenanie chyby a pokračovanie v spracovaní ďalších dávok
+            logger.error(f"Chyba pri spracovaní dávky {batch_number}: {e}")
+            print(f"Chyba pri spracovaní dávky {batch_number}: {e}")
+            continue
+
+    # Zobrazenie finálnej správy s výsledkami analýzy
+    print_final_report(analysis_state)
+    logger.info("Dávková analýza sieťových tokov dokončená")
+    log_agent_cache_stats(total_flows, agent_cache_before)
 
     return analysis_state
@@ -0,0 +1,185 @@
+"""
+Tento modul poskytuje cache výsledkov analýzy takmer zhodných sieťových
+tokov.
+
+Toky útokov hrubou silou sú vo veľkej miere opakujúce sa - rovnaký cieľový
+port, takmer rovnaké počty paketov a veľkosti okien. Hodnoty toku sa
+kvantizujú na kanonickú signatúru (pozri record_signature) a tok so
+signatúrou, ktorá už bola analyzovaná, dostane uložený výsledok bez
+volania LLM.
+"""
+
+import logging
+from typing import Any, Dict, Hashable, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.utils import (
+    DatasetRecord,
+    RowHashSet,
+    dataset_signatures,
+    record_signature
+)
+from src.system_core.data_models import FlowAnalysisResult
+from src.system_core.handlers import FLOW_FAILURE_REASON
+
+# Nastavenie logovania pre tento modul
+logger = logging.getLogger(__name__)
+
+# Názov súhrnného riadku v správe measure_signature_reduction
+TOTAL_ROW = "Spolu"
+
+
+class FlowVerdictCache:
+    """
+    Cache výsledkov analýzy tokov podľa kanonickej signatúry toku.
+
+    Výsledky po zlyhaní agenta (predvolená bezpečná klasifikácia) sa
+    neukladajú, aby sa zlyhanie nepreniesolo na ďalšie toky. Pri
+    asynchrónnej analýze môže byť pod signatúrou uložená aj rozpracovaná
+    úloha (asyncio.Task), na ktorej výsledok čakajú takmer zhodné toky.
+
+    Parametre:
+        buckets (Dict[str, Union[float, str]]): Pravidlá kvantizácie
+            podľa názvu stĺpca (pozri quantize_values)
+    """
+
+    def __init__(self, buckets: Dict[str, Union[float, str]]):
+        self.buckets = buckets
+        self.hits = 0
+        self.misses = 0
+        self._verdicts: Dict[Hashable, Any] = {}
+
+    def signature(self, record: DatasetRecord) -> Hashable:
+        """
+        Vráti kanonickú signatúru záznamu toku bez štítku.
+
+        Parametre:
+            record (DatasetRecord): Záznam toku bez štítku
+
+        Návratová hodnota:
+            Hashable: Signatúra toku
+        """
+        return record_signature(record, self.buckets)
+
+    def get(self, signature: Hashable) -> Optional[Any]:
+        """
+        Vráti uložený výsledok pre signatúru toku.
+
+        Parametre:
+            signature (Hashable): Signatúra toku
+
+        Návratová hodnota:
+            Optional[Any]: Uložený výsledok (FlowAnalysisResult alebo
+            rozpracovaná úloha), None ak signatúra ešte nebola analyzovaná
+        """
+        verdict = self._verdicts.get(signature)
+        if verdict is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return verdict
+
+    def put(self, signature: Hashable, verdict: Any) -> None:
+        """
+        Uloží výsledok analýzy toku pre jeho signatúru.
+
+        Predvolená klasifikácia po zlyhaní agenta sa neuloží a odstráni
+        prípadný skorší záznam signatúry (napr. rozpracovanú úlohu).
+
+        Parametre:
+            signature (Hashable): Signatúra toku
+            verdict (Any): Výsledok analýzy toku (FlowAnalysisResult) alebo
+                rozpracovaná úloha, ktorá ho vráti
+        """
+        if (isinstance(verdict, FlowAnalysisResult)
+                and verdict.reason == FLOW_FAILURE_REASON):
+            self.discard(signature)
+        else:
+            self._verdicts[signature] = verdict
+
+    def discard(self, signature: Hashable) -> None:
+        """
+        Odstráni záznam signatúry z cache.
+
+        Parametre:
+            signature (Hashable): Signatúra toku
+        """
+        self._verdicts.pop(signature, None)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Podiel tokov, ktorých výsledok bol prevzatý z cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def log_stats(self) -> None:
+        """
+        Zaloguje a vypíše štatistiky cache výsledkov tokov.
+        """
+        message = (f"Cache výsledkov tokov: {self.hits} zásahov, "
+                   f"{self.misses} volaní LLM, úspešnosť "
+                   f"{self.hit_rate * 100:.1f} % "
+                   f"({len(self._verdicts)} signatúr)")
+        logger.info(message)
+        print(message)
+
+
+def measure_signature_reduction(
+        chunks: Iterable[pd.DataFrame],
+        buckets: Dict[str, Union[float, str]],
+        label_column: str = "Label") -> pd.DataFrame:
+    """
+    Zmeria dosiahnuteľné zníženie počtu volaní LLM pomocou cache výsledkov
+    tokov.
+
+    Pre každý štítok a pre celý dataset (riadok TOTAL_ROW) spočíta riadky,
+    rôzne riadky (počet volaní LLM po deduplikácii) a rôzne signatúry
+    (počet volaní LLM s cache výsledkov tokov). Cache nepozná štítky, počet
+    volaní pri analýze preto zodpovedá súhrnnému riadku. Časti datasetu sa
+    spracujú postupne, takže je možné merať aj celý dataset (napr.
+    iter_ids2017_chunks).
+
+    Parametre:
+        chunks (Iterable[pd.DataFrame]): Časti datasetu so štítkom
+        buckets (Dict[str, Union[float, str]]): Pravidlá kvantizácie
+        label_column (str): Názov stĺpca so štítkom
+
+    Návratová hodnota:
+        pd.DataFrame: Počty 'rows', 'unique_rows' a 'signatures' a zníženie
+            počtu volaní 'reduction' oproti rôznym riadkom pre každý štítok
+    """
+    rows: Dict[str, int] = {}
+    exact: Dict[str, RowHashSet] = {}
+    quantized: Dict[str, RowHashSet] = {}
+
+    for chunk in chunks:
+        labels = chunk[label_column].astype(str).to_numpy()
+        features = chunk.drop(columns=[label_column])
+        exact_hashes = dataset_signatures(features, {})
+        signature_hashes = dataset_signatures(features, buckets)
+
+        groups = [(label, labels == label) for label in np.unique(labels)]
+        groups.append((TOTAL_ROW, np.ones(len(labels), dtype=bool)))
+        for label, mask in groups:
+            rows[label] = rows.get(label, 0) + int(mask.sum())
+            # Priebežná deduplikácia drží v pamäti iba rôzne hashe
+            exact.setdefault(label, RowHashSet()).add_new(
+                exact_hashes[mask])
+            quantized.setdefault(label, RowHashSet()).add_new(
+                signature_hashes[mask])
+
+    report = pd.DataFrame({
+        "rows": pd.Series(rows),
+        "unique_rows": pd.Series({label: len(hashes)
+                                  for label, hashes in exact.items()}),
+        "signatures": pd.Series({label: len(hashes)
+                                 for label, hashes in quantized.items()}),
+    })
+    report = report.loc[sorted(label for label in report.index
+                               if label != TOTAL_ROW) + [TOTAL_ROW]]
+    report["reduction"] = 1.0 - report["signatures"] / report["unique_rows"]
+    return report
@@ -5,10 +5,18 @@ presnosti detekcie pomocou výkonnostných metrík ako presnosť, citlivosť a F
 """
 
 import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Deque, Iterator, Optional, Tuple
 
-from src.llm.flows import detect_brute_force_in_logs
-from src.system_core.data_models import AnalysisState
+from src.llm.agents import get_agent_cache_stats, log_agent_cache_stats
+from src.llm.prompt_store import start_prompt_store_run
+from src.llm.flows import (
+    detect_brute_force_in_logs,
+    detect_brute_force_in_logs_single_pass
+)
+from src.system_core.data_models import AnalysisState, LogsAnalysisResult
 from src.log_tools.utils import (
     read_linux_log_file,
     count_txt_files,
@@ -22,8 +30,80 @@ from src.log_tools.utils import (
 # Nastavenie logovania pre tento modul
 logger = logging.getLogger(__name__)
 
+# Počet rozpracovaných súborov pri paralelnej analýze ako násobok počtu
+# vlákien (obmedzuje počet súčasne načítaných súborov v pamäti)
+LOG_ANALYSIS_WINDOW_FACTOR = 4
+
+# Režimy analýzy log súborov: trojagentová analýza (Extraktor metadát,
+# Popisovač logov a Klasifikátor logov) alebo jednoprechodová analýza
+# Kombinovaným agentom pre logy
+LOG_ANALYSIS_MODES = {
+    "pipeline": detect_brute_force_in_logs,
+    "single_pass": detect_brute_force_in_logs_single_pass,
+}
+
+
+def iter_labeled_log_files(folder_path: Path) -> Iterator[Tuple[Path, bool]]:
+    """
+    Rekurzívne prechádza log súbory v priečinku spolu s ich štítkami.
+
+    Súbory, ktorých štítok sa nedá určiť z názvu, sa preskočia
+    a zalogujú.
+
+    Parametre:
+        folder_path (Path): Cesta k priečinku s log súbormi
+
+    Návratová hodnota:
+        Iterator[Tuple[Path, bool]]: Cesta k súboru a jeho štítok
+    """
+    for file_path in folder_path.rglob("*.txt"):
+        # Určenie klasifikačného štítku zo súboru
+        label = determine_label_from_filename(file_path.name)
+        # Preskočenie súborov bez jasného štítku (neznámy formát názvu)
+        if label is None:
+            logger.warning(
+                f"Preskakuje sa súbor {file_path.name}: nedá sa určiť štítok"
+            )
+            continue
+        yield file_path, label
+
 
-def analyze_logs(folder_path: Path, num_epochs: int = 8) -> AnalysisState:
+def analyze_log_file(file_path: Path, num_epochs: int,
+                     mode: str = "pipeline",
+                     verdict_only: bool = False) -> LogsAnalysisResult:
+    """
+    Načíta log súbor a analyzuje ho LLM detekčným systémom.
+
+    Funkcia nemení zdieľaný stav, je preto možné ju volať súbežne
+    z viacerých vlákien.
+
+    Parametre:
+        file_path (Path): Cesta k log súboru
+        num_epochs (int): Počet epoch ladenia pre LLM detekčný systém
+        mode (str): Režim analýzy z LOG_ANALYSIS_MODES
+        verdict_only (bool): Či klasifikovať bez zdôvodnenia. Vstup
+            klasifikátora sa uloží do úložiska vstupov pod cestou
+            k súboru (pozri explain v src/llm/flows.py). Pri
+            jednoprechodovom režime sa nepoužíva.
+
+    Návratová hodnota:
+        LogsAnalysisResult: Výsledok analýzy súboru
+    """
+    # Načítanie obsahu log súboru do pamäte
+    file_content = read_linux_log_file(file_path)
+
+    # Vykonanie analýzy obsahu pomocou LLM detekčného systému
+    if verdict_only and mode == "pipeline":
+        return detect_brute_force_in_logs(file_content, num_epochs,
+                                          verdict_only=True,
+                                          item_id=str(file_path))
+    return LOG_ANALYSIS_MODES[mode](file_content, num_epochs)
+
+
+def analyze_logs(folder_path: Path, num_epochs: int = 8,
+                 workers: Optional[int] = None,
+                 mode: str = "pipeline",
+                 verdict_only: bool = False) -> AnalysisState:
     """
     Spracuje log súbory v špecifikovanom priečinku a vypočíta výkonnostné metriky.
 
@@ -50,6 +130,13 @@ def analyze_logs(folder_path: Path, num_epochs: int = 8) -> AnalysisState:
             obsahujúcemu log súbory na analýzu. Priečinok môže obsahovať
             podpriečinky, ktoré budú tiež spracované.
         num_epochs (int): Počet epoch ladenia pre LLM detekčný systém.
+        workers (Optional[int]): Počet vlákien analyzujúcich súbory
+            súbežne. Hodnota väčšia ako 1 spustí paralelnú analýzu
+            (analyze_logs_parallel), None alebo 1 analyzuje súbory postupne.
+        mode (str): Režim analýzy - "pipeline" pre trojagentovú analýzu
+            alebo "single_pass" pre jednoprechodovú analýzu jedným agentom
+        verdict_only (bool): Či klasifikovať súbory bez zdôvodnenia
+            (pozri analyze_log_file)
 
     Návratová hodnota:
         AnalysisState: Finálny stav analýzy obsahujúci všetky vypočítané
@@ -57,10 +144,19 @@ def analyze_logs(folder_path: Path, num_epochs: int = 8) -> AnalysisState:
 
     Výnimky:
         FileNotFoundError: Ak špecifikovaná cesta k priečinku neexistuje.
+        ValueError: Pri neznámom režime analýzy.
     """
 
     if not folder_path.exists():
         raise FileNotFoundError(f"Cesta k priečinku {folder_path} neexistuje.")
+    if mode not in LOG_ANALYSIS_MODES:
+        raise ValueError(f"Neznámy režim analýzy logov: '{mode}'")
+    # Úložisko vstupov drží iba položky tohto behu
+    start_prompt_store_run()
+
+    if workers is not None and workers > 1:
+        return analyze_logs_parallel(folder_path, num_epochs, workers, mode,
+                                     verdict_only)
 
     # Inicializácia logovania a úvodných informácií
     logger.info("Spúšťa sa analýza logov...")
@@ -68,33 +164,24 @@ def analyze_logs(folder_path: Path, num_epochs: int = 8) -> AnalysisState:
 
     # Inicializácia stavu analýzy a počítanie celkového počtu súborov
     analysis_state = AnalysisState()
+    # Štatistiky cache agentov pred analýzou pre výpis za tento beh
+    agent_cache_before = get_agent_cache_stats()
     total_files = count_txt_files(folder_path)
     processed_files = 0
 
     # Rekurzívne prechádzanie všetkých súborov v priečinku a podpriečinkoch
-    for file_path in folder_path.rglob("*.txt"):
-        # Získanie názvu súboru pre reportovanie progresu a určenie štítku
+    for file_path, label in iter_labeled_log_files(folder_path):
+        # Získanie názvu súboru pre reportovanie progresu
         file_name = file_path.name
-        # Určenie klasifikačného štítku zo súboru
-        label = determine_label_from_filename(file_name)
-        # Preskočenie súborov bez jasného štítku (neznámy formát názvu)
-        if label is None:
-            logger.warning(
-                f"Preskakuje sa súbor {file_name}: nedá sa určiť štítok"
-            )
-            continue
 
         # Aktualizácia počítadla spracovaných súborov a zobrazenie progresu
         processed_files += 1
         print_progress_report(processed_files, total_files, file_name)
 
         try:
-            # Načítanie obsahu log súboru do pamäte
-            file_content = read_linux_log_file(file_path)
-
-            # Vykonanie analýzy obsahu pomocou LLM detekčného systému
-            analysis_result = detect_brute_force_in_logs(
-                file_content, num_epochs)
+            # Načítanie a analýza obsahu súboru
+            analysis_result = analyze_log_file(file_path, num_epochs, mode,
+                                               verdict_only)
 
             # Vyhodnotenie výsledku voči skutočnosti a aktualizácia metrík
             analysis_state = evaluate_result(
@@ -114,5 +201,94 @@ def analyze_logs(folder_path: Path, num_epochs: int = 8) -> AnalysisState:
     # Zobrazenie finálnej správy s kompletným súhrnom analýzy
     print_final_report(analysis_state)
     logger.info("Analýza logov dokončená")
+    log_agent_cache_stats(processed_files, agent_cache_before)
+
+    return analysis_state
+
+
+def analyze_logs_parallel(folder_path: Path, num_epochs: int = 8,
+                          workers: int = 4,
+                          mode: str = "pipeline",
+                          verdict_only: bool = False) -> AnalysisState:
+    """
+    Paralelne spracuje log súbory v priečinku pomocou poolu vlákien.
+
+    Paralelný variant analyze_logs. Súbory sa načítavajú a analyzujú
+    súbežne v zadanom počte vlákien (analyze_log_file), výsledky sa však
+    vyhodnocujú v hlavnom vlákne v pôvodnom poradí súborov. Výpisy progresu
+    a metrík sa preto neprekrývajú a finálny stav analýzy je zhodný
+    s postupnou analýzou. Chyba pri spracovaní súboru sa zaloguje a ostatné
+    súbory sa spracujú ďalej.
+
+    Parametre:
+        folder_path (Path): Cesta k priečinku s log súbormi
+        num_epochs (int): Počet epoch ladenia pre LLM detekčný systém
+        workers (int): Počet vlákien analyzujúcich súbory súbežne
+        mode (str): Režim analýzy z LOG_ANALYSIS_MODES
+        verdict_only (bool): Či klasifikovať súbory bez zdôvodnenia
+
+    Návratová hodnota:
+        AnalysisState: Finálny stav analýzy obsahujúci všetky vypočítané
+            štatistiky a výkonnostné metriky
+    """
+    # Inicializácia logovania a úvodných informácií
+    logger.info(f"Spúšťa sa paralelná analýza logov ({workers} vlákien)...")
+    print("Pripravuje sa analýza...\n")
+
+    # Inicializácia stavu analýzy a počítanie celkového počtu súborov
+    analysis_state = AnalysisState()
+    # Štatistiky cache agentov pred analýzou pre výpis za tento beh
+    agent_cache_before = get_agent_cache_stats()
+    total_files = count_txt_files(folder_path)
+    processed_files = 0
+    # Rozpracované súbory v pôvodnom poradí (názov, štítok, výsledok)
+    pending: Deque[Tuple[str, bool, Future]] = deque()
+
+    def collect(state: AnalysisState) -> AnalysisState:
+        # Vyhodnotenie najstaršieho rozpracovaného súboru
+        nonlocal processed_files
+        file_name, label, future = pending.popleft()
+        processed_files += 1
+        print_progress_report(processed_files, total_files, file_name)
+
+        try:
+            analysis_result = future.result()
+
+            # Vyhodnotenie výsledku voči skutočnosti a aktualizácia metrík
+            state = evaluate_result(
+                label, analysis_result.system_compromised, state
+            )
+
+            # Zobrazenie aktuálneho stavu metrík
+            print_current_metrics(state)
+
+        except Exception as e:
+            # Chyba jedného súboru neovplyvní spracovanie ostatných
+            logger.error(f"Chyba pri spracovaní súboru {file_name}: {e}")
+            print(f"Chyba pri spracovaní súboru {file_name}: {e}")
+
+        return state
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for file_path, label in iter_labeled_log_files(folder_path):
+                pending.append((file_path.name, label, executor.submit(
+                    analyze_log_file, file_path, num_epochs, mode,
+                    verdict_only)))
+                # Pri plnom okne sa najskôr vyhodnotí najstarší súbor
+                if len(pending) >= workers * LOG_ANALYSIS_WINDOW_FACTOR:
+                    analysis_state = collect(analysis_state)
+
+            while pending:
+                analysis_state = collect(analysis_state)
+        finally:
+            # Zrušenie ešte nespustených analýz (napr. pri prerušení)
+            for _, _, future in pending:
+                future.cancel()
+
+    # Zobrazenie finálnej správy s kompletným súhrnom analýzy
+    print_final_report(analysis_state)
+    logger.info("Paralelná analýza logov dokončená")
+    log_agent_cache_stats(processed_files, agent_cache_before)
 
     return analysis_state
@@ -3,7 +3,7 @@ Tento modul definuje dátové modely používané v aplikácii.
 """
 
 from pydantic import BaseModel
-from typing import Literal
+from typing import List, Literal
 
 
 class LogsMetadata(BaseModel):
@@ -51,6 +51,31 @@ class FlowAnalysisResult(BaseModel):
     reason: str  # Zdôvodnenie rozhodnutia
 
 
+class FlowVerdict(BaseModel):
+    """
+    Dátový model pre výsledok analýzy jedného toku v dávke tokov.
+
+    Je súčasťou štruktúrovaného výstupu Dávkového klasifikačného agenta
+    (flow_batch_classifier_agent). Tok je identifikovaný pôvodným
+    indexom riadku z textovej reprezentácie ("Row <index>: ...").
+    """
+    row: int  # Pôvodný index riadku toku v datasete
+    bruteforce: bool  # True ak bol detekovaný útok hrubou silou
+    reason: str  # Zdôvodnenie rozhodnutia
+
+
+class FlowBatchAnalysisResult(BaseModel):
+    """
+    Dátový model pre výsledok analýzy dávky tokov paketov.
+
+    Je využívaný ako štruktúrovaný výstup Dávkového klasifikačného agenta
+    (flow_batch_classifier_agent).
+
+    Obsahuje samostatný výsledok pre každý tok v dávke.
+    """
+    verdicts: List[FlowVerdict]  # Výsledky pre jednotlivé toky
+
+
 class LogsAnalysisResult(BaseModel):
     """
     Dátový model pre komplexný výsledok analýzy logov.
@@ -67,6 +92,46 @@ class LogsAnalysisResult(BaseModel):
     reason: str = None  # Zdôvodnenie rozhodnutia
 
 
+class LogsCombinedAnalysisResult(LogsAnalysisResult, LogsDescription,
+                                 LogsMetadata):
+    """
+    Dátový model pre výsledok jednoprechodovej analýzy logov.
+
+    Je využívaný ako štruktúrovaný výstup Kombinovaného agenta pre logy
+    (logs_combined_agent).
+
+    Spája polia LogsMetadata, LogsDescription a LogsAnalysisResult, takže
+    metadáta, popis aktivity aj klasifikáciu vráti jedna požiadavka na LLM.
+    Poradie polí (metadáta, popis, klasifikácia) zodpovedá poradiu krokov
+    trojagentovej analýzy.
+    """
+
+
+class FlowVerdictOnlyResult(BaseModel):
+    """
+    Dátový model pre verdikt analýzy toku bez zdôvodnenia.
+
+    Je využívaný ako štruktúrovaný výstup Klasifikačného agenta pre toky
+    iba s verdiktom (flow_verdict_agent) pri hromadných behoch.
+    Zdôvodnenie je možné vytvoriť dodatočne (pozri explain
+    v src/llm/flows.py).
+    """
+    bruteforce: bool  # True ak bol detekovaný útok hrubou silou
+
+
+class LogsVerdictOnlyResult(BaseModel):
+    """
+    Dátový model pre verdikt analýzy logov bez zdôvodnenia.
+
+    Je využívaný ako štruktúrovaný výstup Klasifikátora logov iba
+    s verdiktom (logs_verdict_agent) pri hromadných behoch.
+    Zdôvodnenie je možné vytvoriť dodatočne (pozri explain
+    v src/llm/flows.py).
+    """
+    bruteforce: bool  # True ak bol detekovaný útok hrubou silou
+    system_compromised: bool  # True ak bol systém kompromitovaný
+
+
 class AnalysisState(BaseModel):
     """
     Dátový model reprezentujúci stav behu programu.
@@ -89,3 +89,24 @@ class EnvFileNotFoundError(Exception):
             *args: Ďalšie argumenty pre základnú Exception triedu
         """
         super().__init__(message, *args)
+
+
+class ModelNotAvailableError(Exception):
+    """
+    Výnimka vyvolaná, keď požadovaný model nie je dostupný na Ollama serveri.
+
+    Táto výnimka sa používa pri predbežnej kontrole pred analýzou, aby
+    analýza skončila jednou zrozumiteľnou chybou namiesto opakovaných
+    neúspešných pokusov pre každý analyzovaný záznam.
+    """
+
+    def __init__(self, message="Model nie je dostupný na Ollama serveri",
+                 *args):
+        """
+        Inicializuje výnimku ModelNotAvailableError.
+
+        Parametre:
+            message (str): Správa popisujúca chybu
+            *args: Ďalšie argumenty pre základnú Exception triedu
+        """
+        super().__init__(message, *args)
@@ -6,22 +6,31 @@ predvolené hodnoty.
 """
 
 import logging
+from typing import Iterable
 
 from src.system_core.data_models import (
     LogsMetadata,
     LogsDescription,
     LogsAnalysisResult,
-    FlowAnalysisResult
+    LogsCombinedAnalysisResult,
+    FlowAnalysisResult,
+    FlowBatchAnalysisResult
 )
 from src.system_core.exceptions import (
     ApiClientInitializationError,
     MissingApiKeyError,
-    EnvFileNotFoundError
+    EnvFileNotFoundError,
+    ModelNotAvailableError
 )
 
 # Inicializácia logovacieho systému
 logger = logging.getLogger(__name__)
 
+# Zdôvodnenie predvolenej klasifikácie toku po zlyhaní agenta
+FLOW_FAILURE_REASON = (
+    "Failed to analyze flow - using default safe classification."
+)
+
 
 def handle_dotenv_error(error: Exception) -> None:
     """
@@ -104,6 +113,38 @@ def handle_client_creation_error(
     raise ApiClientInitializationError()
 
 
+def handle_model_not_available(
+    model: str, available_models: Iterable[str], ollama_base_url: str
+) -> None:
+    """
+    Spracuje chýbajúci model na Ollama serveri a vyvolá
+    ModelNotAvailableError.
+
+    Zobrazí používateľovi, ktorý model chýba, ktoré modely server ponúka
+    a ako chýbajúci model na server pridať.
+
+    Parametre:
+        model (str): Názov požadovaného modelu
+        available_models (Iterable[str]): Modely dostupné na serveri
+        ollama_base_url (str): URL adresa Ollama servera pre diagnostiku
+
+    Vyvoláva:
+        ModelNotAvailableError: Vždy, s názvom chýbajúceho modelu
+    """
+    # Vytvorí informačnú chybovú správu so zoznamom dostupných modelov
+    error_msg = (
+        f"Model {model} nie je dostupný na Ollama serveri "
+        f"{ollama_base_url}.\n"
+        f"Dostupné modely: {', '.join(sorted(available_models)) or 'žiadne'}"
+        f"\nPridajte model príkazom 'ollama pull' alebo 'ollama create'."
+    )
+    # Zobrazí chybovú správu
+    logger.error(error_msg)
+    # Vyvolá výnimku pre chýbajúci model
+    raise ModelNotAvailableError(f"Model {model} nie je dostupný na Ollama "
+                                 f"serveri {ollama_base_url}")
+
+
 def handle_metadata_extractor_agent_failure() -> LogsMetadata:
     """
     Obnova chodu aplikácie po zlyhaní Extraktora metadát.
@@ -186,6 +227,40 @@ def handle_logs_classifier_agent_failure() -> LogsAnalysisResult:
     )
 
 
+def handle_logs_combined_agent_failure() -> LogsCombinedAnalysisResult:
+    """
+    Obnova chodu aplikácie po zlyhaní Kombinovaného agenta pre logy.
+
+    Táto funkcia sa volá, keď zlyhá agent, ktorý v jednej požiadavke
+    extrahuje metadáta, popíše aktivitu a klasifikuje log súbory.
+    Poskytne rovnaké predvolené hodnoty ako obnovy jednotlivých agentov
+    trojagentovej analýzy.
+
+    Návratová hodnota:
+        LogsCombinedAnalysisResult: Predvolený objekt s výsledkom obsahujúci
+            predvolené metadáta, správu o zlyhaní popisu a bezpečnú
+            klasifikáciu (bruteforce a system_compromised sú False)
+
+    Poznámka:
+        Rovnako ako pri Klasifikačnom agentovi pre logy bezpečná predvolená
+        klasifikácia môže viesť k falošne negatívnym výsledkom.
+    """
+    # Upozornenie používateľa o zlyhaní Kombinovaného agenta pre logy
+    logger.warning(
+        "Kombinovaný agent pre logy zlyhal, použili sa predvolené hodnoty."
+    )
+    # Vráti predvolené metadáta, popis a bezpečnú klasifikáciu
+    return LogsCombinedAnalysisResult(
+        duration="None",
+        attacker="None",
+        service="Other",
+        description="Failed to extract pattern.",
+        bruteforce=False,
+        system_compromised=False,
+        reason="Failed to analyze logs - using default safe classification."
+    )
+
+
 def handle_flow_classifier_agent_failure() -> FlowAnalysisResult:
     """
     Obnova chodu aplikácie po zlyhaní Klasifikačného agenta pre sieťové toky.
@@ -215,5 +290,29 @@ def handle_flow_classifier_agent_failure() -> FlowAnalysisResult:
     # v prípade zlyhania
     return FlowAnalysisResult(
         bruteforce=False,
-        reason="Failed to analyze flow - using default safe classification."
+        reason=FLOW_FAILURE_REASON
+    )
+
+
+def handle_flow_batch_classifier_agent_failure() -> FlowBatchAnalysisResult:
+    """
+    Obnova chodu aplikácie po zlyhaní Dávkového klasifikačného agenta.
+
+    Táto funkcia sa volá, keď zlyhá agent zodpovedný za klasifikáciu
+    dávky sieťových tokov. Vráti prázdny zoznam výsledkov, takže každý
+    tok dávky dostane predvolenú bezpečnú klasifikáciu
+    z handle_flow_classifier_agent_failure.
+
+    Návratová hodnota:
+        FlowBatchAnalysisResult: Predvolený objekt bez výsledkov tokov
+
+    Poznámka:
+        Zlyhanie jednej dávky ovplyvní výsledky všetkých tokov v nej.
+    """
+    # Upozornenie používateľa o zlyhaní Dávkového klasifikačného agenta
+    logger.warning(
+        "Dávkový klasifikátor sieťových tokov zlyhal, "
+        "použili sa predvolené hodnoty."
     )
+    # Vráti prázdny výsledok - toky dávky sa klasifikujú ako neškodné
+    return FlowBatchAnalysisResult(verdicts=[])
@@ -8,11 +8,21 @@ a predspracovanie vstupného datasetu.
 import time
 import logging
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Dict, Optional, Union
 import pandas as pd
 
 from src.log_tools.log_analyzer import analyze_logs
 from src.log_tools.flow_analyzer import analyze_flow
+from src.llm.api_clients import preflight_client
+from src.llm.response_cache import log_response_cache_stats
+from src.llm.prompt_store import log_prompt_store_stats
+from src.data_processing.log_metadata_parser import log_fast_path_stats
+from src.llm.circuit_breaker import get_circuit_breaker
+from src.llm.agents import log_structured_output_stats
+from src.llm.flows import (
+    spawn_logs_analysis_client,
+    spawn_flow_analysis_client
+)
 
 logger = logging.getLogger(__name__)
 
@@ -97,7 +107,10 @@ def get_epochs_count():
             print("Neplatný vstup. Prosím zadajte číslo medzi 0 a 10.")
 
 
-def run_log_analysis(folder_path: Path, num_epochs: int = 8):
+def run_log_analysis(folder_path: Path, num_epochs: int = 8,
+                     workers: Optional[int] = None,
+                     mode: str = "pipeline",
+                     verdict_only: bool = False):
     """
     Vykoná analýzu Linux logov zo zadaného priečinka.
 
@@ -108,16 +121,30 @@ def run_log_analysis(folder_path: Path, num_epochs: int = 8):
     Parametre:
         folder_path: Cesta k priečinku s log súbormi
         num_epochs: Počet epoch ladenia modelu (0-10)
+        workers: Počet vlákien analyzujúcich súbory súbežne (None = postupne)
+        mode: Režim analýzy ("pipeline" - traja agenti, "single_pass" -
+            jeden kombinovaný agent)
+        verdict_only: Či klasifikovať bez zdôvodnenia (iba režim
+            "pipeline", zdôvodnenie vytvorí explain)
     """
     print("\n=== Analýza Linux logov ===")
     # Zaznamenanie času začiatku analýzy
     start_time = time.time()
 
     try:
+        # Overenie dostupnosti a načítanie modelu pred prvým súborom
+        preflight_client(spawn_logs_analysis_client(num_epochs))
+
         # Spustenie analýzy logov zo zadaného priečinka
         analyze_logs(
-            folder_path, num_epochs
+            folder_path, num_epochs, workers=workers, mode=mode,
+            verdict_only=verdict_only
         )
+        log_response_cache_stats()
+        log_prompt_store_stats()
+        log_fast_path_stats()
+        get_circuit_breaker().log_stats()
+        log_structured_output_stats()
 
         # Výpočet a formátovanie času trvania analýzy
         end_time = time.time()
@@ -138,7 +165,13 @@ def run_flow_analysis(
     dataset: pd.DataFrame,
     unlabel_dataset: Callable,
     get_label: Callable,
-    num_epochs: int = 8
+    num_epochs: int = 8,
+    packing: bool = False,
+    concurrency: Optional[int] = None,
+    signature_buckets: Optional[Dict[str, Union[float, str]]] = None,
+    early_exit: bool = False,
+    complete_positive_reasons: bool = False,
+    verdict_only: bool = False
 ):
     """
     Vykoná analýzu sieťových tokov z datasetu.
@@ -152,6 +185,15 @@ def run_flow_analysis(
         unlabel_dataset: Funkcia na odstránenie labelov z datasetu
         get_label: Funkcia na získanie správnych labelov
         num_epochs: Počet epoch ladenia modelu (0-10)
+        packing: Či analyzovať toky v dávkach podľa kontextového okna
+        concurrency: Počet súbežných požiadaviek na LLM (None = postupne)
+        signature_buckets: Pravidlá kvantizácie pre cache výsledkov takmer
+            zhodných tokov (None = cache vypnutá)
+        early_exit: Či ukončiť generovanie odpovede po rozhodnutí verdiktu
+        complete_positive_reasons: Či pri early_exit dogenerovať
+            zdôvodnenia pozitívnych tokov na pozadí
+        verdict_only: Či klasifikovať toky bez zdôvodnenia (zdôvodnenie
+            vytvorí explain)
 
     Návratová hodnota:
         None: Funkcia nevráti hodnotu, len zobrazuje výsledky
@@ -162,9 +204,21 @@ def run_flow_analysis(
     start_time = time.time()
 
     try:
+        # Overenie dostupnosti a načítanie modelu pred prvým tokom
+        preflight_client(spawn_flow_analysis_client(num_epochs))
+
         # Spustenie analýzy sieťových tokov s predspracovaným datasetom
         analyze_flow(dataset, unlabel_dataset,
-                     get_label, num_epochs)
+                     get_label, num_epochs, packing=packing,
+                     concurrency=concurrency,
+                     signature_buckets=signature_buckets,
+                     early_exit=early_exit,
+                     complete_positive_reasons=complete_positive_reasons,
+                     verdict_only=verdict_only)
+        log_response_cache_stats()
+        log_prompt_store_stats()
+        get_circuit_breaker().log_stats()
+        log_structured_output_stats()
 
         # Výpočet a formátovanie času trvania analýzy
         end_time = time.time()
@@ -0,0 +1,9 @@
+"""
+Spoločné nastavenie testov - moduly projektu sa importujú s prefixom src.
+"""
+
+import sys
+from pathlib import Path
+
+# Koreňový adresár net_analyzer pre importy "src.*"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
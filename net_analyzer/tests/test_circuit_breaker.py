@@ -0,0 +1,133 @@
+"""
+Testy ističa požiadaviek na LLM server a rozhodovania o opakovaní.
+"""
+
+import pytest
+from ollama import ResponseError
+
+from src.llm import circuit_breaker
+from src.llm.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    is_model_not_found_error,
+    is_retryable_error
+)
+from src.llm.utils import backoff_delay, retry_on_failure
+from src.system_core.exceptions import (
+    AgentInitializationError,
+    ModelNotAvailableError
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Riadený čas ističa namiesto time.monotonic()
+    now = [100.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats == {"failures": 3, "trips": 1, "rejected": 1}
+
+
+def test_success_resets_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_single_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+
+    clock[0] += 10
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow_request()
+
+
+def test_failed_probe_reopens_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock[0] += 10
+    breaker.allow_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_stale_probe_is_replaced(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock[0] += 10
+    breaker.allow_request()
+
+    clock[0] += 10
+    assert breaker.allow_request()
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (ConnectionError("refused"), True),
+    (TimeoutError(), True),
+    (ResponseError("server error", 500), True),
+    (ResponseError("busy", 429), True),
+    (ResponseError("model not found", 404), False),
+    (ResponseError("bad request", 400), False),
+    (ModelNotAvailableError("model"), False),
+    (AgentInitializationError("agent"), False),
+])
+def test_is_retryable_error(error, retryable):
+    assert is_retryable_error(error) is retryable
+
+
+def test_is_model_not_found_error():
+    assert is_model_not_found_error(ResponseError("not found", 404))
+    assert is_model_not_found_error(ModelNotAvailableError("model"))
+    assert not is_model_not_found_error(ResponseError("error", 500))
+
+
+def test_backoff_delay_grows_within_jittered_bounds():
+    for attempt, ceiling in ((0, 1.0), (1, 2.0), (3, 8.0), (10, 30.0)):
+        for _ in range(20):
+            delay = backoff_delay(attempt, delay=1.0, max_delay=30.0)
+            assert ceiling / 2 <= delay <= ceiling
+
+
+def test_retry_stops_on_fatal_error(monkeypatch):
+    monkeypatch.setattr("src.llm.utils.time.sleep", lambda seconds: None)
+    calls = []
+
+    @retry_on_failure(max_retries=2, delay=0)
+    def fail(error):
+        calls.append(error)
+        raise error
+
+    with pytest.raises(AgentInitializationError):
+        fail(ConnectionError("refused"))
+    assert len(calls) == 3
+
+    calls.clear()
+    with pytest.raises(AgentInitializationError):
+        fail(ResponseError("model not found", 404))
+    assert len(calls) == 1
@@ -0,0 +1,93 @@
+"""
+Testy kvantizácie tokov na signatúry a cache výsledkov takmer zhodných
+tokov.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.utils import (
+    DatasetRecord,
+    dataset_signatures,
+    quantize_values,
+    record_signature
+)
+from src.log_tools.flow_verdict_cache import FlowVerdictCache
+from src.system_core.data_models import FlowAnalysisResult
+from src.system_core.handlers import FLOW_FAILURE_REASON
+
+BUCKETS = {"Flow_Duration": "log2", "Total_Fwd_Packets": 5}
+
+
+def record(duration, packets, port=22):
+    return DatasetRecord(
+        index=0,
+        columns=("Destination_Port", "Flow_Duration", "Total_Fwd_Packets"),
+        values=np.array([port, duration, packets], dtype=np.float64))
+
+
+def test_quantize_linear_buckets():
+    assert quantize_values(np.array([0, 4, 5, 14]), 5).tolist() == [
+        0, 0, 1, 2]
+
+
+def test_quantize_log2_buckets_keep_sign():
+    assert quantize_values(np.array([0, 1, 3, 7, -7]), "log2").tolist() == [
+        0, 1, 2, 3, -3]
+
+
+def test_quantize_none_keeps_value():
+    assert quantize_values(17.5, None) == 17.5
+
+
+def test_quantize_rejects_invalid_rule():
+    with pytest.raises(ValueError):
+        quantize_values(1.0, "sqrt")
+    with pytest.raises(ValueError):
+        quantize_values(1.0, 0)
+
+
+def test_near_identical_flows_share_signature():
+    assert (record_signature(record(100, 11), BUCKETS)
+            == record_signature(record(120, 14), BUCKETS))
+    assert (record_signature(record(100, 11), BUCKETS)
+            != record_signature(record(100, 15), BUCKETS))
+    # Stĺpec bez pravidla sa porovnáva presne
+    assert (record_signature(record(100, 11), BUCKETS)
+            != record_signature(record(100, 11, port=21), BUCKETS))
+
+
+def test_dataset_signatures_match_record_signatures():
+    dataset = pd.DataFrame({"Destination_Port": [22, 22, 22, 21],
+                            "Flow_Duration": [100, 120, 100, 100],
+                            "Total_Fwd_Packets": [11, 14, 15, 11]})
+
+    signatures = dataset_signatures(dataset, BUCKETS)
+
+    assert signatures[0] == signatures[1]
+    assert len(set(signatures.tolist())) == 3
+
+
+def test_cache_returns_verdict_of_near_identical_flow():
+    cache = FlowVerdictCache(BUCKETS)
+    verdict = FlowAnalysisResult(bruteforce=True, reason="SSH-Patator")
+
+    first = cache.signature(record(100, 11))
+    assert cache.get(first) is None
+    cache.put(first, verdict)
+
+    assert cache.get(cache.signature(record(120, 14))) is verdict
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_cache_does_not_store_failure_verdict():
+    cache = FlowVerdictCache(BUCKETS)
+    signature = cache.signature(record(100, 11))
+    cache.put(signature, "rozpracovaná úloha")
+
+    cache.put(signature, FlowAnalysisResult(bruteforce=False,
+                                            reason=FLOW_FAILURE_REASON))
+
+    assert cache.get(signature) is None
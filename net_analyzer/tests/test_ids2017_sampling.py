@@ -0,0 +1,79 @@
+"""
+Testy výberu vzoriek datasetu CIC-IDS2017 - prúdový výber a výber
+z celého vyčisteného datasetu musia vybrať rovnaké riadky.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.process_IDS2017 import (
+    IDS2017_DTYPES,
+    IDS2017_IMPORTANT_COLUMNS,
+    load_ids2017_dataset,
+    preprocess_IDS2017_dataset,
+    sample_ids2017_dataset
+)
+
+QUOTAS = {"BENIGN": 20, "SSH-Patator": 20}
+
+
+@pytest.fixture
+def flow_dir(tmp_path):
+    # Syntetické CSV súbory s pôvodnými názvami stĺpcov, duplikátmi
+    # a nekonečnými hodnotami
+    rng = np.random.default_rng(0)
+    for number in range(2):
+        rows = 500
+        frame = pd.DataFrame({
+            " Destination Port": rng.choice([21, 22, 80], rows),
+            " Flow Duration": rng.integers(0, 10 ** 6, rows),
+            " Total Fwd Packets": rng.integers(1, 50, rows),
+            " Total Backward Packets": rng.integers(0, 50, rows),
+            "Flow Bytes/s": rng.random(rows) * 1000,
+            " Flow Packets/s": rng.random(rows) * 10,
+            " Fwd Packet Length Mean": rng.random(rows) * 500,
+            " Bwd Packet Length Mean": rng.random(rows) * 500,
+            " SYN Flag Count": rng.integers(0, 2, rows),
+            " ACK Flag Count": rng.integers(0, 2, rows),
+            "Init_Win_bytes_forward": rng.integers(-1, 65535, rows),
+            " Label": rng.choice(["BENIGN", "SSH-Patator", "FTP-Patator"],
+                                 rows),
+        })
+        frame.loc[:4, "Flow Bytes/s"] = np.inf
+        pd.concat([frame, frame.head(30)]).to_csv(
+            tmp_path / f"day{number}.csv", index=False)
+    return tmp_path
+
+
+def comparable(frame):
+    # Kategórie štítku závisia od načítaných riadkov, porovnajú sa hodnoty
+    frame = frame[IDS2017_IMPORTANT_COLUMNS].copy()
+    frame["Label"] = frame["Label"].astype(str)
+    return frame.reset_index(drop=True)
+
+
+@pytest.mark.parametrize("mode", ["head", "reservoir"])
+def test_streamed_sample_matches_full_dataset(flow_dir, mode):
+    full = load_ids2017_dataset(flow_dir, columns=IDS2017_IMPORTANT_COLUMNS,
+                                dtypes=IDS2017_DTYPES)
+    expected = preprocess_IDS2017_dataset(full, QUOTAS, mode=mode, seed=3)
+
+    for chunksize in (50, 333, 10000):
+        streamed = sample_ids2017_dataset(flow_dir, QUOTAS, mode=mode,
+                                          chunksize=chunksize, seed=3)
+        pd.testing.assert_frame_equal(comparable(streamed),
+                                      comparable(expected))
+
+
+def test_reservoir_sample_depends_on_seed(flow_dir):
+    first = sample_ids2017_dataset(flow_dir, QUOTAS, mode="reservoir",
+                                   seed=1)
+    again = sample_ids2017_dataset(flow_dir, QUOTAS, mode="reservoir",
+                                   seed=1)
+    other = sample_ids2017_dataset(flow_dir, QUOTAS, mode="reservoir",
+                                   seed=2)
+
+    assert comparable(first).equals(comparable(again))
+    assert not comparable(first).equals(comparable(other))
+    assert (first["Label"].astype(str).value_counts() == 20).all()
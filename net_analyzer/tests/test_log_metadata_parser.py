@@ -0,0 +1,159 @@
+"""
+Testy deterministického extrahovania metadát z Linux logov.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.data_processing import log_metadata_parser
+from src.data_processing.log_metadata_parser import (
+    NO_METADATA_VALUE,
+    format_iso_duration,
+    get_fast_path_stats,
+    parse_logs_metadata,
+    record_metadata_step,
+    reset_fast_path_stats,
+    set_metadata_fast_path
+)
+
+LOG_INPUT_DIR = Path(__file__).resolve().parents[2] / "log_input"
+
+SSH_LOGS = """\
+2025-05-03T01:55:51.875253+02:00 server sshd[101]: Failed password for root from 172.16.22.48 port 50000 ssh2
+2025-05-03T01:55:52.000000+02:00 server sshd[102]: Invalid user admin from 172.16.22.48 port 50002
+2025-05-03T01:55:53.000000+02:00 server CRON[5101]: pam_unix(cron:session): session opened for user alice
+2025-05-03T01:57:21.500000+02:00 server sshd[103]: Failed password for invalid user test from 172.16.22.48 port 50004 ssh2
+"""
+
+SMB_LOGS = """\
+[2025/05/03 22:06:47.193889,  3] source3/auth/auth.c:202(auth_check_ntlm_password)
+  auth_check_ntlm_password: check_ntlm_password:  Checking password for unmapped user []\\[admin]@[] with the new password interface
+[2025/05/03 22:06:47.200000,  3] ../../source3/smbd/server.c:100(smbd_accept_connection)
+  client_connect: accepted connection from 10.0.0.5
+[2025/05/03 22:08:00.100000,  3] source3/auth/auth.c:300(auth_check_ntlm_password)
+  Authentication for user [admin] -> [admin] FAILED with error NT_STATUS_WRONG_PASSWORD
+"""
+
+
+def test_ssh_metadata():
+    metadata = parse_logs_metadata(SSH_LOGS)
+
+    assert metadata.service == "SSH"
+    assert metadata.attacker == "172.16.22.48"
+    assert metadata.duration == "PT1M30S"
+
+
+def test_samba_failure_uses_connection_address_and_header_timestamp():
+    # Kontrola hesla a spojenie nie sú zlyhania - trvanie určuje iba
+    # zlyhanie, ktoré preberá IP adresu posledného spojenia
+    metadata = parse_logs_metadata(SMB_LOGS)
+
+    assert metadata.service == "SMB"
+    assert metadata.attacker == "10.0.0.5"
+    assert metadata.duration == "PT0S"
+
+
+def test_benign_samba_logs_have_no_attacker():
+    logs = (LOG_INPUT_DIR / "BENIGN_SMB_4.txt").read_text(encoding="utf-8")
+
+    metadata = parse_logs_metadata(logs)
+
+    assert metadata.service == "SMB"
+    assert metadata.attacker == NO_METADATA_VALUE
+    assert metadata.duration == NO_METADATA_VALUE
+
+
+def test_connections_without_failures_have_no_attacker():
+    logs = (
+        "2024-01-03T01:52:50.000000+02:00 deb-server telnetd[62620]: "
+        "connect from 185.23.42.17\n"
+        "2024-01-03T01:53:10.000000+02:00 deb-server telnetd[62621]: "
+        "connect from 185.23.42.17\n"
+    )
+
+    metadata = parse_logs_metadata(logs)
+
+    assert (metadata.service, metadata.attacker, metadata.duration) == (
+        "telnet", NO_METADATA_VALUE, NO_METADATA_VALUE)
+
+
+def test_wrapped_failure_lines_are_joined():
+    logs = (
+        "2024-01-03T01:52:54.256080+02:00 deb-server login[62622]:\n"
+        "    FAILED LOGIN (1) on '/dev/pts/8' from '172.16.22.48'\n"
+        "2024-01-03T01:53:04.256080+02:00 deb-server login[62623]:\n"
+        "    FAILED LOGIN (2) on '/dev/pts/8' from '172.16.22.48'\n"
+    )
+
+    metadata = parse_logs_metadata(logs)
+
+    assert (metadata.attacker, metadata.duration) == ("172.16.22.48",
+                                                      "PT10S")
+
+
+def test_telnet_metadata():
+    logs = (
+        "2024-01-03T01:52:54.256080+02:00 deb-server login[62622]: "
+        "pam_unix(login:auth): authentication failure; logname=.telnet "
+        "uid=0 euid=0 tty=/dev/pts/8 ruser= rhost=172.16.22.48\n"
+        "2024-01-03T01:52:58.000000+02:00 deb-server login[62623]: "
+        "FAILED LOGIN (1) on '/dev/pts/8' from '172.16.22.48'\n"
+    )
+
+    metadata = parse_logs_metadata(logs)
+
+    assert (metadata.service, metadata.attacker) == ("telnet",
+                                                     "172.16.22.48")
+
+
+@pytest.mark.parametrize("logs", [
+    "",
+    # Žiadne podozrivé udalosti
+    "2025-05-03T01:55:53+02:00 server CRON[5101]: session opened\n",
+    # Udalosti bez časových značiek
+    "server sshd[101]: Failed password for root from 10.0.0.1 port 1\n",
+    # Nejednoznačný útočník
+    "2025-05-03T01:55:51+02:00 server sshd[1]: Invalid user a from 10.0.0.1\n"
+    "2025-05-03T01:55:52+02:00 server sshd[2]: Invalid user b from 10.0.0.2\n",
+])
+def test_undecided_logs_return_none(logs):
+    assert parse_logs_metadata(logs) is None
+
+
+def test_format_iso_duration():
+    from datetime import timedelta
+
+    assert format_iso_duration(timedelta(0)) == "PT0S"
+    assert format_iso_duration(timedelta(hours=1, seconds=5.6)) == "PT1H6S"
+
+
+@pytest.fixture
+def fast_path():
+    set_metadata_fast_path(True)
+    reset_fast_path_stats()
+    yield
+    reset_fast_path_stats()
+    set_metadata_fast_path(False)
+
+
+def test_fast_path_stats_count_decisions(fast_path):
+    log_metadata_parser.fast_path_logs_metadata(SSH_LOGS)
+    log_metadata_parser.fast_path_logs_metadata("")
+
+    stats = get_fast_path_stats()
+
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["latency_saved_seconds"] is None
+
+
+def test_latency_saved_uses_parallel_step(fast_path):
+    # Extraktor (3 s) beží súbežne s Popisovačom (2 s)
+    record_metadata_step(3.0, 3.0)
+    record_metadata_step(2.0, None)
+
+    stats = get_fast_path_stats()
+
+    assert stats["latency_saved_seconds"] == pytest.approx(1.0)
+    assert stats["compute_saved_seconds"] == pytest.approx(3.0)
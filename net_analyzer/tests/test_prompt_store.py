@@ -0,0 +1,84 @@
+"""
+Testy úložiska vstupov agentov pre dodatočné vysvetlenia.
+"""
+
+import pytest
+
+from src.llm.prompt_store import (
+    PromptStore,
+    disable_prompt_store,
+    enable_prompt_store,
+    get_prompt_store,
+    start_prompt_store_run,
+    store_prompt
+)
+
+
+@pytest.fixture
+def active_store():
+    store = enable_prompt_store()
+    yield store
+    disable_prompt_store()
+
+
+def test_put_and_get_roundtrip():
+    store = PromptStore()
+    input_data = {"flow_data": "Row 1: Destination_Port: 22 " * 50}
+
+    store.put("chunk_1", "flow", 8, input_data, True)
+
+    assert store.get("chunk_1") == ("flow", 8, input_data)
+    assert store.get("chunk_2") is None
+
+
+def test_flagged_items_in_insertion_order():
+    store = PromptStore()
+    store.put("b", "logs", 8, {}, True)
+    store.put("a", "logs", 8, {}, False)
+    store.put("c", "logs", 8, {}, True)
+
+    assert store.flagged_items() == ["b", "c"]
+    assert len(store) == 3
+
+
+def test_put_replaces_item():
+    store = PromptStore()
+    store.put("chunk_1", "flow", 8, {"flow_data": "old"}, True)
+
+    store.put("chunk_1", "flow", 4, {"flow_data": "new"}, False)
+
+    assert store.get("chunk_1") == ("flow", 4, {"flow_data": "new"})
+    assert store.flagged_items() == []
+
+
+def test_store_persists_to_file(tmp_path):
+    path = tmp_path / "prompts" / "store.sqlite"
+    store = PromptStore(path)
+    store.put("log.txt", "logs", 8, {"logs": "x"}, True)
+    store.close()
+
+    assert PromptStore(path).get("log.txt") == ("logs", 8, {"logs": "x"})
+
+
+def test_store_prompt_without_active_store_is_noop():
+    disable_prompt_store()
+
+    store_prompt("chunk_1", "flow", 8, {}, True)
+
+    assert get_prompt_store() is None
+
+
+def test_store_prompt_skips_missing_item_id(active_store):
+    store_prompt(None, "flow", 8, {}, True)
+    store_prompt("chunk_1", "flow", 8, {}, True)
+
+    assert len(active_store) == 1
+
+
+def test_new_run_clears_previous_items(active_store):
+    store_prompt("chunk_1", "flow", 8, {}, True)
+
+    start_prompt_store_run()
+
+    assert len(active_store) == 0
+    assert active_store.get("chunk_1") is None
@@ -0,0 +1,84 @@
+"""
+Testy perzistentnej cache odpovedí LLM agentov (platnosť a vyraďovanie).
+"""
+
+import pytest
+
+from src.llm import response_cache
+from src.llm.response_cache import ResponseCache
+from src.system_core.data_models import LogsMetadata
+
+
+def metadata(attacker):
+    return LogsMetadata(duration="PT1M", attacker=attacker, service="SSH")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Riadený čas cache namiesto time.time()
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_get_returns_stored_response(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+
+    cache.put("a", metadata("10.0.0.1"))
+
+    assert cache.get("a") == metadata("10.0.0.1")
+    assert cache.get("b") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_expired_response_is_removed(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl_seconds=60)
+    cache.put("a", metadata("10.0.0.1"))
+
+    clock[0] += 30
+    assert cache.get("a") is not None
+
+    clock[0] += 31
+    assert cache.get("a") is None
+    assert cache.stats["expired"] == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_response_is_evicted(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_entries=2)
+    cache.put("a", metadata("10.0.0.1"))
+    clock[0] += 1
+    cache.put("b", metadata("10.0.0.2"))
+    clock[0] += 1
+    # Použitie "a" posunie "b" na koniec poradia LRU
+    cache.get("a")
+    clock[0] += 1
+
+    cache.put("c", metadata("10.0.0.3"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_rewrite_does_not_grow_cache(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_entries=2)
+
+    cache.put("a", metadata("10.0.0.1"))
+    cache.put("a", metadata("10.0.0.2"))
+
+    assert len(cache) == 1
+    assert cache.get("a").attacker == "10.0.0.2"
+
+
+def test_responses_persist_across_instances(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(path)
+    cache.put("a", metadata("10.0.0.1"))
+    cache.close()
+
+    reopened = ResponseCache(path)
+
+    assert len(reopened) == 1
+    assert reopened.get("a") == metadata("10.0.0.1")
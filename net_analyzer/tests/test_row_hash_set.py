@@ -0,0 +1,70 @@
+"""
+Testy množiny hashov riadkov pre deduplikáciu po častiach (RowHashSet).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.utils import RowHashSet, hash_rows
+
+
+def hashes(*values):
+    return np.array(values, dtype=np.uint64)
+
+
+def test_add_new_marks_first_occurrence_within_chunk():
+    row_hashes = RowHashSet()
+
+    new = row_hashes.add_new(hashes(5, 3, 5, 1, 3))
+
+    assert new.tolist() == [True, True, False, True, False]
+    assert len(row_hashes) == 3
+
+
+def test_add_new_skips_hashes_seen_in_previous_chunks():
+    row_hashes = RowHashSet()
+    row_hashes.add_new(hashes(10, 30))
+
+    new = row_hashes.add_new(hashes(20, 30, 40, 10))
+
+    assert new.tolist() == [True, False, True, False]
+    assert len(row_hashes) == 4
+
+
+def test_hashes_stay_sorted_after_merge():
+    row_hashes = RowHashSet()
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        row_hashes.add_new(rng.integers(0, 2 ** 63, 100, dtype=np.uint64))
+
+    assert np.all(np.diff(row_hashes._hashes.astype(np.float64)) >= 0)
+
+
+def test_matches_drop_duplicates_across_chunks():
+    df = pd.DataFrame({"a": [1, 2, 1, 3, 2, 4, 1],
+                       "b": ["x", "y", "x", "z", "y", "x", "y"]})
+    row_hashes = RowHashSet()
+
+    kept = [chunk[row_hashes.add_new(hash_rows(chunk))]
+            for chunk in (df.iloc[:3], df.iloc[3:5], df.iloc[5:])]
+
+    pd.testing.assert_frame_equal(pd.concat(kept), df.drop_duplicates())
+
+
+def test_spills_to_disk_over_memory_limit(tmp_path):
+    # Limit 16 bajtov = 2 hashe v pamäti
+    row_hashes = RowHashSet(memory_limit_mb=16 / (1024 * 1024),
+                            spill_dir=tmp_path)
+
+    row_hashes.add_new(hashes(1, 2))
+    new = row_hashes.add_new(hashes(2, 3))
+
+    assert row_hashes.spilled_runs == 1
+    assert new.tolist() == [False, True]
+    assert len(row_hashes) == 3
+
+
+def test_memory_limit_requires_spill_dir():
+    with pytest.raises(ValueError):
+        RowHashSet(memory_limit_mb=1)
@@ -0,0 +1,32 @@
+"""
+Testy čítania verdiktu z neúplného prúdového JSON výstupu modelu.
+"""
+
+import pytest
+
+from src.llm.utils import parse_streamed_verdict
+
+
+@pytest.mark.parametrize("text, verdict", [
+    ('{"bruteforce": true', True),
+    ('{"bruteforce":false, "reason": "Norm', False),
+    ('{\n  "bruteforce" :\n  true,', True),
+    ('{"reason": "Opakované zlyhania", "bruteforce": false}', False),
+])
+def test_verdict_is_read_once_decided(text, verdict):
+    assert parse_streamed_verdict(text, "bruteforce") is verdict
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    '{"brute',
+    '{"bruteforce": ',
+    '{"bruteforce": tr',
+    '{"bruteforce": "true"}',
+])
+def test_undecided_verdict_returns_none(text):
+    assert parse_streamed_verdict(text, "bruteforce") is None
+
+
+def test_other_field_is_ignored():
+    assert parse_streamed_verdict('{"suspicious": true', "bruteforce") is None